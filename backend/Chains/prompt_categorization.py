@@ -13,14 +13,26 @@ Return JSON with:
 - confidence: number between 0 and 1
 """
 
-def prompt_categorization_chain(llm, prompt: str) -> PromptCategorization:
+def _build_chain(llm):
     template = ChatPromptTemplate.from_template(PROMPT)
     parser = JsonOutputParser()
 
-    chain = template | llm | parser
-    result = chain.invoke({"prompt": prompt})
+    return template | llm | parser
+
 
+def _to_categorization(result: dict) -> PromptCategorization:
     return PromptCategorization(
         techniques=result.get("techniques", []),
         confidence=result.get("confidence"),
     )
+
+
+def prompt_categorization_chain(llm, prompt: str) -> PromptCategorization:
+    result = _build_chain(llm).invoke({"prompt": prompt})
+    return _to_categorization(result)
+
+
+async def aprompt_categorization_chain(llm, prompt: str) -> PromptCategorization:
+    """Async variant used by the async /analyze pipeline"""
+    result = await _build_chain(llm).ainvoke({"prompt": prompt})
+    return _to_categorization(result)
@@ -51,6 +51,20 @@ def create_evaluator_chain(
 
 # Invoke Evaluator Chain
 
+def evaluator_chain_input(input: EvaluationInput) -> Dict[str, Any]:
+    reference_section = (
+        f"<reference_workflow>\n{input.referenceWorkflow}\n</reference_workflow>"
+        if input.referenceWorkflow
+        else ""
+    )
+
+    return {
+        "userPrompt": input.userPrompt,
+        "generatedWorkflow": input.generatedWorkflow,
+        "referenceSection": reference_section,
+    }
+
+
 def invoke_evaluator_chain(
     chain: Runnable,
     input: EvaluationInput,
@@ -58,18 +72,27 @@ def invoke_evaluator_chain(
     """
     Python equivalent of invokeEvaluatorChain<T>
     """
-    reference_section = (
-        f"<reference_workflow>\n{input.referenceWorkflow}\n</reference_workflow>"
-        if input.referenceWorkflow
-        else ""
-    )
-
-    result =chain.invoke(
-        {
-            "userPrompt": input.userPrompt,
-            "generatedWorkflow": input.generatedWorkflow,
-            "referenceSection": reference_section,
-        }
-    )
+    result =chain.invoke(evaluator_chain_input(input))
 
     return result
+
+
+async def ainvoke_evaluator_chain(
+    chain: Runnable,
+    input: EvaluationInput,
+) -> Any:
+    """
+    Async variant of invoke_evaluator_chain
+    """
+    return await chain.ainvoke(evaluator_chain_input(input))
+
+
+def to_result_model(result_model: Type[TResult], raw_result: Any) -> TResult:
+    """
+    Structured output may come back as a model instance or a plain dict
+    """
+    if isinstance(raw_result, result_model):
+        return raw_result
+    if isinstance(raw_result, BaseModel):
+        raw_result = raw_result.model_dump()
+    return result_model.model_validate(raw_result)
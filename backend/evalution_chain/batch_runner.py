@@ -0,0 +1,443 @@
+# backend/evalution_chain/batch_runner.py
+"""
+Batch evaluation of a test suite: generate a workflow for every TestCase in
+a JSONL file and score it with aevaluate_workflow.
+
+    python -m backend.evalution_chain.batch_runner cases.jsonl --run-dir runs/nightly \\
+        --concurrency 4 --tokens-per-minute 200000
+
+- cases run on a fixed pool of `--concurrency` workers
+- a case only starts while the tokens used in the last minute plus the
+  expected usage of the running cases fit the tokens-per-minute budget
+- every finished case is appended to <run-dir>/results.jsonl and fsynced, so
+  running the same command again after a crash skips the finished cases
+  (failed cases are retried)
+- a progress line with running aggregates is printed after every case and
+  <run-dir>/summary.json is rewritten as the run goes
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import sys
+import time
+import traceback
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, TextIO, Tuple
+
+from backend.evalution_chain.evalution import EvaluationInput, SimpleWorkflow, TestCase
+
+RESULTS_FILE = "results.jsonl"
+SUMMARY_FILE = "summary.json"
+
+SCORED_CATEGORIES = [
+    "functionality",
+    "connections",
+    "expressions",
+    "nodeConfiguration",
+    "structuralSimilarity",
+    "efficiency",
+    "dataFlow",
+    "maintainability",
+    "bestPractices",
+]
+
+
+def load_cases(path: str) -> List[TestCase]:
+    """TestCases from a JSONL file; blank lines are skipped, duplicate ids are an error"""
+    cases: List[TestCase] = []
+    seen = set()
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                case = TestCase.model_validate_json(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_no}: invalid test case: {e}") from e
+            if case.id in seen:
+                raise ValueError(f"{path}:{line_no}: duplicate test case id {case.id!r}")
+            seen.add(case.id)
+            cases.append(case)
+    return cases
+
+
+# ===== Checkpoint =====
+
+class Checkpoint:
+    """Append-only results.jsonl; one record per finished case attempt"""
+
+    def __init__(self, run_dir: str):
+        os.makedirs(run_dir, exist_ok=True)
+        self.path = os.path.join(run_dir, RESULTS_FILE)
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Latest record per case id. A line cut off by a crash is ignored"""
+        records: Dict[str, Dict[str, Any]] = {}
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and "id" in record:
+                    records[record["id"]] = record
+        return records
+
+    def finished(self) -> Dict[str, Dict[str, Any]]:
+        """Cases whose latest attempt succeeded; failed cases are run again"""
+        return {case_id: record for case_id, record in self.load().items() if not record.get("error")}
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with open(self.path, "a", encoding="utf-8") as f:
+            # a partial line from an earlier crash must not swallow this record
+            if f.tell() and not self._ends_with_newline():
+                f.write("\n")
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+
+# ===== Token budget =====
+
+class TokenBudget:
+    """
+    Sliding one-minute window over the tokens actually used, plus a
+    reservation for every running case. acquire() waits until the new case's
+    reservation fits. An estimate larger than the whole budget is clamped to
+    it, so such a case runs alone once the window is empty instead of never.
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, tokens_per_minute: Optional[int], clock: Callable[[], float] = time.monotonic):
+        self.tokens_per_minute = tokens_per_minute
+        self.clock = clock
+        self._used: Deque[Tuple[float, float]] = deque()
+        self._used_total = 0.0
+        self._reserved = 0.0
+        self._running = 0
+        self._changed = asyncio.Condition()
+
+    def _expire(self, now: float) -> None:
+        while self._used and now - self._used[0][0] >= self.WINDOW_SECONDS:
+            self._used_total -= self._used.popleft()[1]
+
+    def _wait_seconds(self, now: float) -> float:
+        """Until the oldest usage leaves the window, or a running case finishes"""
+        if not self._used:
+            return self.WINDOW_SECONDS
+        return max(0.05, self.WINDOW_SECONDS - (now - self._used[0][0]))
+
+    async def acquire(self, estimate: float) -> None:
+        async with self._changed:
+            while self.tokens_per_minute:
+                now = self.clock()
+                self._expire(now)
+                needed = min(estimate, self.tokens_per_minute)
+                if self._used_total + self._reserved + needed <= self.tokens_per_minute:
+                    break
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._changed.wait(), self._wait_seconds(now))
+            self._reserved += estimate
+            self._running += 1
+
+    async def release(self, estimate: float, used: float) -> None:
+        async with self._changed:
+            self._reserved -= estimate
+            self._running -= 1
+            if used:
+                self._used.append((self.clock(), used))
+                self._used_total += used
+            self._changed.notify_all()
+
+    def used_last_minute(self) -> float:
+        self._expire(self.clock())
+        return self._used_total
+
+
+# ===== Aggregates =====
+
+class RunStats:
+    """Running aggregates over successful records, resumed ones included"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.overall: List[float] = []
+        self.categories: Dict[str, List[float]] = {name: [] for name in SCORED_CATEGORIES}
+        self.failed = 0
+        self.tokens = 0.0
+        self.resumed = 0
+        self.started = time.monotonic()
+        self.finished_this_run = 0
+
+    def add(self, record: Dict[str, Any], resumed: bool = False) -> None:
+        if resumed:
+            self.resumed += 1
+        else:
+            self.finished_this_run += 1
+            self.tokens += record.get("tokens", 0)
+
+        if record.get("error"):
+            self.failed += 1
+            return
+        self.overall.append(record["overallScore"])
+        for name, score in record.get("scores", {}).items():
+            if score is not None and name in self.categories:
+                self.categories[name].append(score)
+
+    @property
+    def done(self) -> int:
+        return len(self.overall) + self.failed
+
+    def mean_tokens_per_case(self) -> Optional[float]:
+        return self.tokens / self.finished_this_run if self.finished_this_run else None
+
+    def summary(self) -> Dict[str, Any]:
+        def describe(values: List[float]) -> Dict[str, Any]:
+            if not values:
+                return {"n": 0}
+            return {
+                "n": len(values),
+                "mean": round(statistics.fmean(values), 4),
+                "median": round(statistics.median(values), 4),
+                "stdev": round(statistics.stdev(values), 4) if len(values) > 1 else 0.0,
+                "min": round(min(values), 4),
+                "max": round(max(values), 4),
+            }
+
+        elapsed = time.monotonic() - self.started
+        return {
+            "cases": self.total,
+            "done": self.done,
+            "succeeded": len(self.overall),
+            "failed": self.failed,
+            "resumed": self.resumed,
+            "overallScore": describe(self.overall),
+            "categories": {name: describe(values) for name, values in self.categories.items()},
+            "tokens": int(self.tokens),
+            "elapsed_seconds": round(elapsed, 1),
+            "cases_per_minute": round(self.finished_this_run / elapsed * 60, 2) if elapsed else 0.0,
+        }
+
+    def progress_line(self, record: Dict[str, Any], budget: TokenBudget) -> str:
+        if record.get("error"):
+            outcome = f"FAILED ({record['error'].splitlines()[0][:80]})"
+        else:
+            outcome = f"score {record['overallScore']:.3f}"
+        mean = f"{statistics.fmean(self.overall):.3f}" if self.overall else "-"
+        return (
+            f"[{self.done}/{self.total}] {record['id']}: {outcome} | "
+            f"mean {mean}, failed {self.failed}, "
+            f"{int(budget.used_last_minute())} tok/min, {int(self.tokens)} tokens"
+        )
+
+
+# ===== Cases =====
+
+async def generate_workflow_for_prompt(prompt: str) -> Dict[str, Any]:
+    """Analyze pipeline for the nodes, then the workflow structure in n8n format"""
+    from backend.main import run_analyze_pipeline
+    from backend.mytools.generate_from_parsed_bp import generate_workflow_structure, workflow_to_n8n_format
+    from backend.mytools.parse_best_practices import NodeInfo
+
+    run = await run_analyze_pipeline(prompt)
+    nodes = [
+        NodeInfo(
+            name=n["name"],
+            node_id=n["node_id"],
+            purpose=n.get("purpose", ""),
+            category=n.get("category", ""),
+            pitfalls=n.get("pitfalls", []),
+            use_cases=n.get("use_cases", []),
+            alternatives=n.get("alternatives", []),
+        )
+        for n in run.results["adapt"]
+    ]
+    workflow = await asyncio.to_thread(
+        generate_workflow_structure,
+        user_intent=prompt,
+        selected_nodes=nodes,
+        patterns=[],
+        guidelines=[],
+    )
+    return workflow_to_n8n_format(workflow)
+
+
+def score_record(case: TestCase, result: Any, tokens: Dict[str, float], seconds: float) -> Dict[str, Any]:
+    scores = {}
+    for name in SCORED_CATEGORIES:
+        category = getattr(result, name)
+        scores[name] = category.score if category.applicable else None
+    return {
+        "id": case.id,
+        "name": case.name,
+        "overallScore": result.overallScore,
+        "scores": scores,
+        "criticalIssues": result.criticalIssues,
+        "tokens": int(tokens["prompt"] + tokens["completion"]),
+        "seconds": round(seconds, 2),
+        "result": result.model_dump(),
+    }
+
+
+async def run_case(case: TestCase, llm: Any, preset: Optional[str]) -> Dict[str, Any]:
+    from backend.evalution_chain.workflow_evaluator import aevaluate_workflow
+    from backend.metrics import track_tokens
+
+    started = time.perf_counter()
+    with track_tokens() as tokens:
+        try:
+            generated = await generate_workflow_for_prompt(case.prompt)
+            result = await aevaluate_workflow(llm, EvaluationInput(
+                userPrompt=case.prompt,
+                generatedWorkflow=SimpleWorkflow(**generated),
+                referenceWorkflow=case.referenceWorkflow,
+                referenceWorkflows=case.referenceWorkflows,
+                preset=preset,
+            ))
+        except Exception as e:
+            return {
+                "id": case.id,
+                "name": case.name,
+                "error": f"{type(e).__name__}: {e}\n{traceback.format_exc()}",
+                "tokens": int(tokens["prompt"] + tokens["completion"]),
+                "seconds": round(time.perf_counter() - started, 2),
+            }
+    return score_record(case, result, tokens, time.perf_counter() - started)
+
+
+async def run_batch(
+    cases: List[TestCase],
+    run_dir: str,
+    concurrency: int = 4,
+    tokens_per_minute: Optional[int] = None,
+    tokens_per_case: float = 20000,
+    preset: Optional[str] = None,
+    out: TextIO = sys.stdout,
+) -> Dict[str, Any]:
+    """
+    Run every case not already finished in run_dir and return the summary.
+    tokens_per_case is the reservation for the first cases; after that the
+    mean usage of the cases finished in this run is used.
+    """
+    from backend.llm_config import get_llm
+
+    checkpoint = Checkpoint(run_dir)
+    finished = checkpoint.finished()
+    stats = RunStats(len(cases))
+    for case in cases:
+        if case.id in finished:
+            stats.add(finished[case.id], resumed=True)
+
+    pending = [case for case in cases if case.id not in finished]
+    if stats.resumed:
+        print(f"resuming {run_dir}: {stats.resumed} cases already done, {len(pending)} to go", file=out, flush=True)
+
+    llm = get_llm()
+    budget = TokenBudget(tokens_per_minute)
+    queue: asyncio.Queue = asyncio.Queue()
+    for case in pending:
+        queue.put_nowait(case)
+    summary_path = os.path.join(run_dir, SUMMARY_FILE)
+
+    def write_summary() -> None:
+        tmp = summary_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(stats.summary(), f, indent=2)
+        os.replace(tmp, summary_path)
+
+    async def worker() -> None:
+        while True:
+            try:
+                case = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            estimate = stats.mean_tokens_per_case() or tokens_per_case
+            await budget.acquire(estimate)
+            record = None
+            try:
+                record = await run_case(case, llm, preset)
+            finally:
+                await budget.release(estimate, record["tokens"] if record else 0)
+
+            checkpoint.append(record)
+            stats.add(record)
+            print(stats.progress_line(record, budget), file=out, flush=True)
+            write_summary()
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(pending) or 1)))))
+    write_summary()
+    return stats.summary()
+
+
+def print_summary(summary: Dict[str, Any], out: TextIO) -> None:
+    overall = summary["overallScore"]
+    print(
+        f"\n{summary['succeeded']}/{summary['cases']} cases scored, {summary['failed']} failed, "
+        f"{summary['tokens']} tokens in {summary['elapsed_seconds']} s",
+        file=out,
+    )
+    if overall["n"]:
+        print(
+            f"  {'overall':<20} mean {overall['mean']:.3f}  median {overall['median']:.3f}"
+            f"  min {overall['min']:.3f}  max {overall['max']:.3f}",
+            file=out,
+        )
+    for name, stats in summary["categories"].items():
+        if stats["n"]:
+            print(f"  {name:<20} mean {stats['mean']:.3f}  (n={stats['n']})", file=out)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate and evaluate workflows for a JSONL test suite")
+    parser.add_argument("cases", help="JSONL file, one TestCase per line")
+    parser.add_argument("--run-dir", required=True, help="checkpoint and summary directory; reuse it to resume")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("BATCH_CONCURRENCY", "4")))
+    parser.add_argument("--tokens-per-minute", type=int, default=int(os.getenv("BATCH_TOKENS_PER_MINUTE", "0")) or None,
+                        help="LLM token budget (prompt + completion); unlimited when unset")
+    parser.add_argument("--tokens-per-case", type=float, default=20000,
+                        help="expected tokens per case until this run has measured its own")
+    parser.add_argument("--preset", choices=["strict", "standard", "lenient", "fast"], default=None)
+    parser.add_argument("--limit", type=int, default=None, help="only the first N cases")
+    parser.add_argument("--verbose", action="store_true", help="keep the pipeline's own output")
+    args = parser.parse_args(argv)
+
+    cases = load_cases(args.cases)[: args.limit]
+    out = sys.stdout
+
+    async def run() -> Dict[str, Any]:
+        return await run_batch(
+            cases,
+            args.run_dir,
+            concurrency=args.concurrency,
+            tokens_per_minute=args.tokens_per_minute,
+            tokens_per_case=args.tokens_per_case,
+            preset=args.preset,
+            out=out,
+        )
+
+    if args.verbose:
+        summary = asyncio.run(run())
+    else:
+        # progress goes to the real stdout, the pipeline's prints are dropped
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            summary = asyncio.run(run())
+
+    print_summary(summary, out)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,9 +6,12 @@ from langchain_core.language_models.chat_models import BaseChatModel
 # External Imports (SAME ROLE AS TS)
 
 from backend.mytools.best_practices.index import documentation
-from backend.evalution_chain.base import create_evaluator_chain
+from backend.evalution_chain.base import create_evaluator_chain, to_result_model
 from backend.evalution_chain.evalution import EvaluationInput
-from backend.Chains.prompt_categorization  import prompt_categorization_chain
+from backend.Chains.prompt_categorization  import (
+    prompt_categorization_chain,
+    aprompt_categorization_chain,
+)
 
 # Schema (ZOD → PYDANTIC)
 class BestPracticeViolation(BaseModel):
@@ -93,6 +96,42 @@ def createBestPracticesEvaluatorChain(llm: BaseChatModel):
 
 
 # LOAD RELEVANT BEST PRACTICES
+def bestPracticesForTechniques(techniques: List[str]) -> Dict[str, Any]:
+    relevant_docs: List[str] = []
+
+    for technique in techniques:
+        best_practice = documentation.get(technique)
+        if best_practice:
+            relevant_docs.append(
+                f"## Best Practices for {technique}\n\n"
+                f"{best_practice.get_documentation()}"
+            )
+
+    if not relevant_docs:
+        return {
+            "documentation": (
+                "No specific best practices documentation available for this workflow type. "
+                "Evaluate based on general n8n workflow principles."
+            ),
+            "techniques": techniques,
+        }
+
+    return {
+        "documentation": "\n\n---\n\n".join(relevant_docs),
+        "techniques": techniques,
+    }
+
+
+def _fallback_best_practices() -> Dict[str, Any]:
+    return {
+        "documentation": (
+            "Unable to load specific best practices. "
+            "Evaluate based on general n8n workflow principles."
+        ),
+        "techniques": [],
+    }
+
+
 def loadRelevantBestPractices(
     llm: BaseChatModel,
     userPrompt: str,
@@ -100,52 +139,28 @@ def loadRelevantBestPractices(
     try:
         # Categorize user prompt
         categorization =  prompt_categorization_chain(llm, userPrompt)
+        return bestPracticesForTechniques(categorization.techniques or [])
 
-        relevant_docs: List[str] = []
-
-        for technique in categorization.get("techniques", []):
-            best_practice = documentation.get(technique)
-            if best_practice:
-                relevant_docs.append(
-                    f"## Best Practices for {technique}\n\n"
-                    f"{best_practice.get_documentation()}"
-                )
-
-        if not relevant_docs:
-            return {
-                "documentation": (
-                    "No specific best practices documentation available for this workflow type. "
-                    "Evaluate based on general n8n workflow principles."
-                ),
-                "techniques": categorization.get("techniques", []),
-            }
+    except Exception:
+        return _fallback_best_practices()
 
-        return {
-            "documentation": "\n\n---\n\n".join(relevant_docs),
-            "techniques": categorization.get("techniques", []),
-        }
+
+async def aloadRelevantBestPractices(
+    llm: BaseChatModel,
+    userPrompt: str,
+) -> Dict[str, Any]:
+    try:
+        categorization = await aprompt_categorization_chain(llm, userPrompt)
+        return bestPracticesForTechniques(categorization.techniques or [])
 
     except Exception:
-        return {
-            "documentation": (
-                "Unable to load specific best practices. "
-                "Evaluate based on general n8n workflow principles."
-            ),
-            "techniques": [],
-        }
+        return _fallback_best_practices()
 
 
-# MAIN EVALUATION FUNCTION
-def evaluateBestPractices(
-    llm: BaseChatModel,
+def _best_practices_chain_input(
     input: EvaluationInput,
-) -> BestPracticesResult:
-    # Load best practices + techniques
-    best_practices_data = loadRelevantBestPractices(
-        llm,
-        input.userPrompt,
-    )
-
+    best_practices_data: Dict[str, Any],
+) -> Dict[str, Any]:
     # Optional reference workflow
     referenceSection = (
         f"<reference_workflow>\n{input.referenceWorkflow}\n</reference_workflow>"
@@ -153,21 +168,45 @@ def evaluateBestPractices(
         else ""
     )
 
-    # Create evaluator chain
-    chain = createBestPracticesEvaluatorChain(llm)
-
-    chain_input = {
+    return {
         "userPrompt": input.userPrompt,
         "generatedWorkflow": input.generatedWorkflow,
         "bestPractices": best_practices_data["documentation"],
         "referenceSection": referenceSection,
     }
 
+
+# MAIN EVALUATION FUNCTION
+def evaluateBestPractices(
+    llm: BaseChatModel,
+    input: EvaluationInput,
+) -> BestPracticesResult:
+    # Load best practices + techniques
+    best_practices_data = loadRelevantBestPractices(
+        llm,
+        input.userPrompt,
+    )
+
+    # Create evaluator chain
+    chain = createBestPracticesEvaluatorChain(llm)
+
     # Invoke evaluator
-    result = chain.invoke(chain_input)
+    result = chain.invoke(_best_practices_chain_input(input, best_practices_data))
 
     # Attach techniques and return
-    return BestPracticesResult(
-        **result,
-        # techniques=best_practices_data["techniques"],
+    return to_result_model(BestPracticesResult, result)
+
+
+async def aevaluateBestPractices(
+    llm: BaseChatModel,
+    input: EvaluationInput,
+) -> BestPracticesResult:
+    best_practices_data = await aloadRelevantBestPractices(
+        llm,
+        input.userPrompt,
     )
+
+    chain = createBestPracticesEvaluatorChain(llm)
+    result = await chain.ainvoke(_best_practices_chain_input(input, best_practices_data))
+
+    return to_result_model(BestPracticesResult, result)
@@ -0,0 +1,175 @@
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError, create_model
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
+
+from backend.evalution_chain import (
+    best_practice_evalution,
+    connection_evalution,
+    data_flow_evalution,
+    efficiency_evalution,
+    expression_evalution,
+    functionality_evalution,
+    maintainability_evalution,
+    node_config_evalution,
+)
+from backend.evalution_chain.base import OperationalError, evaluator_chain_input, to_result_model
+from backend.evalution_chain.evalution import EvaluationInput
+
+
+# Combined evaluator: one LLM call scores several categories at once, so the
+# workflow JSON and user prompt are sent once instead of once per category.
+# Every category keeps its own rubric and result model; categories whose part
+# of the response does not validate are returned as missing so the caller can
+# fall back to the per-category evaluator.
+
+
+def _as(model: Type[BaseModel]) -> Callable[[Any], BaseModel]:
+    return lambda raw: to_result_model(model, raw)
+
+
+# category -> (result model, rubric, finalize raw result)
+COMBINED_CATEGORIES: Dict[str, Tuple[Type[BaseModel], str, Callable[[Any], BaseModel]]] = {
+    "functionality": (
+        functionality_evalution.FunctionalityResult,
+        functionality_evalution.system_prompt,
+        _as(functionality_evalution.FunctionalityResult),
+    ),
+    "connections": (
+        connection_evalution.ConnectionsResult,
+        connection_evalution.system_prompt,
+        _as(connection_evalution.ConnectionsResult),
+    ),
+    "expressions": (
+        expression_evalution.ExpressionsResult,
+        expression_evalution.system_prompt,
+        _as(expression_evalution.ExpressionsResult),
+    ),
+    "nodeConfiguration": (
+        node_config_evalution.NodeConfigurationResult,
+        node_config_evalution.SYSTEM_PROMPT,
+        _as(node_config_evalution.NodeConfigurationResult),
+    ),
+    "efficiency": (
+        efficiency_evalution.EfficiencyResult,
+        efficiency_evalution.system_prompt,
+        efficiency_evalution.finalizeEfficiency,
+    ),
+    "dataFlow": (
+        data_flow_evalution.DataFlowResult,
+        data_flow_evalution.system_prompt,
+        _as(data_flow_evalution.DataFlowResult),
+    ),
+    "maintainability": (
+        maintainability_evalution.MaintainabilityResult,
+        maintainability_evalution.system_prompt,
+        maintainability_evalution.finalizeMaintainability,
+    ),
+    "bestPractices": (
+        best_practice_evalution.BestPracticesResult,
+        best_practice_evalution.system_prompt,
+        _as(best_practice_evalution.BestPracticesResult),
+    ),
+}
+
+
+SYSTEM_PREAMBLE = """
+You are an expert n8n workflow evaluator. Evaluate the workflow below in each
+of the following categories independently. Apply only that category's rubric
+and scoring rules to it, and return one object with one key per category.
+""".strip()
+
+
+HUMAN_TEMPLATE = """
+Evaluate this workflow in every category listed in the instructions:
+
+<user_prompt>
+{userPrompt}
+</user_prompt>
+
+<generated_workflow>
+{generatedWorkflow}
+</generated_workflow>
+
+{referenceSection}
+
+{bestPracticesSection}
+
+Provide the evaluation of every category with its score, violations and the other fields of its schema.
+""".strip()
+
+
+def combined_schema(categories: List[str]) -> Dict[str, Any]:
+    """JSON schema of the combined response. Passed as a dict so the parsed
+    response stays raw and categories are validated one by one"""
+    model = create_model(
+        "WorkflowEvaluation",
+        **{name: (COMBINED_CATEGORIES[name][0], ...) for name in categories},
+    )
+    schema = model.model_json_schema()
+    schema["description"] = "Evaluation of an n8n workflow, one entry per category"
+    return schema
+
+
+def create_combined_evaluator_chain(llm: BaseChatModel, categories: List[str]):
+    if not hasattr(llm, "with_structured_output"):
+        raise OperationalError("LLM doesn't support structured output")
+
+    rubrics = "\n\n".join(
+        f"# CATEGORY: {name}\n\n{COMBINED_CATEGORIES[name][1]}" for name in categories
+    )
+    prompt = ChatPromptTemplate.from_messages([
+        SystemMessage(content=f"{SYSTEM_PREAMBLE}\n\n{rubrics}"),
+        HumanMessagePromptTemplate.from_template(HUMAN_TEMPLATE),
+    ])
+    return prompt | llm.with_structured_output(combined_schema(categories))
+
+
+def parse_combined_result(raw: Any, categories: List[str], techniques: List[str]) -> Dict[str, BaseModel]:
+    """Validated result per category; invalid or missing categories are left out"""
+    results: Dict[str, BaseModel] = {}
+    if not isinstance(raw, dict):
+        return results
+
+    for name in categories:
+        value = raw.get(name)
+        if name == "bestPractices" and isinstance(value, dict):
+            value = {"techniques": techniques, **value}
+        try:
+            results[name] = COMBINED_CATEGORIES[name][2](value)
+        except (ValidationError, TypeError, ValueError) as e:
+            print(f"Combined evaluation: {name} did not validate, falling back ({e.__class__.__name__})")
+    return results
+
+
+async def aevaluate_combined(
+    llm: BaseChatModel,
+    input: EvaluationInput,
+    categories: List[str],
+) -> Dict[str, BaseModel]:
+    """
+    Score `categories` with a single LLM call (plus the prompt categorization
+    bestPractices needs). Returns only the categories that validated.
+    """
+    categories = [name for name in categories if name in COMBINED_CATEGORIES]
+    if not categories:
+        return {}
+
+    techniques: List[str] = []
+    best_practices_section = ""
+    if "bestPractices" in categories:
+        best_practices = await best_practice_evalution.aloadRelevantBestPractices(llm, input.userPrompt)
+        techniques = best_practices["techniques"]
+        best_practices_section = (
+            "<best_practices_documentation>\n"
+            f"{best_practices['documentation']}\n"
+            "</best_practices_documentation>"
+        )
+
+    raw = await create_combined_evaluator_chain(llm, categories).ainvoke({
+        **evaluator_chain_input(input),
+        "bestPracticesSection": best_practices_section,
+    })
+    return parse_combined_result(raw, categories, techniques)
@@ -3,7 +3,11 @@ from pydantic import BaseModel, Field
 
 from langchain_core.language_models.chat_models import BaseChatModel
 
-from backend.evalution_chain.base import create_evaluator_chain, invoke_evaluator_chain
+from backend.evalution_chain.base import (
+    create_evaluator_chain,
+    invoke_evaluator_chain,
+    ainvoke_evaluator_chain,
+)
 from backend.evalution_chain.evalution import EvaluationInput
 
 
@@ -104,3 +108,13 @@ def evaluate_connections(
         create_connections_evaluator_chain(llm),
         input,
     )
+
+
+async def aevaluate_connections(
+    llm: BaseChatModel,
+    input: EvaluationInput,
+) -> ConnectionsResult:
+    return await ainvoke_evaluator_chain(
+        create_connections_evaluator_chain(llm),
+        input,
+    )
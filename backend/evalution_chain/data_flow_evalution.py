@@ -3,7 +3,7 @@ from pydantic import BaseModel, Field
 
 from langchain_core.language_models.chat_models import BaseChatModel
 
-from .base import create_evaluator_chain, invoke_evaluator_chain
+from .base import create_evaluator_chain, invoke_evaluator_chain, ainvoke_evaluator_chain
 from backend.evalution_chain.evalution import EvaluationInput
 
 
@@ -175,3 +175,13 @@ def evaluateDataFlow(
         createDataFlowEvaluatorChain(llm),
         input,
     )
+
+
+async def aevaluateDataFlow(
+    llm: BaseChatModel,
+    input: EvaluationInput,
+) -> DataFlowResult:
+    return await ainvoke_evaluator_chain(
+        createDataFlowEvaluatorChain(llm),
+        input,
+    )
@@ -1,7 +1,12 @@
 from typing import List, Literal
 from pydantic import BaseModel, Field
 from langchain_core.language_models.chat_models import BaseChatModel
-from .base import create_evaluator_chain, invoke_evaluator_chain
+from .base import (
+    create_evaluator_chain,
+    invoke_evaluator_chain,
+    ainvoke_evaluator_chain,
+    to_result_model,
+)
 from ..evalution_chain.evalution  import EvaluationInput
 
 class Violation(BaseModel):
@@ -80,24 +85,37 @@ def createEfficiencyEvaluatorChain(llm: BaseChatModel):
 
 # ---------- EVALUATION (IMPORTANT PART) ----------
 
+def finalizeEfficiency(raw_result) -> EfficiencyResult:
+    #  raw_result may be a dict or a model — MUST convert
+    efficiency = to_result_model(EfficiencyResult, raw_result)
+
+    # calculate overall score
+    efficiency.score = (
+        efficiency.redundancyScore
+        + efficiency.pathOptimization
+        + efficiency.nodeCountEfficiency
+    ) / 3
+
+    return efficiency
+
+
 def evaluateEfficiency(
     llm: BaseChatModel,
     input: EvaluationInput,
 ) -> EfficiencyResult:
-
     raw_result =  invoke_evaluator_chain(
         createEfficiencyEvaluatorChain(llm),
         input,
     )
+    return finalizeEfficiency(raw_result)
 
-    #  raw_result IS dict — MUST convert
-    efficiency = EfficiencyResult(**raw_result)
-
-    # calculate overall score
-    efficiency.score = (
-        efficiency.redundancyScore
-        + efficiency.pathOptimization
-        + efficiency.nodeCountEfficiency
-    ) / 3
 
-    return efficiency
\ No newline at end of file
+async def aevaluateEfficiency(
+    llm: BaseChatModel,
+    input: EvaluationInput,
+) -> EfficiencyResult:
+    raw_result = await ainvoke_evaluator_chain(
+        createEfficiencyEvaluatorChain(llm),
+        input,
+    )
+    return finalizeEfficiency(raw_result)
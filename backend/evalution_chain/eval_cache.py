@@ -0,0 +1,217 @@
+"""
+Per-category cache of evaluation results, keyed by a workflow fingerprint.
+
+The fingerprint is a sha256 over the canonical form of a workflow: nodes
+sorted by name without ids, positions or webhook ids, and connections as a
+sorted list of edges between node names. Moving nodes on the canvas or
+re-importing the workflow (new ids) keeps the fingerprint.
+
+Each category is keyed by the parts of the canonical workflow its rubric
+judges (CATEGORY_INPUTS), the prompt, the reference workflows, the preset,
+the model and an evaluator version derived from the category's rubric and
+result schema. After a small edit only the categories reading the edited
+part are evaluated again; editing a rubric invalidates its category only.
+
+Env:
+    EVAL_CACHE_ENABLED       "true" / "false" (default true)
+    EVAL_CACHE_MAX_ENTRIES   in-memory LRU bound (default 4096)
+    EVAL_CACHE_TTL_SECONDS   entry lifetime, 0 = never expire (default 86400)
+    EVAL_CACHE_SQLITE_PATH   enables the on-disk tier when set
+"""
+
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from backend.evalution_chain.base import to_result_model
+from backend.evalution_chain.combined_evalution import COMBINED_CATEGORIES
+from backend.evalution_chain.evalution import EvaluationInput
+from backend.evalution_chain.static_analysis import workflow_dict, workflow_links
+from backend.llm_cache import ResponseCacheStore, _env_flag, make_cache_key
+from backend.metrics import register_collector
+
+# bump to drop every cached evaluation, e.g. after changing how results are scored
+EVAL_CACHE_VERSION = "1"
+
+# node fields that never change how a workflow behaves
+IGNORED_NODE_FIELDS = {"id", "position", "webhookId"}
+
+# Parts of the canonical workflow each category's rubric judges:
+#   nodes        name, type, typeVersion, disabled, credential types
+#   parameters   node parameters
+#   notes        node notes
+#   connections  edges between nodes
+CATEGORY_INPUTS: Dict[str, List[str]] = {
+    "functionality": ["nodes", "parameters", "connections"],
+    "connections": ["nodes", "connections"],
+    "expressions": ["nodes", "parameters", "connections"],
+    "nodeConfiguration": ["nodes", "parameters"],
+    "efficiency": ["nodes", "parameters", "connections"],
+    "dataFlow": ["nodes", "parameters", "connections"],
+    "maintainability": ["nodes", "notes", "connections"],
+    "bestPractices": ["nodes", "parameters", "connections"],
+}
+
+
+# ===== Fingerprint =====
+
+def normalize_workflow(workflow: Any) -> Dict[str, Any]:
+    """Canonical form split into the CATEGORY_INPUTS sections"""
+    workflow = workflow_dict(workflow)
+    nodes = [n for n in workflow.get("nodes") or [] if isinstance(n, dict)]
+
+    sections: Dict[str, Dict[str, Any]] = {"nodes": {}, "parameters": {}, "notes": {}}
+    for node in sorted(nodes, key=lambda n: str(n.get("name", ""))):
+        name = str(node.get("name", ""))
+        sections["nodes"][name] = {
+            "type": node.get("type"),
+            "typeVersion": node.get("typeVersion"),
+            "disabled": bool(node.get("disabled", False)),
+            "credentials": sorted((node.get("credentials") or {}).keys()),
+            "other": {
+                key: value
+                for key, value in node.items()
+                if key not in IGNORED_NODE_FIELDS
+                and key not in ("name", "type", "typeVersion", "disabled", "credentials", "parameters", "notes")
+            },
+        }
+        sections["parameters"][name] = node.get("parameters") or {}
+        sections["notes"][name] = node.get("notes") or ""
+
+    # connections keyed by node id (our generator) or by name (n8n) end up identical
+    edges = [list(link) for link in workflow_links(workflow)]
+
+    return {**sections, "connections": sorted(edges, key=json.dumps)}
+
+
+def _digest(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def workflow_fingerprint(workflow: Any, sections: Optional[Iterable[str]] = None) -> str:
+    """sha256 of the canonical workflow, or of the given sections of it"""
+    normalized = normalize_workflow(workflow)
+    if sections is not None:
+        normalized = {name: normalized[name] for name in sections}
+    return _digest(normalized)
+
+
+@lru_cache(maxsize=None)
+def evaluator_version(category: str) -> str:
+    """Changes whenever the category's rubric or result schema changes"""
+    result_model, rubric, _ = COMBINED_CATEGORIES[category]
+    return make_cache_key(EVAL_CACHE_VERSION, rubric, json.dumps(result_model.model_json_schema(), sort_keys=True))[:16]
+
+
+def category_cache_keys(llm: Any, input: EvaluationInput, categories: Iterable[str]) -> Dict[str, str]:
+    """Cache key per category; categories without a known rubric are left out"""
+    normalized = normalize_workflow(input.generatedWorkflow)
+    model = str(getattr(llm, "model_name", None) or getattr(llm, "model", "") or "")
+    prompt_hash = _digest(input.userPrompt)
+    references = _digest([
+        workflow_fingerprint(reference)
+        for reference in ([input.referenceWorkflow] if input.referenceWorkflow else [])
+        + list(input.referenceWorkflows or [])
+    ])
+
+    keys = {}
+    for name in categories:
+        if name not in CATEGORY_INPUTS or name not in COMBINED_CATEGORIES:
+            continue
+        workflow_part = _digest({section: normalized[section] for section in CATEGORY_INPUTS[name]})
+        keys[name] = make_cache_key(
+            "evaluation", name, evaluator_version(name), input.preset or "",
+            model, prompt_hash, references, workflow_part,
+        )
+    return keys
+
+
+# ===== Cache =====
+
+class EvaluationCache:
+    """Category results as JSON in a ResponseCacheStore"""
+
+    def __init__(self, store: ResponseCacheStore):
+        self.store = store
+
+    def get_many(self, keys: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        for name, key in keys.items():
+            value = self.store.get(key)
+            if value is not None:
+                results[name] = json.loads(value)
+        return results
+
+    def put(self, key: str, result: Any) -> None:
+        if hasattr(result, "model_dump"):
+            result = result.model_dump()
+        # failed or timed out categories are not results worth keeping
+        if isinstance(result, dict) and result.get("applicable", True):
+            self.store.set(key, json.dumps(result))
+
+
+_eval_cache: Optional[EvaluationCache] = None
+_eval_cache_lock = threading.Lock()
+
+
+def get_eval_cache() -> Optional[EvaluationCache]:
+    """Shared cache configured from env, or None when disabled"""
+    global _eval_cache
+
+    if not _env_flag("EVAL_CACHE_ENABLED", True):
+        return None
+
+    if _eval_cache is None:
+        with _eval_cache_lock:
+            if _eval_cache is None:
+                _eval_cache = EvaluationCache(
+                    ResponseCacheStore(
+                        max_entries=int(os.getenv("EVAL_CACHE_MAX_ENTRIES", "4096")),
+                        ttl_seconds=float(os.getenv("EVAL_CACHE_TTL_SECONDS", "86400")),
+                        sqlite_path=os.getenv("EVAL_CACHE_SQLITE_PATH") or None,
+                        table="eval_cache",
+                    )
+                )
+    return _eval_cache
+
+
+def eval_cache_stats() -> Dict[str, Any]:
+    cache = get_eval_cache()
+    return cache.store.stats() if cache else {"enabled": False}
+
+
+for _stat in ("hits", "misses"):
+    register_collector(
+        f"eval_cache_{_stat}_total",
+        "counter",
+        f"Evaluation result cache {_stat}",
+        lambda stat=_stat: eval_cache_stats().get(stat, 0),
+    )
+
+
+# ===== Single category =====
+
+def cached_category(
+    name: str,
+    llm: Any,
+    input: EvaluationInput,
+    evaluate: Callable[..., Any],
+) -> Any:
+    """evaluate(llm=..., input=...) for one category, answered from the cache when possible"""
+    cache = get_eval_cache()
+    key = category_cache_keys(llm, input, [name]).get(name) if cache else None
+    if key is None:
+        return evaluate(llm=llm, input=input)
+
+    cached = cache.get_many({name: key})
+    if name in cached:
+        return to_result_model(COMBINED_CATEGORIES[name][0], cached[name])
+
+    result = evaluate(llm=llm, input=input)
+    cache.put(key, result)
+    return result
+
@@ -20,6 +20,10 @@ class Violation(BaseModel):
 class CategoryScore(BaseModel):
     violations: List[Violation]
     score: float = Field(ge=0, le=1)
+    applicable: bool = Field(
+        default=True,
+        description="False when the evaluator failed or timed out and the category was skipped",
+    )
 
 
 # Structural Similarity
@@ -94,4 +98,5 @@ class EvaluationInput(BaseModel):
     generatedWorkflow: SimpleWorkflow
     referenceWorkflow: Optional[SimpleWorkflow] = None
     referenceWorkflows: Optional[List[SimpleWorkflow]] = None
-    preset: Optional[Literal["strict", "standard", "lenient"]] = None
+    # "fast" skips the LLM and scores only what static analysis can decide
+    preset: Optional[Literal["strict", "standard", "lenient", "fast"]] = None
@@ -2,7 +2,12 @@ from typing import List, Literal
 from pydantic import BaseModel, Field
 from langchain_core.language_models.chat_models import BaseChatModel
 
-from .base import create_evaluator_chain, invoke_evaluator_chain
+from .base import (
+    create_evaluator_chain,
+    invoke_evaluator_chain,
+    ainvoke_evaluator_chain,
+    to_result_model,
+)
 from backend.evalution_chain.evalution import EvaluationInput
 
 
@@ -131,6 +136,17 @@ def evaluateExpressions(
         input,
     )
     # print(f"Raw Result: {raw_result}")
-    # print(f"Expressions Evaluation Parsed Result: {ExpressionsResult(**raw_result)}")
-    #  invoke_evaluator_chain returns dict → convert explicitly
-    return ExpressionsResult(**raw_result)
+    #  invoke_evaluator_chain may return a dict or a model → convert explicitly
+    return to_result_model(ExpressionsResult, raw_result)
+
+
+async def aevaluateExpressions(
+    llm: BaseChatModel,
+    input: EvaluationInput,
+) -> ExpressionsResult:
+
+    raw_result = await ainvoke_evaluator_chain(
+        createExpressionsEvaluatorChain(llm),
+        input,
+    )
+    return to_result_model(ExpressionsResult, raw_result)
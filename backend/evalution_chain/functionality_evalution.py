@@ -3,7 +3,7 @@ from pydantic import BaseModel, Field
 
 from langchain_core.language_models.chat_models import BaseChatModel
 
-from .base import create_evaluator_chain, invoke_evaluator_chain
+from .base import create_evaluator_chain, invoke_evaluator_chain, ainvoke_evaluator_chain
 from backend.evalution_chain.evalution import EvaluationInput
 
 
@@ -114,3 +114,13 @@ def evaluateFunctionality(
         createFunctionalityEvaluatorChain(llm),
         input,
     )
+
+
+async def aevaluateFunctionality(
+    llm: BaseChatModel,
+    input: EvaluationInput,
+) -> FunctionalityResult:
+    return await ainvoke_evaluator_chain(
+        createFunctionalityEvaluatorChain(llm),
+        input,
+    )
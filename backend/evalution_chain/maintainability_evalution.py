@@ -2,7 +2,12 @@ from typing import List, Literal
 from pydantic import BaseModel, Field
 from langchain_core.language_models.chat_models import BaseChatModel
 
-from .base import create_evaluator_chain, invoke_evaluator_chain
+from .base import (
+    create_evaluator_chain,
+    invoke_evaluator_chain,
+    ainvoke_evaluator_chain,
+    to_result_model,
+)
 from backend.evalution_chain.evalution import EvaluationInput
 
 
@@ -82,6 +87,20 @@ def createMaintainabilityEvaluatorChain(llm: BaseChatModel):
 
 # ---------- PUBLIC EVALUATION FUNCTION ----------
 
+def finalizeMaintainability(raw_result) -> MaintainabilityResult:
+    #  dict / model → Pydantic model (VERY IMPORTANT)
+    result = to_result_model(MaintainabilityResult, raw_result)
+
+    # same logic as TS: average of 3 metrics
+    result.score = (
+        result.nodeNamingQuality
+        + result.workflowOrganization
+        + result.modularity
+    ) / 3
+
+    return result
+
+
 def evaluateMaintainability(
     llm: BaseChatModel,
     input: EvaluationInput,
@@ -92,14 +111,17 @@ def evaluateMaintainability(
         input,
     )
 
-    #  dict → Pydantic model (VERY IMPORTANT)
-    result = MaintainabilityResult(**raw_result)
+    return finalizeMaintainability(raw_result)
 
-    # same logic as TS: average of 3 metrics
-    result.score = (
-        result.nodeNamingQuality
-        + result.workflowOrganization
-        + result.modularity
-    ) / 3
 
-    return result
+async def aevaluateMaintainability(
+    llm: BaseChatModel,
+    input: EvaluationInput,
+) -> MaintainabilityResult:
+
+    raw_result = await ainvoke_evaluator_chain(
+        createMaintainabilityEvaluatorChain(llm),
+        input,
+    )
+
+    return finalizeMaintainability(raw_result)
@@ -3,7 +3,7 @@ from pydantic import BaseModel, Field
 from langchain.schema import SystemMessage, HumanMessage
 from langchain.chat_models.base import BaseChatModel
 
-from .base import create_evaluator_chain, invoke_evaluator_chain
+from .base import create_evaluator_chain, invoke_evaluator_chain, ainvoke_evaluator_chain
 from ..evalution_chain.evalution import EvaluationInput
 
 class Violation(BaseModel):
@@ -90,3 +90,10 @@ def evaluate_node_configuration(
     chain = create_node_configuration_evaluator_chain(llm)
     return invoke_evaluator_chain(chain, input)
 
+
+async def aevaluate_node_configuration(
+    llm: BaseChatModel,
+    input: EvaluationInput,
+) -> NodeConfigurationResult:
+    chain = create_node_configuration_evaluator_chain(llm)
+    return await ainvoke_evaluator_chain(chain, input)
@@ -0,0 +1,412 @@
+"""
+Deterministic checks for the connections and expressions categories.
+
+Most of what the connections and expressions evaluators ask the LLM is
+mechanical: does every connection point at an existing node, are there
+orphans, do ai_* links come from sub-nodes that provide them and go to nodes
+that accept them, is every `={{ }}` well formed and does every $('Node')
+resolve. This module answers those directly from the workflow JSON.
+
+Each analysis returns the evaluator's own result model plus `decided`: True
+when the static result is conclusive (a critical issue was found, or there is
+nothing for the LLM to judge). workflow_evaluator skips the LLM call for
+decided categories, and the "fast" preset uses the static results only.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from backend.evalution_chain.connection_evalution import ConnectionsResult, ConnectionViolation
+from backend.evalution_chain.expression_evalution import ExpressionsResult, ExpressionsViolation
+from backend.n8n_worflow.node_connection_types import NodeConnectionTypes
+
+
+# Points deducted per violation, as in the evaluator prompts (score starts at 100)
+VIOLATION_POINTS: Dict[str, float] = {"critical": 40, "major": 20, "minor": 5}
+
+# ai_* connection type -> node type names (part after the package) that accept
+# it as an input; matched as prefixes, so "vectorStore" covers every vector store
+AI_INPUT_ACCEPTORS: Dict[str, Tuple[str, ...]] = {
+    NodeConnectionTypes.AiLanguageModel: (
+        "agent", "chainLlm", "chainRetrievalQa", "chainSummarization",
+        "informationExtractor", "textClassifier", "sentimentAnalysis",
+        "outputParserAutofixing", "toolVectorStore", "retrieverMultiQuery",
+    ),
+    NodeConnectionTypes.AiTool: ("agent", "mcpTrigger"),
+    NodeConnectionTypes.AiMemory: ("agent", "memoryManager", "openAiAssistant"),
+    NodeConnectionTypes.AiEmbedding: ("vectorStore",),
+    NodeConnectionTypes.AiVectorStore: ("toolVectorStore", "retrieverVectorStore"),
+    NodeConnectionTypes.AiDocument: ("vectorStore",),
+    NodeConnectionTypes.AiTextSplitter: ("documentDefaultDataLoader", "documentBinaryInputLoader", "documentJsonInputLoader"),
+    NodeConnectionTypes.AiOutputParser: ("agent", "chainLlm", "outputParserAutofixing"),
+    NodeConnectionTypes.AiRetriever: ("chainRetrievalQa", "retrieverContextualCompression", "retrieverMultiQuery"),
+}
+
+NON_EXECUTING_TYPES = {"stickyNote"}
+
+
+def _local_type(node_type: str) -> str:
+    """'@n8n/n8n-nodes-langchain.agent' -> 'agent'"""
+    return node_type.rsplit(".", 1)[-1]
+
+
+def is_trigger_type(node_type: str) -> bool:
+    name = _local_type(node_type).lower()
+    return name.endswith("trigger") or name == "webhook"
+
+
+def is_tool_type(node_type: str) -> bool:
+    """Tool nodes may use $fromAI"""
+    name = _local_type(node_type)
+    return name.endswith("Tool") or name.startswith("tool") or name == "mcpClientTool"
+
+
+def accepts_ai_input(node_type: str, connection_type: str) -> Optional[bool]:
+    """None when the connection type is not in the table"""
+    acceptors = AI_INPUT_ACCEPTORS.get(connection_type)
+    if acceptors is None:
+        return None
+    return _local_type(node_type).startswith(acceptors)
+
+
+@lru_cache(maxsize=1024)
+def declared_outputs(node_type: str) -> Optional[FrozenSet[str]]:
+    """Output connection types from the node catalog, None when unknown or parameter-dependent"""
+    try:
+        from backend.mytools.node_registry import get_catalog_node
+        node = get_catalog_node(node_type)
+    except Exception:
+        return None
+    if node is None or not isinstance(node.outputs, list):
+        return None
+
+    outputs = set()
+    for output in node.outputs:
+        outputs.add(output.get("type") if isinstance(output, dict) else output)
+    return frozenset(o for o in outputs if isinstance(o, str))
+
+
+def _score(violations: List[Any]) -> float:
+    deducted = sum(v.pointsDeducted for v in violations)
+    return max(0.0, 100.0 - deducted) / 100.0
+
+
+@dataclass
+class StaticAnalysis:
+    result: Union[ConnectionsResult, ExpressionsResult]
+    decided: bool
+
+
+# ===== Workflow index =====
+
+class Edge(NamedTuple):
+    source: str
+    target: str
+    type: str
+
+
+class Link(NamedTuple):
+    source: str
+    output_type: str
+    output_index: int
+    target: str
+    target_type: str
+    target_index: int
+
+
+def workflow_dict(workflow: Any) -> Dict[str, Any]:
+    """Workflow JSON from a dict or SimpleWorkflow model"""
+    if hasattr(workflow, "model_dump"):
+        workflow = workflow.model_dump()
+    if not isinstance(workflow, dict):
+        return {}
+    # /evaluate/best-practices wraps the workflow as SimpleWorkflow(data=...)
+    if "nodes" not in workflow and isinstance(workflow.get("data"), dict):
+        return workflow["data"]
+    return workflow
+
+
+def workflow_links(workflow: Dict[str, Any]) -> Iterator[Link]:
+    """
+    Every connection with both ends as node names. Accepts n8n's shape
+    ({name: {type: [[link, ...] per output]}}) and workflow_to_n8n_format's
+    ({id: {type: [link, ...]}}, links pointing at ids).
+    """
+    nodes = [n for n in workflow.get("nodes") or [] if isinstance(n, dict)]
+    names = {n.get("name") for n in nodes}
+    names_by_id = {n["id"]: n.get("name") for n in nodes if n.get("id") is not None}
+
+    def node_name(key: Any) -> str:
+        return str(key if key in names else names_by_id.get(key, key))
+
+    for source, by_type in (workflow.get("connections") or {}).items():
+        if not isinstance(by_type, dict):
+            continue
+        for output_type, outputs in by_type.items():
+            if not isinstance(outputs, list):
+                continue
+            # flat list: every link leaves output 0
+            grouped = outputs if all(isinstance(o, list) or o is None for o in outputs) else [outputs]
+            for output_index, links in enumerate(grouped):
+                for link in links or []:
+                    if isinstance(link, dict) and link.get("node"):
+                        yield Link(
+                            node_name(source), output_type, output_index,
+                            node_name(link["node"]), link.get("type") or output_type, link.get("index", 0),
+                        )
+
+
+class WorkflowIndex:
+    """Nodes by name plus the connection list of a workflow JSON"""
+
+    def __init__(self, workflow: Dict[str, Any]):
+        workflow = workflow_dict(workflow)
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        for node in workflow.get("nodes") or []:
+            if isinstance(node, dict) and node.get("name"):
+                self.nodes[node["name"]] = node
+
+        self.edges: List[Edge] = [
+            Edge(link.source, link.target, link.target_type) for link in workflow_links(workflow)
+        ]
+
+        self.incoming: Dict[str, List[Edge]] = {name: [] for name in self.nodes}
+        self.outgoing: Dict[str, List[Edge]] = {name: [] for name in self.nodes}
+        for edge in self.edges:
+            self.outgoing.setdefault(edge.source, []).append(edge)
+            self.incoming.setdefault(edge.target, []).append(edge)
+
+        self._lowercase_names = {name.lower(): name for name in self.nodes}
+
+    def node_type(self, name: str) -> str:
+        return str(self.nodes.get(name, {}).get("type", ""))
+
+    def similar_name(self, name: str) -> Optional[str]:
+        return self._lowercase_names.get(name.lower())
+
+    def is_sub_node(self, name: str) -> bool:
+        """Provides ai_* capabilities instead of taking part in the main flow"""
+        if any(NodeConnectionTypes.is_ai_type(e.type) for e in self.outgoing.get(name, [])):
+            return True
+        outputs = declared_outputs(self.node_type(name))
+        return bool(outputs) and all(NodeConnectionTypes.is_ai_type(o) for o in outputs)
+
+
+# ===== Connections =====
+
+def analyze_connections(workflow: Dict[str, Any]) -> StaticAnalysis:
+    index = WorkflowIndex(workflow)
+    violations: List[ConnectionViolation] = []
+
+    def flag(kind: str, description: str) -> None:
+        violations.append(ConnectionViolation(type=kind, description=description, pointsDeducted=VIOLATION_POINTS[kind]))
+
+    for edge in index.edges:
+        if edge.source not in index.nodes:
+            flag("critical", f"Connection starts at node '{edge.source}', which does not exist")
+            continue
+        if edge.target not in index.nodes:
+            flag("critical", f"'{edge.source}' connects to node '{edge.target}', which does not exist")
+            continue
+        if edge.source == edge.target:
+            flag("major", f"'{edge.source}' is connected to itself")
+
+        if not NodeConnectionTypes.is_ai_type(edge.type):
+            continue
+
+        outputs = declared_outputs(index.node_type(edge.source))
+        if outputs is not None and edge.type not in outputs:
+            flag(
+                "critical",
+                f"'{edge.source}' does not provide {edge.type}; ai_* connections must start at the sub-node "
+                f"that provides the capability",
+            )
+        if accepts_ai_input(index.node_type(edge.target), edge.type) is False:
+            flag("major", f"'{edge.target}' ({index.node_type(edge.target)}) does not accept {edge.type} inputs")
+
+    has_trigger = False
+    for name in index.nodes:
+        node_type = index.node_type(name)
+        if _local_type(node_type) in NON_EXECUTING_TYPES:
+            continue
+        if is_trigger_type(node_type):
+            has_trigger = True
+            continue
+
+        incoming, outgoing = index.incoming.get(name, []), index.outgoing.get(name, [])
+        if len(index.nodes) > 1 and not incoming and not outgoing:
+            flag("major", f"'{name}' is not connected to any other node")
+        elif index.is_sub_node(name):
+            if not any(NodeConnectionTypes.is_ai_type(e.type) for e in outgoing):
+                flag("major", f"Sub-node '{name}' is not attached to a parent node")
+        elif not any(e.type == NodeConnectionTypes.Main for e in incoming):
+            flag("major", f"'{name}' has no incoming main connection, so it never executes")
+
+    if index.nodes and not has_trigger:
+        flag("major", "Workflow has no trigger node")
+
+    critical = any(v.type == "critical" for v in violations)
+    return StaticAnalysis(
+        result=ConnectionsResult(
+            score=_score(violations),
+            violations=violations,
+            analysis=(
+                f"Static analysis of {len(index.nodes)} nodes and {len(index.edges)} connections: "
+                f"{len(violations)} issue(s) found."
+            ),
+        ),
+        decided=critical or not index.nodes,
+    )
+
+
+# ===== Expressions =====
+
+class Token(NamedTuple):
+    kind: str   # name | string | number | punct
+    value: str
+    pos: int
+
+
+_CLOSERS = {")": "(", "]": "[", "}": "{"}
+
+
+def scan_expression(text: str, start: int) -> Tuple[List[Token], Optional[int], Optional[str]]:
+    """
+    Tokenize the JavaScript of one `{{ ... }}` block starting right after the
+    opening braces. Returns (tokens, index after the closing `}}` or None, error).
+    """
+    tokens: List[Token] = []
+    stack: List[str] = []
+    i, n = start, len(text)
+
+    while i < n:
+        ch = text[i]
+        if ch.isspace():
+            i += 1
+        elif ch in "'\"`":
+            j = i + 1
+            while j < n and text[j] != ch:
+                j += 2 if text[j] == "\\" else 1
+            if j >= n:
+                return tokens, None, "unterminated string literal"
+            tokens.append(Token("string", text[i + 1:j], i))
+            i = j + 1
+        elif ch == "}" and not stack and text.startswith("}}", i):
+            return tokens, i + 2, None
+        elif ch.isalpha() or ch in "_$":
+            j = i + 1
+            while j < n and (text[j].isalnum() or text[j] in "_$"):
+                j += 1
+            tokens.append(Token("name", text[i:j], i))
+            i = j
+        elif ch.isdigit():
+            j = i + 1
+            while j < n and (text[j].isalnum() or text[j] == "."):
+                j += 1
+            tokens.append(Token("number", text[i:j], i))
+            i = j
+        else:
+            if ch in "([{":
+                stack.append(ch)
+            elif ch in _CLOSERS:
+                if not stack or stack[-1] != _CLOSERS[ch]:
+                    return tokens, None, f"unbalanced '{ch}'"
+                stack.pop()
+            tokens.append(Token("punct", ch, i))
+            i += 1
+
+    if stack:
+        return tokens, None, f"unclosed '{stack[-1]}'"
+    return tokens, None, "missing closing }}"
+
+
+def _node_references(tokens: List[Token]) -> Iterator[Tuple[str, bool]]:
+    """(node name, uses the legacy $node[...] syntax) for every reference in a block"""
+    for i, token in enumerate(tokens):
+        if token.kind != "name":
+            continue
+        window = [t.value for t in tokens[i + 1:i + 4]]
+        if token.value == "$" and len(window) == 3 and window[0] == "(" and window[2] == ")" \
+                and tokens[i + 2].kind == "string":
+            yield tokens[i + 2].value, False
+        elif token.value == "$node" and len(window) == 3 and window[0] == "[" and window[2] == "]" \
+                and tokens[i + 2].kind == "string":
+            yield tokens[i + 2].value, True
+
+
+def _string_parameters(value: Any, path: str = "") -> Iterator[Tuple[str, str]]:
+    if isinstance(value, str):
+        yield path, value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _string_parameters(item, f"{path}.{key}" if path else str(key))
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            yield from _string_parameters(item, f"{path}[{i}]")
+
+
+def analyze_expressions(workflow: Dict[str, Any]) -> StaticAnalysis:
+    index = WorkflowIndex(workflow)
+    violations: List[ExpressionsViolation] = []
+    expressions = 0
+
+    def flag(kind: str, description: str) -> None:
+        violations.append(ExpressionsViolation(type=kind, description=description, pointsDeducted=VIOLATION_POINTS[kind]))
+
+    for name, node in index.nodes.items():
+        node_type = index.node_type(name)
+        # sticky note content is markdown, not parameters n8n evaluates
+        if _local_type(node_type) in NON_EXECUTING_TYPES:
+            continue
+        for path, value in _string_parameters(node.get("parameters") or {}):
+            where = f"'{name}' parameter {path}"
+
+            if not value.startswith("="):
+                if "{{" in value and "}}" in value[value.index("{{"):]:
+                    expressions += 1
+                    flag("major", f"{where} uses {{{{ }}}} without the = prefix, so it is not evaluated")
+                continue
+
+            i = value.find("{{")
+            while i != -1:
+                expressions += 1
+                tokens, end, error = scan_expression(value, i + 2)
+                if error:
+                    flag("critical", f"{where}: syntax error in expression ({error})")
+                    break
+                if not tokens:
+                    flag("major", f"{where} contains an empty {{{{ }}}} expression")
+
+                for ref, legacy in _node_references(tokens):
+                    if ref not in index.nodes:
+                        similar = index.similar_name(ref)
+                        hint = f" (did you mean '{similar}'?)" if similar else ""
+                        flag("critical", f"{where} references node '{ref}', which does not exist{hint}")
+                    elif legacy:
+                        flag("minor", f"{where} uses legacy $node[\"{ref}\"] syntax instead of $('{ref}')")
+
+                if not is_tool_type(node_type) and any(t.kind == "name" and t.value == "$fromAI" for t in tokens):
+                    flag("critical", f"{where} uses $fromAI outside a tool node")
+
+                i = value.find("{{", end)
+
+    critical = any(v.type == "critical" for v in violations)
+    return StaticAnalysis(
+        result=ExpressionsResult(
+            score=_score(violations),
+            violations=violations,
+            analysis=(
+                f"Static analysis of {expressions} expression(s) in {len(index.nodes)} nodes: "
+                f"{len(violations)} issue(s) found."
+            ),
+        ),
+        decided=critical or expressions == 0,
+    )
+
+
+# category -> static analysis
+STATIC_ANALYZERS = {
+    "connections": analyze_connections,
+    "expressions": analyze_expressions,
+}
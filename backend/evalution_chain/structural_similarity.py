@@ -0,0 +1,166 @@
+"""
+Deterministic structural similarity between a generated workflow and its
+reference workflows.
+
+Three measures over the node graph (sticky notes left out), combined with
+SIMILARITY_WEIGHTS:
+
+    nodeTypes     weighted Jaccard of the node type multisets
+    graph         Weisfeiler-Lehman subtree kernel: every node is relabelled
+                  WL_ITERATIONS times with a hash of its label and the labels
+                  and connection types of its neighbours, and the label
+                  histograms are compared by normalized dot product. It
+                  approximates a labelled graph edit distance in linear time.
+    connections   weighted Jaccard of (source type, connection type, target
+                  type) edge multisets
+
+With several references the best matching one is scored. A comparison takes
+well under a millisecond for workflows of typical size.
+"""
+
+import hashlib
+import math
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from backend.evalution_chain.evalution import EvaluationInput, StructuralSimilarityScore, Violation
+from backend.evalution_chain.static_analysis import (
+    NON_EXECUTING_TYPES,
+    WorkflowIndex,
+    _local_type,
+    is_trigger_type,
+    workflow_dict,
+)
+
+SIMILARITY_WEIGHTS: Dict[str, float] = {
+    "nodeTypes": 0.35,
+    "graph": 0.40,
+    "connections": 0.25,
+}
+
+WL_ITERATIONS = 2
+
+# violations listed per measure, the score covers all differences
+MAX_VIOLATIONS = 8
+
+
+class GraphFeatures(NamedTuple):
+    node_types: Counter
+    wl_labels: Counter
+    edges: Counter
+
+
+def _hash_label(value: str) -> str:
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def graph_features(workflow: Any) -> GraphFeatures:
+    index = WorkflowIndex(workflow_dict(workflow))
+    labels = {
+        name: index.node_type(name)
+        for name in index.nodes
+        if _local_type(index.node_type(name)) not in NON_EXECUTING_TYPES
+    }
+    edges = [e for e in index.edges if e.source in labels and e.target in labels]
+
+    wl_labels: Counter = Counter(f"0:{label}" for label in labels.values())
+    current = labels
+    for iteration in range(1, WL_ITERATIONS + 1):
+        neighbours: Dict[str, List[str]] = {name: [] for name in labels}
+        for edge in edges:
+            neighbours[edge.source].append(f">{edge.type}:{current[edge.target]}")
+            neighbours[edge.target].append(f"<{edge.type}:{current[edge.source]}")
+        current = {
+            name: _hash_label(label + "|" + ",".join(sorted(neighbours[name])))
+            for name, label in current.items()
+        }
+        wl_labels.update(f"{iteration}:{label}" for label in current.values())
+
+    return GraphFeatures(
+        node_types=Counter(labels.values()),
+        wl_labels=wl_labels,
+        edges=Counter((labels[e.source], e.type, labels[e.target]) for e in edges),
+    )
+
+
+def weighted_jaccard(a: Counter, b: Counter) -> float:
+    if not a and not b:
+        return 1.0
+    keys = a.keys() | b.keys()
+    return sum(min(a[k], b[k]) for k in keys) / sum(max(a[k], b[k]) for k in keys)
+
+
+def normalized_kernel(a: Counter, b: Counter) -> float:
+    if not a and not b:
+        return 1.0
+    norm = math.sqrt(sum(v * v for v in a.values()) * sum(v * v for v in b.values()))
+    if not norm:
+        return 0.0
+    return sum(v * b[k] for k, v in a.items() if k in b) / norm
+
+
+def similarity_measures(generated: GraphFeatures, reference: GraphFeatures) -> Dict[str, float]:
+    return {
+        "nodeTypes": weighted_jaccard(generated.node_types, reference.node_types),
+        "graph": normalized_kernel(generated.wl_labels, reference.wl_labels),
+        "connections": weighted_jaccard(generated.edges, reference.edges),
+    }
+
+
+def describe_differences(
+    generated: GraphFeatures,
+    reference: GraphFeatures,
+    measures: Dict[str, float],
+) -> List[Violation]:
+    """Missing / extra node types and missing connections, sharing the points their measure lost"""
+    type_issues = []
+    for node_type, count in (reference.node_types - generated.node_types).items():
+        kind = "major" if is_trigger_type(node_type) else "minor"
+        type_issues.append((kind, f"Missing {count} {_local_type(node_type)} node(s) present in the reference workflow"))
+    for node_type, count in (generated.node_types - reference.node_types).items():
+        type_issues.append(("minor", f"{count} {_local_type(node_type)} node(s) not present in the reference workflow"))
+
+    edge_issues = [
+        ("minor", f"Missing {connection_type} connection {_local_type(source)} -> {_local_type(target)} from the reference workflow")
+        for (source, connection_type, target) in reference.edges - generated.edges
+    ]
+
+    violations: List[Violation] = []
+    for measure, issues in (("nodeTypes", type_issues), ("connections", edge_issues)):
+        if not issues:
+            continue
+        lost = SIMILARITY_WEIGHTS[measure] * (1 - measures[measure]) * 100
+        issues = issues[:MAX_VIOLATIONS]
+        for kind, description in issues:
+            violations.append(Violation(type=kind, description=description, pointsDeducted=round(lost / len(issues), 2)))
+    return violations
+
+
+def score_structural_similarity(
+    workflow: Any,
+    references: List[Any],
+) -> StructuralSimilarityScore:
+    """Similarity to the closest reference; not applicable without references"""
+    if not references:
+        return StructuralSimilarityScore(violations=[], score=0.0, applicable=False)
+
+    generated = graph_features(workflow)
+    best: Optional[tuple] = None
+    for reference in references:
+        features = graph_features(reference)
+        measures = similarity_measures(generated, features)
+        score = sum(SIMILARITY_WEIGHTS[name] * value for name, value in measures.items())
+        if best is None or score > best[0]:
+            best = (score, features, measures)
+
+    score, features, measures = best
+    return StructuralSimilarityScore(
+        violations=describe_differences(generated, features, measures),
+        score=round(min(1.0, max(0.0, score)), 4),
+        applicable=True,
+    )
+
+
+def evaluate_structural_similarity(input: EvaluationInput) -> StructuralSimilarityScore:
+    references = ([input.referenceWorkflow] if input.referenceWorkflow else []) + list(input.referenceWorkflows or [])
+    return score_structural_similarity(input.generatedWorkflow, references)
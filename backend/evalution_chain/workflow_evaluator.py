@@ -1,113 +1,90 @@
-from typing import Optional, List, Dict
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Optional, List, Dict, Tuple
 from langchain.chat_models.base import BaseChatModel
 
 
 from ..evalution_chain.evalution import EvaluationInput, EvaluationResult
-from backend.evalution_chain.connection_evalution import evaluate_connections
-from backend.evalution_chain.functionality_evalution import evaluateFunctionality
-from backend.evalution_chain.node_config_evalution import evaluate_node_configuration
-from backend.evalution_chain.best_practice_evalution import evaluateBestPractices
-from backend.evalution_chain.efficiency_evalution import  evaluateEfficiency
-from backend.evalution_chain.expression_evalution import  evaluateExpressions
-from backend.evalution_chain.data_flow_evalution import evaluateDataFlow 
-from backend.evalution_chain.maintainability_evalution import evaluateMaintainability
-
+from backend.evalution_chain.connection_evalution import evaluate_connections, aevaluate_connections
+from backend.evalution_chain.functionality_evalution import evaluateFunctionality, aevaluateFunctionality
+from backend.evalution_chain.node_config_evalution import evaluate_node_configuration, aevaluate_node_configuration
+from backend.evalution_chain.best_practice_evalution import evaluateBestPractices, aevaluateBestPractices
+from backend.evalution_chain.efficiency_evalution import  evaluateEfficiency, aevaluateEfficiency
+from backend.evalution_chain.expression_evalution import  evaluateExpressions, aevaluateExpressions
+from backend.evalution_chain.data_flow_evalution import evaluateDataFlow, aevaluateDataFlow
+from backend.evalution_chain.maintainability_evalution import evaluateMaintainability, aevaluateMaintainability
+from backend.evalution_chain.static_analysis import STATIC_ANALYZERS
+from backend.evalution_chain.structural_similarity import evaluate_structural_similarity
+from backend.evalution_chain.combined_evalution import aevaluate_combined
+from backend.evalution_chain.eval_cache import category_cache_keys, get_eval_cache
+
+
+CATEGORY_WEIGHTS: Dict[str, float] = {
+    "functionality": 0.25,
+    "connections": 0.15,
+    "expressions": 0.15,
+    "nodeConfiguration": 0.15,
+    "efficiency": 0.10,
+    "dataFlow": 0.10,
+    "maintainability": 0.05,
+    "bestPractices": 0.10,
+    "structuralSimilarity": 0.05,
+}
+
+# Async evaluator per category, in the same order as evaluate_workflow
+ASYNC_CATEGORY_EVALUATORS: Dict[str, Callable[[BaseChatModel, EvaluationInput], Awaitable[Any]]] = {
+    "functionality": aevaluateFunctionality,
+    "connections": aevaluate_connections,
+    "expressions": aevaluateExpressions,
+    "nodeConfiguration": aevaluate_node_configuration,
+    "efficiency": aevaluateEfficiency,
+    "dataFlow": aevaluateDataFlow,
+    "maintainability": aevaluateMaintainability,
+    "bestPractices": aevaluateBestPractices,
+}
 
 
 def calculate_weighted_score(result: EvaluationResult) -> float:
-    weights = {
-        "functionality": 0.25,
-        "connections": 0.15,
-        "expressions": 0.15,
-        "nodeConfiguration": 0.15,
-        "efficiency": 0.10,
-        "dataFlow": 0.10,
-        "maintainability": 0.05,
-        "bestPractices": 0.10,
-        "structuralSimilarity": 0.05,
-    }
-
     total_weight = 0.0
     weighted_sum = 0.0
 
-    # Core categories
-    weighted_sum += result.functionality.score * weights["functionality"]
-    weighted_sum += result.connections.score * weights["connections"]
-    weighted_sum += result.expressions.score * weights["expressions"]
-    weighted_sum += result.nodeConfiguration.score * weights["nodeConfiguration"]
-
-    total_weight += (
-        weights["functionality"]
-        + weights["connections"]
-        + weights["expressions"]
-        + weights["nodeConfiguration"]
-    )
-
-    # New metrics
-    weighted_sum += result.efficiency.score * weights["efficiency"]
-    weighted_sum += result.dataFlow.score * weights["dataFlow"]
-    weighted_sum += result.maintainability.score * weights["maintainability"]
-    weighted_sum += result.bestPractices.score * weights["bestPractices"]
-
-    total_weight += (
-        weights["efficiency"]
-        + weights["dataFlow"]
-        + weights["maintainability"]
-        + weights["bestPractices"]
-    )
+    # Structural similarity is optional; any category can also be marked
+    # not applicable when its evaluator failed
+    for name, weight in CATEGORY_WEIGHTS.items():
+        category = getattr(result, name)
+        if not category or not category.applicable:
+            continue
 
-    # Structural similarity (optional)
-    if result.structuralSimilarity and result.structuralSimilarity.applicable:
-        weighted_sum += (
-            result.structuralSimilarity.score * weights["structuralSimilarity"]
-        )
-        total_weight += weights["structuralSimilarity"]
+        weighted_sum += category.score * weight
+        total_weight += weight
 
     return weighted_sum / total_weight if total_weight > 0 else 0.0
 
+SUMMARY_PHRASES: Dict[str, tuple] = {
+    "functionality": ("strong functional implementation", "functional gaps"),
+    "connections": ("well-connected nodes", "connection issues"),
+    "expressions": ("correct expression syntax", "expression errors"),
+    "nodeConfiguration": ("well-configured nodes", "node configuration issues"),
+    "dataFlow": ("proper data flow", "data flow problems"),
+    "efficiency": ("efficient design", "inefficiencies"),
+    "maintainability": ("maintainable structure", "poor maintainability"),
+    "bestPractices": ("follows best practices", "deviates from best practices"),
+}
+
+
 def generate_evaluation_summary(result: EvaluationResult) -> str:
     strengths: List[str] = []
     weaknesses: List[str] = []
+    skipped: List[str] = []
 
-    if result.functionality.score >= 0.8:
-        strengths.append("strong functional implementation")
-    elif result.functionality.score < 0.5:
-        weaknesses.append("functional gaps")
-
-    if result.connections.score >= 0.8:
-        strengths.append("well-connected nodes")
-    elif result.connections.score < 0.5:
-        weaknesses.append("connection issues")
-
-    if result.expressions.score >= 0.8:
-        strengths.append("correct expression syntax")
-    elif result.expressions.score < 0.5:
-        weaknesses.append("expression errors")
-
-    if result.nodeConfiguration.score >= 0.8:
-        strengths.append("well-configured nodes")
-    elif result.nodeConfiguration.score < 0.5:
-        weaknesses.append("node configuration issues")
-
-    if result.dataFlow.score >= 0.8:
-        strengths.append("proper data flow")
-    elif result.dataFlow.score < 0.5:
-        weaknesses.append("data flow problems")
-
-    if result.efficiency.score >= 0.8:
-        strengths.append("efficient design")
-    elif result.efficiency.score < 0.5:
-        weaknesses.append("inefficiencies")
-
-    if result.maintainability.score >= 0.8:
-        strengths.append("maintainable structure")
-    elif result.maintainability.score < 0.5:
-        weaknesses.append("poor maintainability")
-
-    if result.bestPractices.score >= 0.8:
-        strengths.append("follows best practices")
-    elif result.bestPractices.score < 0.5:
-        weaknesses.append("deviates from best practices")
+    for name, (strength, weakness) in SUMMARY_PHRASES.items():
+        category = getattr(result, name)
+        if not category.applicable:
+            skipped.append(name)
+        elif category.score >= 0.8:
+            strengths.append(strength)
+        elif category.score < 0.5:
+            weaknesses.append(weakness)
 
     summary = ""
 
@@ -119,6 +96,9 @@ def generate_evaluation_summary(result: EvaluationResult) -> str:
     if not summary:
         summary = "The workflow shows adequate implementation across all evaluated metrics."
 
+    if skipped:
+        summary += f" Not evaluated: {', '.join(skipped)}."
+
     return summary.strip()
 
 def identify_critical_issues(result: EvaluationResult) -> Optional[List[str]]:
@@ -136,7 +116,7 @@ def identify_critical_issues(result: EvaluationResult) -> Optional[List[str]]:
     ]
 
     for name, data in categories:
-        if not data:
+        if not data or not data.applicable:
             continue
 
         for violation in data.violations:
@@ -188,35 +168,37 @@ def to_dict(obj):
 
 #     return evaluation_result
 
-def evaluate_workflow(llm: BaseChatModel, input: EvaluationInput) -> EvaluationResult:
+def not_applicable_score(name: str) -> Dict[str, Any]:
+    """Placeholder for a category whose evaluator failed or timed out"""
+    score: Dict[str, Any] = {"violations": [], "score": 0.0, "applicable": False}
 
-    functionality = evaluateFunctionality(llm, input)
-    connections = evaluate_connections(llm, input)
-    expressions = evaluateExpressions(llm, input)
-    node_configuration = evaluate_node_configuration(llm, input)
-    efficiency = evaluateEfficiency(llm, input)
-    data_flow = evaluateDataFlow(llm, input)
-    maintainability = evaluateMaintainability(llm, input)
-    best_practices = evaluateBestPractices(llm, input)
+    if name == "efficiency":
+        score.update(redundancyScore=0.0, pathOptimization=0.0, nodeCountEfficiency=0.0)
+    elif name == "maintainability":
+        score.update(nodeNamingQuality=0.0, workflowOrganization=0.0, modularity=0.0)
 
+    return score
+
+
+def build_evaluation_result(scores: Dict[str, Any]) -> EvaluationResult:
     evaluation_result = EvaluationResult(
         overallScore=0.0,
 
-        functionality=to_dict(functionality),
-        connections=to_dict(connections),
-        expressions=to_dict(expressions),
-        nodeConfiguration=to_dict(node_configuration),
+        functionality=to_dict(scores["functionality"]),
+        connections=to_dict(scores["connections"]),
+        expressions=to_dict(scores["expressions"]),
+        nodeConfiguration=to_dict(scores["nodeConfiguration"]),
 
-        efficiency=to_dict(efficiency),
-        dataFlow=to_dict(data_flow),
-        maintainability=to_dict(maintainability),
-        bestPractices=to_dict(best_practices),
+        efficiency=to_dict(scores["efficiency"]),
+        dataFlow=to_dict(scores["dataFlow"]),
+        maintainability=to_dict(scores["maintainability"]),
+        bestPractices=to_dict(scores["bestPractices"]),
 
-        structuralSimilarity={
+        structuralSimilarity=to_dict(scores.get("structuralSimilarity") or {
             "violations": [],
             "score": 0.0,
             "applicable": False,
-        },
+        }),
 
         summary="",
         criticalIssues=None,
@@ -227,3 +209,128 @@ def evaluate_workflow(llm: BaseChatModel, input: EvaluationInput) -> EvaluationR
     evaluation_result.criticalIssues = identify_critical_issues(evaluation_result)
 
     return evaluation_result
+
+
+def static_scores(input: EvaluationInput) -> Dict[str, Any]:
+    """
+    Categories settled without the LLM: every statically analysed category
+    under the "fast" preset, otherwise only those whose static result is
+    conclusive. The "fast" preset marks the remaining categories not applicable.
+    Structural similarity is always computed here, it never needs the LLM.
+    """
+    workflow = input.generatedWorkflow.model_dump()
+    fast = input.preset == "fast"
+
+    scores: Dict[str, Any] = {"structuralSimilarity": evaluate_structural_similarity(input)}
+    for name, analyze in STATIC_ANALYZERS.items():
+        analysis = analyze(workflow)
+        if fast or analysis.decided:
+            scores[name] = analysis.result
+
+    if fast:
+        for name in ASYNC_CATEGORY_EVALUATORS:
+            scores.setdefault(name, not_applicable_score(name))
+    return scores
+
+
+def cached_scores(
+    llm: BaseChatModel, input: EvaluationInput, names: List[str]
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Cached results among `names`, and the cache keys of the categories still to evaluate"""
+    cache = get_eval_cache()
+    if cache is None:
+        return {}, {}
+    keys = category_cache_keys(llm, input, names)
+    hits = cache.get_many(keys)
+    return hits, {name: key for name, key in keys.items() if name not in hits}
+
+
+def store_scores(scores: Dict[str, Any], keys: Dict[str, str]) -> None:
+    cache = get_eval_cache()
+    if cache is None:
+        return
+    for name, key in keys.items():
+        if name in scores:
+            cache.put(key, scores[name])
+
+
+def evaluate_workflow(llm: BaseChatModel, input: EvaluationInput) -> EvaluationResult:
+    scores = static_scores(input)
+    hits, keys = cached_scores(llm, input, [name for name in ASYNC_CATEGORY_EVALUATORS if name not in scores])
+    scores.update(hits)
+    evaluators = {
+        "functionality": evaluateFunctionality,
+        "connections": evaluate_connections,
+        "expressions": evaluateExpressions,
+        "nodeConfiguration": evaluate_node_configuration,
+        "efficiency": evaluateEfficiency,
+        "dataFlow": evaluateDataFlow,
+        "maintainability": evaluateMaintainability,
+        "bestPractices": evaluateBestPractices,
+    }
+
+    for name, evaluator in evaluators.items():
+        if name not in scores:
+            scores[name] = evaluator(llm, input)
+    store_scores(scores, keys)
+    return build_evaluation_result(scores)
+
+
+async def aevaluate_workflow(
+    llm: BaseChatModel,
+    input: EvaluationInput,
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    mode: Optional[str] = None,
+) -> EvaluationResult:
+    """
+    Runs all category evaluators concurrently, at most `max_concurrency` at a
+    time. A category that raises or exceeds `timeout` seconds is marked not
+    applicable instead of failing the whole evaluation. Categories settled by
+    static analysis (see static_scores) or found in the evaluation cache (see
+    eval_cache) make no LLM call.
+
+    mode="combined" first scores all remaining categories in one LLM call
+    (see combined_evalution) and runs the per-category evaluators only for
+    the categories that call did not return valid results for.
+    """
+    if max_concurrency is None:
+        max_concurrency = int(os.getenv("EVALUATOR_MAX_CONCURRENCY", "8"))
+    if timeout is None:
+        timeout = float(os.getenv("EVALUATOR_TIMEOUT_SECONDS", "90"))
+    if mode is None:
+        mode = os.getenv("EVALUATOR_MODE", "parallel")
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_category(name: str, evaluator) -> Any:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(evaluator(llm, input), timeout or None)
+            except asyncio.TimeoutError:
+                print(f"{name} evaluation timed out after {timeout}s")
+            except Exception as e:
+                print(f"{name} evaluation failed: {e}")
+            return not_applicable_score(name)
+
+    scores = static_scores(input)
+    hits, keys = cached_scores(llm, input, [name for name in ASYNC_CATEGORY_EVALUATORS if name not in scores])
+    scores.update(hits)
+    names = [name for name in ASYNC_CATEGORY_EVALUATORS if name not in scores]
+
+    if mode == "combined" and names:
+        try:
+            scores.update(await asyncio.wait_for(aevaluate_combined(llm, input, names), timeout or None))
+        except asyncio.TimeoutError:
+            print(f"combined evaluation timed out after {timeout}s")
+        except Exception as e:
+            print(f"combined evaluation failed: {e}")
+        names = [name for name in names if name not in scores]
+
+    results = await asyncio.gather(
+        *(run_category(name, ASYNC_CATEGORY_EVALUATORS[name]) for name in names)
+    )
+    scores.update(zip(names, results))
+    store_scores(scores, keys)
+
+    return build_evaluation_result(scores)
@@ -9,6 +9,11 @@ from dotenv import load_dotenv
 from groq import Groq
 import certifi
 
+from backend.llm_cache import cached_chat_completion
+from backend.llm_config import get_http_client
+from backend.session_store import SessionState
+from backend.utills.keyword_matcher import keyword_hits, register_keywords
+
 # -------------------------------------------------------------------------
 # ENV + CLIENT INITIALIZATION
 # -------------------------------------------------------------------------
@@ -20,7 +25,7 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
     raise ValueError("GROQ_API_KEY missing in .env")
 
-client = Groq(api_key=GROQ_API_KEY)
+client = Groq(api_key=GROQ_API_KEY, http_client=get_http_client())
 
 INTENT_MODEL = "openai/gpt-oss-120b"
 FOLLOWUP_MODEL = "openai/gpt-oss-120b"
@@ -45,14 +50,6 @@ class CategorizePromptOutput:
     followup_question: Optional[str]
 
 
-# -------------------------------------------------------------------------
-# GLOBAL STATE
-# -------------------------------------------------------------------------
-
-last_intent_message: Optional[str] = None
-is_refining: bool = False
-
-
 # -------------------------------------------------------------------------
 # UTILITY FUNCTIONS
 # -------------------------------------------------------------------------
@@ -83,7 +80,8 @@ Respond ONLY with: yes or no
 """
 
     try:
-        res = client.chat.completions.create(
+        res = cached_chat_completion(
+            client,
             model=FOLLOWUP_MODEL,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.0,
@@ -198,7 +196,8 @@ Return JSON exactly in this structure:
 }}
 """
 
-    res = client.chat.completions.create(
+    res = cached_chat_completion(
+        client,
         model=INTENT_MODEL,
         messages=[{"role": "user", "content": prompt}],
         temperature=0.0,
@@ -228,8 +227,27 @@ Return JSON exactly in this structure:
 # MAIN INTENT PROCESSOR
 # -------------------------------------------------------------------------
 
-def process_user_prompt(user_input: str, history: List[dict]) -> dict:
-    global last_intent_message, is_refining
+# Words that mark an input as a workflow description even when the guard
+# layer would stop it
+WORKFLOW_KEYWORDS = [
+    "workflow", "node", "trigger", "api", "http", "update",
+    "metadata", "caption", "youtube", "slack", "telegram",
+    "transcript", "append", "set", "extract", "google",
+    "batch", "process", "automation", "video", "split"
+]
+
+register_keywords(WORKFLOW_KEYWORDS)
+
+
+def process_user_prompt(
+    user_input: str,
+    history: List[dict],
+    state: Optional[SessionState] = None
+) -> dict:
+    # per-user state lives in backend.session_store; without one the call
+    # starts a fresh refinement instead of sharing state across callers
+    if state is None:
+        state = SessionState()
 
     history.append({"role": "user", "content": user_input})
 
@@ -237,10 +255,10 @@ def process_user_prompt(user_input: str, history: List[dict]) -> dict:
     # NEW: Universal finalization (DONE button support)
     # ================================================================
     if user_wants_to_finalize(user_input):
-        final = last_intent_message or (
+        final = state.last_intent_message or (
             history[-2]["content"] if len(history) >= 2 else user_input
         )
-        is_refining = False
+        state.is_refining = False
         return {
             "stop": False,
             "finalized": True,
@@ -252,25 +270,18 @@ def process_user_prompt(user_input: str, history: List[dict]) -> dict:
     # ================================================================
     # NEW: Semantic workflow detection (allows complex workflow inputs)
     # ================================================================
-    workflow_keywords = [
-        "workflow", "node", "trigger", "api", "http", "update",
-        "metadata", "caption", "youtube", "slack", "telegram",
-        "transcript", "append", "set", "extract", "google",
-        "batch", "process", "automation", "video", "split"
-    ]
-    user_lower = user_input.lower()
-    contains_workflow = any(k in user_lower for k in workflow_keywords)
+    contains_workflow = keyword_hits(user_input).any(WORKFLOW_KEYWORDS)
     long_instruction = len(user_input.split()) >= 12
     semantic_accept = contains_workflow or long_instruction
 
     # 1. Finalization
-    if is_refining and user_wants_to_finalize(user_input):
-        if last_intent_message:
-            final = last_intent_message
+    if state.is_refining and user_wants_to_finalize(user_input):
+        if state.last_intent_message:
+            final = state.last_intent_message
         else:
             final = history[-2]["content"] if len(history) >= 2 else user_input
 
-        is_refining = False
+        state.is_refining = False
 
         return {
             "stop": False,
@@ -286,19 +297,19 @@ def process_user_prompt(user_input: str, history: List[dict]) -> dict:
     # ================================================================
     # NEW: Bypass guard IF workflow detected
     # ================================================================
-    if guard_result and not is_refining and not semantic_accept:
+    if guard_result and not state.is_refining and not semantic_accept:
         history.append({"role": "assistant", "content": guard_result.followup_question})
         return {"stop": True, "reply": guard_result.followup_question}
 
     # 3. Follow-up merging
-    if last_intent_message is not None:
-        if llm_is_followup(last_intent_message, user_input):
-            merged = f"{last_intent_message}. Modify it as follows: {user_input}"
+    if state.last_intent_message is not None:
+        if llm_is_followup(state.last_intent_message, user_input):
+            merged = f"{state.last_intent_message}. Modify it as follows: {user_input}"
             result = llm_classify_and_improve(merged, history)
 
             if result.categorization.intent_status == "clear":
-                last_intent_message = result.improved_prompt
-                is_refining = True
+                state.last_intent_message = result.improved_prompt
+                state.is_refining = True
                 return {
                     "stop": False,
                     "refining": True,
@@ -318,8 +329,8 @@ def process_user_prompt(user_input: str, history: List[dict]) -> dict:
         return {"stop": True, "reply": result.followup_question}
 
     # 5. Start refining mode
-    last_intent_message = result.improved_prompt
-    is_refining = True
+    state.last_intent_message = result.improved_prompt
+    state.is_refining = True
 
     return {
         "stop": False,
@@ -0,0 +1,467 @@
+"""
+Pluggable LLM backend for offline benchmarking and load testing.
+
+Every Groq call (ChatGroq from llm_config.get_llm and the raw Groq client in
+backend/llm.py) goes through the pooled httpx clients in llm_config, so the
+backend is swapped at the transport level and the rest of the code, including
+structured output and streaming, is unchanged:
+
+    groq    real API (default)
+    fake    in-process OpenAI/Groq-compatible responder with simulated latency
+    record  answer from recordings when present, otherwise call Groq and save
+            the response to LLM_REPLAY_DIR
+    replay  answer only from recordings; unrecorded requests fail with 404
+
+Recordings are keyed by a hash of the request path and JSON body (model,
+messages, params, tools), one file per request, so a recorded run replays
+deterministically. Disable the response cache (LLM_CACHE_ENABLED=false) when
+benchmarking so every call reaches the backend.
+
+The fake responder can also run as a standalone stub server for processes
+that cannot be configured in-process; point GROQ_BASE_URL at it:
+
+    python -m backend.llm_backend --port 8900
+
+Env:
+    LLM_BACKEND         groq | fake | record | replay (default groq)
+    LLM_REPLAY_DIR      recordings directory (default .llm_replay)
+    LLM_FAKE_LATENCY    fixed:MS | uniform:LO,HI | normal:MEAN,SD |
+                        lognormal:MEDIAN,SIGMA, in milliseconds (default fixed:0)
+    LLM_FAKE_SEED       seed for the latency sampler
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+from backend.llm_cache import make_cache_key
+
+load_dotenv()
+
+
+# ===== Fake replies =====
+
+def _reply_categorization(prompt: str) -> str:
+    from backend.mytypes.technique_normalizer import normalize_techniques
+
+    request = re.search(r'Categorize the following user request:\s*"([\s\S]*?)"\s*Return', prompt)
+    techniques = normalize_techniques((request.group(1) if request else prompt).split())
+    return json.dumps({
+        "techniques": [t.value for t in techniques[:3]] or ["notification"],
+        "confidence": 0.8,
+    })
+
+
+def _reply_adapted_nodes(prompt: str) -> str:
+    node_re = re.compile(
+        r"- Name: (?P<name>.*)\n\s+ID: (?P<node_id>.*)\n\s+Category: (?P<category>.*)\n"
+        r"\s+Original Purpose: (?P<purpose>.*)"
+    )
+    nodes = [
+        {
+            **match.groupdict(),
+            "pitfalls": [],
+            "use_cases": [],
+            "alternatives": [],
+            "is_recommended": True,
+        }
+        for match in node_re.finditer(prompt)
+    ]
+    return json.dumps(nodes[:6])
+
+
+def _reply_intent(prompt: str) -> str:
+    message = re.search(r'User message: "([\s\S]*?)"\s*\n', prompt)
+    text = message.group(1) if message else ""
+    return json.dumps({
+        "intent_status": "clear",
+        "intent_label": "notification",
+        "confidence": 0.9,
+        "improved_prompt": text,
+        "followup_question": None,
+    })
+
+
+# (marker in the prompt, reply builder) - first match wins
+FAKE_REPLIES: List[Tuple[str, Callable[[str], str]]] = [
+    ("Categorize the following user request", _reply_categorization),
+    ("Available Parsed Nodes", _reply_adapted_nodes),
+    ("intent classifier for a workflow automation assistant", _reply_intent),
+    ("Respond ONLY with: yes or no", lambda prompt: "no"),
+]
+
+
+def _prompt_text(messages: List[Dict[str, Any]]) -> str:
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            content = " ".join(str(part.get("text", "")) for part in content if isinstance(part, dict))
+        parts.append(content or "")
+    return "\n".join(parts)
+
+
+def placeholder_for_schema(schema: Dict[str, Any], defs: Optional[Dict[str, Any]] = None) -> Any:
+    """Smallest value that validates against a JSON schema (used for tool calls)"""
+    defs = defs if defs is not None else schema.get("$defs", {})
+
+    if "$ref" in schema:
+        return placeholder_for_schema(defs.get(schema["$ref"].split("/")[-1], {}), defs)
+    if "default" in schema:
+        return schema["default"]
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"] or schema[key]
+            return placeholder_for_schema(options[0], defs)
+
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), None)
+    if kind == "object" or "properties" in schema:
+        return {
+            name: placeholder_for_schema(prop, defs)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        count = schema.get("minItems", 0)
+        return [placeholder_for_schema(schema.get("items", {}), defs) for _ in range(count)]
+    if kind in ("integer", "number"):
+        value = schema.get("minimum", schema.get("exclusiveMinimum", 0))
+        return int(value) if kind == "integer" else float(value)
+    if kind == "boolean":
+        return False
+    if kind == "string":
+        return "x" * schema.get("minLength", 0)
+    return None
+
+
+# ===== Latency =====
+
+def parse_latency(spec: str, rng: random.Random) -> Callable[[], float]:
+    """Sampler returning a delay in seconds from a LLM_FAKE_LATENCY spec"""
+    kind, _, args = (spec or "fixed:0").partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()] or [0.0]
+
+    samplers: Dict[str, Callable[[], float]] = {
+        "fixed": lambda: values[0],
+        "uniform": lambda: rng.uniform(values[0], values[-1]),
+        "normal": lambda: rng.gauss(values[0], values[-1] if len(values) > 1 else 0.0),
+        "lognormal": lambda: values[0] * rng.lognormvariate(0.0, values[-1] if len(values) > 1 else 0.0),
+    }
+    if kind not in samplers:
+        raise ValueError(f"Unknown LLM_FAKE_LATENCY kind: {kind}")
+
+    sample = samplers[kind]
+    return lambda: max(sample(), 0.0) / 1000
+
+
+# ===== Fake responder =====
+
+class FakeLLM:
+    """Builds OpenAI-compatible chat completion bodies without calling a model"""
+
+    def __init__(self, latency: str = "fixed:0", seed: Optional[int] = None):
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._sample = parse_latency(latency, self._rng)
+        self.calls = 0
+
+    def delay(self) -> float:
+        with self._rng_lock:
+            self.calls += 1
+            return self._sample()
+
+    def reply_text(self, messages: List[Dict[str, Any]]) -> str:
+        prompt = _prompt_text(messages)
+        for marker, build in FAKE_REPLIES:
+            if marker in prompt:
+                return build(prompt)
+        return "{}"
+
+    def tool_calls(self, body: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        tools = body.get("tools") or []
+        if not tools:
+            return None
+
+        choice = body.get("tool_choice")
+        forced = choice.get("function", {}).get("name") if isinstance(choice, dict) else None
+        tool = next((t for t in tools if t["function"]["name"] == forced), tools[0])["function"]
+        arguments = placeholder_for_schema(tool.get("parameters", {}))
+        return [{
+            "id": f"call_{uuid.uuid4().hex[:12]}",
+            "type": "function",
+            "function": {"name": tool["name"], "arguments": json.dumps(arguments)},
+        }]
+
+    def completion(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        messages = body.get("messages", [])
+        tool_calls = self.tool_calls(body)
+        content = "" if tool_calls else self.reply_text(messages)
+        if body.get("max_tokens") == 2 and content not in ("yes", "no"):
+            content = content[:8]
+
+        message: Dict[str, Any] = {"role": "assistant", "content": content}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+
+        prompt_tokens = len(_prompt_text(messages)) // 4
+        completion_tokens = len(content) // 4 + 1
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if tool_calls else "stop",
+                "logprobs": None,
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def stream_body(self, completion: Dict[str, Any], chunk_size: int = 16) -> bytes:
+        """A completion as SSE chat.completion.chunk events"""
+        message = completion["choices"][0]["message"]
+        content = message.get("content") or ""
+        deltas: List[Dict[str, Any]] = [{"role": "assistant", "content": ""}]
+        deltas += [{"content": content[i:i + chunk_size]} for i in range(0, len(content), chunk_size)]
+        if message.get("tool_calls"):
+            deltas.append({"tool_calls": [{"index": 0, **call} for call in message["tool_calls"]]})
+
+        events = []
+        for i, delta in enumerate(deltas + [{}]):
+            last = i == len(deltas)
+            events.append({
+                "id": completion["id"],
+                "object": "chat.completion.chunk",
+                "created": completion["created"],
+                "model": completion["model"],
+                "choices": [{
+                    "index": 0,
+                    "delta": delta,
+                    "finish_reason": completion["choices"][0]["finish_reason"] if last else None,
+                    "logprobs": None,
+                }],
+            })
+        frames = [f"data: {json.dumps(event)}\n\n" for event in events] + ["data: [DONE]\n\n"]
+        return "".join(frames).encode("utf-8")
+
+    def response(self, request: httpx.Request) -> httpx.Response:
+        if not request.url.path.endswith("/chat/completions"):
+            return httpx.Response(404, json={"error": {"message": f"fake LLM: no route {request.url.path}"}})
+
+        body = json.loads(request.content or b"{}")
+        completion = self.completion(body)
+        if body.get("stream"):
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                content=self.stream_body(completion),
+            )
+        return httpx.Response(200, json=completion)
+
+
+class FakeLLMTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """httpx transport answering Groq requests from a FakeLLM"""
+
+    def __init__(self, fake: FakeLLM):
+        self.fake = fake
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        time.sleep(self.fake.delay())
+        return self.fake.response(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.fake.delay())
+        return self.fake.response(request)
+
+
+# ===== Record / replay =====
+
+def request_key(request: httpx.Request) -> str:
+    body = request.content or b""
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True).encode("utf-8")
+    except ValueError:
+        pass
+    return make_cache_key(request.method, request.url.path, body.decode("utf-8", "replace"))
+
+
+# decoded by httpx before recording, so they no longer describe the body
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class RecordReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Serves recorded responses from directory. With record=True, requests
+    without a recording go to the wrapped transport and are saved.
+    """
+
+    def __init__(self, directory: str, record: bool, transport: Any = None):
+        self.directory = directory
+        self.record = record
+        self.transport = transport
+        self.replayed = 0
+        self.recorded = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load(self, request: httpx.Request) -> Tuple[str, Optional[httpx.Response]]:
+        key = request_key(request)
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return key, None
+
+        self.replayed += 1
+        return key, httpx.Response(
+            saved["status"],
+            headers=saved["headers"],
+            content=saved["content"].encode("utf-8"),
+        )
+
+    def _miss(self, key: str) -> httpx.Response:
+        return httpx.Response(404, json={"error": {
+            "message": f"no recorded LLM response for request {key} in {self.directory}",
+            "type": "replay_miss",
+        }})
+
+    def _save(self, key: str, request: httpx.Request, response: httpx.Response, content: bytes) -> httpx.Response:
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        if response.status_code < 400:
+            path = self._path(key)
+            tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({
+                    "request": json.loads(request.content or b"null"),
+                    "status": response.status_code,
+                    "headers": headers,
+                    "content": content.decode("utf-8"),
+                }, f)
+            os.replace(tmp, path)
+            self.recorded += 1
+        return httpx.Response(response.status_code, headers=headers, content=content)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key, saved = self._load(request)
+        if saved is not None:
+            return saved
+        if not self.record:
+            return self._miss(key)
+
+        response = self.transport.handle_request(request)
+        content = response.read()
+        response.close()
+        return self._save(key, request, response, content)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key, saved = self._load(request)
+        if saved is not None:
+            return saved
+        if not self.record:
+            return self._miss(key)
+
+        response = await self.transport.handle_async_request(request)
+        content = await response.aread()
+        await response.aclose()
+        return self._save(key, request, response, content)
+
+
+# ===== Selection =====
+
+_fake_llm: Optional[FakeLLM] = None
+_lock = threading.Lock()
+
+
+def llm_backend_name() -> str:
+    return (os.getenv("LLM_BACKEND") or "groq").strip().lower()
+
+
+def get_fake_llm() -> FakeLLM:
+    global _fake_llm
+    if _fake_llm is None:
+        with _lock:
+            if _fake_llm is None:
+                seed = os.getenv("LLM_FAKE_SEED")
+                _fake_llm = FakeLLM(
+                    latency=os.getenv("LLM_FAKE_LATENCY", "fixed:0"),
+                    seed=int(seed) if seed else None,
+                )
+    return _fake_llm
+
+
+def get_llm_transport(is_async: bool, limits: httpx.Limits) -> Any:
+    """
+    Transport for the pooled Groq HTTP clients, or None for the default one.
+    limits must be applied here since httpx ignores them when a transport is given.
+    """
+    backend = llm_backend_name()
+    if backend == "groq":
+        return None
+    if backend == "fake":
+        return FakeLLMTransport(get_fake_llm())
+    if backend in ("record", "replay"):
+        inner = httpx.AsyncHTTPTransport(limits=limits) if is_async else httpx.HTTPTransport(limits=limits)
+        return RecordReplayTransport(
+            os.getenv("LLM_REPLAY_DIR", ".llm_replay"),
+            record=backend == "record",
+            transport=inner,
+        )
+    raise ValueError(f"Unknown LLM_BACKEND: {backend}")
+
+
+# ===== Stub server =====
+
+def create_stub_app(fake: Optional[FakeLLM] = None):
+    """FastAPI app serving the fake responder on the Groq chat completions route"""
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, Response
+
+    fake = fake or get_fake_llm()
+    app = FastAPI(title="LLM stub")
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        await asyncio.sleep(fake.delay())
+        body = await request.json()
+        completion = fake.completion(body)
+        if body.get("stream"):
+            return Response(fake.stream_body(completion), media_type="text/event-stream")
+        return JSONResponse(completion)
+
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="OpenAI/Groq-compatible LLM stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    args = parser.parse_args()
+
+    print(f"LLM stub on http://{args.host}:{args.port} - set GROQ_BASE_URL to use it")
+    uvicorn.run(create_stub_app(), host=args.host, port=args.port)
@@ -0,0 +1,265 @@
+"""
+Content-addressed response cache for LLM calls.
+
+Responses are keyed by a sha256 over everything that decides the output:
+model, sampling params, rendered messages and the bound structured-output
+schema. Byte-identical requests (retries, double submits, example prompts)
+are answered from memory, or from an optional SQLite file shared across
+uvicorn workers, without hitting Groq.
+
+Env:
+    LLM_CACHE_ENABLED       "true" / "false" (default true)
+    LLM_CACHE_MAX_ENTRIES   in-memory LRU bound (default 1024)
+    LLM_CACHE_TTL_SECONDS   entry lifetime, 0 = never expire (default 3600)
+    LLM_CACHE_SQLITE_PATH   enables the on-disk tier when set
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from backend.metrics import LLM_CALL_SECONDS, record_token_usage, register_collector, span
+
+load_dotenv()
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def make_cache_key(*parts: str) -> str:
+    """Stable sha256 over the given parts"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+# ===== Storage =====
+
+class ResponseCacheStore:
+    """
+    Two-tier string store: in-memory LRU with TTL in front of an optional
+    SQLite table. Values are opaque strings so the same store can hold
+    LangChain generations, raw Groq completions or anything else serialized.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+        sqlite_path: Optional[str] = None,
+        table: str = "llm_cache",
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = sqlite_path
+        self.table = table
+
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+        if sqlite_path:
+            self._open_sqlite(sqlite_path)
+
+    def _open_sqlite(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _expired(self, created: float) -> bool:
+        return bool(self.ttl_seconds) and time.time() - created > self.ttl_seconds
+
+    def _remember(self, key: str, created: float, value: str) -> None:
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._expired(created):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and not self._expired(row[1]):
+                    self._remember(key, row[1], row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, value)
+            if self._conn is not None:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, created) VALUES (?, ?, ?)",
+                    (key, value, created),
+                )
+                self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute(f"DELETE FROM {self.table}")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "entries": len(self._memory),
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "sqlite": bool(self._conn),
+        }
+
+
+# ===== LangChain cache =====
+
+class LLMResponseCache(BaseCache):
+    """
+    LangChain cache backed by ResponseCacheStore.
+
+    LangChain passes the rendered messages as `prompt` and the model params,
+    including bound tools / structured-output schema, as `llm_string`.
+    """
+
+    def __init__(self, store: ResponseCacheStore):
+        self.store = store
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        value = self.store.get(make_cache_key(llm_string, prompt))
+        if value is None:
+            return None
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # langchain_core.load.loads is flagged beta
+                return [loads(generation) for generation in json.loads(value)]
+        except Exception as e:
+            print(f"LLM cache entry unreadable, ignoring: {e}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        value = json.dumps([dumps(generation) for generation in return_val])
+        self.store.set(make_cache_key(llm_string, prompt), value)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+
+# ===== Groq client cache =====
+
+def cached_chat_completion(client: Any, use_cache: bool = True, **kwargs: Any) -> Any:
+    """
+    Drop-in for `client.chat.completions.create(**kwargs)` on the raw Groq
+    client. Pass use_cache=False to always hit the API.
+    """
+    model = str(kwargs.get("model", ""))
+    with span(LLM_CALL_SECONDS, "llm", model=model, client="groq"):
+        cache = get_llm_cache()
+        if not (use_cache and cache):
+            return _create_chat_completion(client, model, kwargs)
+
+        from groq.types.chat import ChatCompletion
+
+        key = make_cache_key("groq.chat.completions", json.dumps(kwargs, sort_keys=True, default=str))
+        value = cache.store.get(key)
+        if value is not None:
+            return ChatCompletion.model_validate_json(value)
+
+        res = _create_chat_completion(client, model, kwargs)
+        cache.store.set(key, res.model_dump_json())
+        return res
+
+
+def _create_chat_completion(client: Any, model: str, kwargs: Dict[str, Any]) -> Any:
+    res = client.chat.completions.create(**kwargs)
+    usage = getattr(res, "usage", None)
+    record_token_usage(model, usage.model_dump() if usage is not None else None)
+    return res
+
+
+# ===== Process-wide instance =====
+
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Shared cache configured from env, or None when disabled"""
+    global _llm_cache
+
+    if not _env_flag("LLM_CACHE_ENABLED", True):
+        return None
+
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMResponseCache(
+                    ResponseCacheStore(
+                        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+                        ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600")),
+                        sqlite_path=os.getenv("LLM_CACHE_SQLITE_PATH") or None,
+                    )
+                )
+    return _llm_cache
+
+
+def llm_cache_stats() -> Dict[str, Any]:
+    cache = get_llm_cache()
+    return cache.store.stats() if cache else {"enabled": False}
+
+
+for _stat in ("hits", "misses", "disk_hits", "evictions"):
+    register_collector(
+        f"llm_cache_{_stat}_total",
+        "counter",
+        f"LLM response cache {_stat.replace('_', ' ')}",
+        lambda stat=_stat: llm_cache_stats().get(stat, 0),
+    )
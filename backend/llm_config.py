@@ -1,22 +1,106 @@
 import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
 from langchain_groq import ChatGroq
 from dotenv import load_dotenv
 
+from backend.llm_backend import get_llm_transport
+from backend.llm_cache import get_llm_cache
+from backend.metrics import LLMMetricsCallback, acount_retry, count_retry
+
 load_dotenv()
 
+
+# ===== Shared HTTP pool =====
+# One keep-alive pool per process, shared by every ChatGroq instance and the
+# raw Groq client in backend/llm.py, so requests reuse warm TLS connections.
+# LLM_BACKEND (see backend/llm_backend.py) swaps their transport for a fake or
+# record/replay backend.
+
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+_llm_registry: Dict[Tuple[str, float, bool], ChatGroq] = {}
+_lock = threading.Lock()
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", "10")),
+        keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60")),
+    )
+
+
+def _pool_timeout() -> httpx.Timeout:
+    return httpx.Timeout(float(os.getenv("LLM_HTTP_TIMEOUT", "60")), connect=10.0)
+
+
+def get_http_client() -> httpx.Client:
+    """Process-wide sync HTTP client used for Groq calls"""
+    global _http_client
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                limits = _pool_limits()
+                _http_client = httpx.Client(
+                    limits=limits,
+                    timeout=_pool_timeout(),
+                    transport=get_llm_transport(False, limits),
+                    event_hooks={"request": [count_retry]},
+                )
+    return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Process-wide async HTTP client used for Groq calls"""
+    global _async_http_client
+    if _async_http_client is None:
+        with _lock:
+            if _async_http_client is None:
+                limits = _pool_limits()
+                _async_http_client = httpx.AsyncClient(
+                    limits=limits,
+                    timeout=_pool_timeout(),
+                    transport=get_llm_transport(True, limits),
+                    event_hooks={"request": [acount_retry]},
+                )
+    return _async_http_client
+
+
 def get_llm(
     model: str = "openai/gpt-oss-120b",
     temperature: float = 0.2,
+    cache: bool = True,
 ):
     """
     Centralized Groq LLM provider.
+    Instances are shared per (model, temperature, cache) and all use the
+    pooled HTTP clients. Responses go through the shared LLM cache unless
+    cache=False.
     """
     groq_api_key = os.getenv("GROQ_API_KEY")
     if not groq_api_key:
         raise EnvironmentError("GROQ_API_KEY is not set")
 
-    return ChatGroq(
-        groq_api_key=groq_api_key,
-        model=model,
-        temperature=temperature,
-    )
+    key = (model, float(temperature), cache)
+    llm = _llm_registry.get(key)
+    if llm is not None:
+        return llm
+
+    http_client = get_http_client()
+    async_http_client = get_async_http_client()
+
+    with _lock:
+        if key not in _llm_registry:
+            _llm_registry[key] = ChatGroq(
+                groq_api_key=groq_api_key,
+                model=model,
+                temperature=temperature,
+                cache=(cache and get_llm_cache()) or False,
+                http_client=http_client,
+                http_async_client=async_http_client,
+                callbacks=[LLMMetricsCallback(model)],
+            )
+        return _llm_registry[key]
@@ -1,26 +1,34 @@
 
 # backend/main.py - Complete Integration with All Components
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import asdict
 import traceback
 
 from backend.llm_config import get_llm
-from backend.mytools.categorize_prompt_tool import create_categorize_prompt_tool
-from backend.mytools.find_best_practice_tool import create_get_best_practices_tool
+from backend.mytools.categorize_prompt_tool import create_async_categorize_prompt_tool
 from backend.mytypes.technique_normalizer import normalize_techniques
 from backend.mytypes.categorization import WorkflowTechnique
+from backend.mytypes.prompt_features import extract_prompt_features
 from backend.llm import process_user_prompt
+from backend.utills.stage_graph import StageGraph, StageCallback, StageRun
+from backend.utills.sse import EventChannel, SSE_HEADERS
+from backend.session_store import get_session_store
+from backend.metrics import record_error, register_collector, render as render_metrics
 
 # Import all components
-from backend.mytools.parse_best_practices import parse_best_practices, NodeInfo
+from backend.mytools.parse_best_practices import parse_best_practices_for_techniques, NodeInfo
 
 from backend.mytools.registry_node_generator import (
     generate_workflow_nodes_from_registry,
     format_workflow_nodes_for_api,
 )
-from backend.mytools.generate_from_parsed_bp import llm_select_and_adapt_nodes_for_intent
+from backend.mytools.generate_from_parsed_bp import allm_select_and_adapt_nodes_for_intent
+from backend.mytools.node_registry import get_registry_data
 
 
 app = FastAPI(title="n8n Workflow Generator API")
@@ -33,6 +41,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def load_node_registry():
+    # Load the node catalog snapshot (or build it) before the first request
+    get_registry_data()
+
 class AnalyzeRequest(BaseModel):
     prompt: str
 
@@ -41,51 +54,61 @@ class node_searchRequest(BaseModel):
     include_n8n_json: bool = True
     include_parsed_details: bool = True
 
-@app.post("/analyze")
-def analyze(req: AnalyzeRequest):
-    try:
-        llm = get_llm()
 
-        # STEP 1: Categorize Prompt
-        categorize_tool = create_categorize_prompt_tool(llm)
-        categorize_result = categorize_tool({"prompt": req.prompt})
+# ---------------------------- analyze pipeline stages --------------------------
+#
+#   categorize ──> parse_bp ──┐
+#                              ├──> merge ──> adapt
+#   registry ──────────────────┘
+#
+# registry only needs the raw prompt, so it runs while the categorize LLM call
+# is in flight. parse_bp merges best-practice parses cached per technique
+# instead of formatting and re-parsing the documentation on every request.
+# The prompt is normalized and keyword-scanned once into PromptFeatures, which
+# the registry and adapt stages share.
+
+def build_analyze_graph(prompt: str, on_token: Optional[Callable[[str], Any]] = None) -> StageGraph:
+    llm = get_llm()
+    features = extract_prompt_features(prompt)
+
+    # STEP 1: Categorize Prompt
+    async def categorize() -> Dict[str, Any]:
+        categorize_tool = create_async_categorize_prompt_tool(llm)
+        categorize_result = await categorize_tool({"prompt": prompt})
 
         if not isinstance(categorize_result, dict):
-            return {"success": False, "message": "Invalid categorization response", "data": None}
+            raise ValueError("Invalid categorization response")
 
         categorization = categorize_result.get("data", {}).get("categorization", {})
-        raw_techniques = categorization.get("techniques", [])
-        confidence = categorization.get("confidence")
-        normalized_techniques = normalize_techniques(raw_techniques)
-
-        # STEP 2: Get Best Practices
-        best_practices = ""
-        bp_tool_data = create_get_best_practices_tool()
-        bp_tool = bp_tool_data.get("tool")
-
-        if bp_tool and normalized_techniques:
-            bp_result = bp_tool.invoke({"techniques": normalized_techniques})
-            data = bp_result.get("data")
-            best_practices = data.get("message", "") if isinstance(data, dict) else data or ""
-
-        # STEP 3: Parse Best Practices
-        parsed_bp_nodes = []
-        if best_practices:
-            try:
-                bp_parser = parse_best_practices(best_practices)
-                parsed_bp_nodes = bp_parser.nodes
-            except Exception as e:
-                print(f"BP parsing failed: {e}")
-
-        # STEP 4: Generate Registry Nodes
-        registry_nodes = []
+        return {
+            "techniques": normalize_techniques(categorization.get("techniques", [])),
+            "confidence": categorization.get("confidence"),
+        }
+
+    # STEP 2-3: Get and Parse Best Practices
+    def parse_bp(categorized: Dict[str, Any]) -> List[NodeInfo]:
+        normalized_techniques = categorized["techniques"]
+        if not normalized_techniques:
+            return []
         try:
-            reg_nodes = generate_workflow_nodes_from_registry(req.prompt)
-            registry_nodes = format_workflow_nodes_for_api(reg_nodes)
+            return parse_best_practices_for_techniques(normalized_techniques).nodes
+        except Exception as e:
+            print(f"BP parsing failed: {e}")
+            record_error("analyze.parse_bp")
+            return []
+
+    # STEP 4: Generate Registry Nodes
+    def registry() -> List[Dict[str, Any]]:
+        try:
+            reg_nodes = generate_workflow_nodes_from_registry(prompt, features)
+            return format_workflow_nodes_for_api(reg_nodes)
         except Exception as e:
             print(f"Registry generation failed: {e}")
+            record_error("analyze.registry")
+            return []
 
-        # STEP 5: Merge Registry + BP nodes
+    # STEP 5: Merge Registry + BP nodes
+    def merge(registry_nodes: List[Dict[str, Any]], parsed_bp_nodes: List[NodeInfo]) -> List[Dict[str, Any]]:
         merged_nodes = registry_nodes.copy()
         registry_ids = {n["node_id"] for n in registry_nodes}
 
@@ -103,61 +126,100 @@ def analyze(req: AnalyzeRequest):
                     "output_connections": [],
                 })
 
-        # STEP 6: LLM Adaptation
-        if merged_nodes:
-            try:
-                node_infos = [
-                    NodeInfo(
-                        name=n["name"],
-                        node_id=n["node_id"],
-                        purpose=n["purpose"],
-                        category=n["category"],
-                        pitfalls=n.get("pitfalls", []),
-                        use_cases=n.get("use_cases", []),
-                        alternatives=n.get("alternatives", []),
-                        input_connections=[],
-                        output_connections=[]
-                    )
-                    for n in merged_nodes
-                ]
-
-                adapted = llm_select_and_adapt_nodes_for_intent(
-                    user_intent=req.prompt,
-                    parsed_nodes=node_infos
+        return merged_nodes
+
+    # STEP 6: LLM Adaptation
+    async def adapt(merged_nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not merged_nodes:
+            return merged_nodes
+        try:
+            node_infos = [
+                NodeInfo(
+                    name=n["name"],
+                    node_id=n["node_id"],
+                    purpose=n["purpose"],
+                    category=n["category"],
+                    pitfalls=n.get("pitfalls", []),
+                    use_cases=n.get("use_cases", []),
+                    alternatives=n.get("alternatives", []),
+                    input_connections=[],
+                    output_connections=[]
                 )
+                for n in merged_nodes
+            ]
 
-                if adapted:
-                    merged_nodes = adapted
+            adapted = await allm_select_and_adapt_nodes_for_intent(
+                user_intent=prompt,
+                parsed_nodes=node_infos,
+                features=features,
+                on_token=on_token
+            )
+            return adapted or merged_nodes
 
-            except Exception as e:
-                print(f"LLM adaptation failed: {e}")
+        except Exception as e:
+            print(f"LLM adaptation failed: {e}")
+            record_error("analyze.adapt")
+            return merged_nodes
+
+    return (
+        StageGraph("analyze")
+        .add("categorize", categorize)
+        .add("registry", registry)
+        .add("parse_bp", parse_bp, depends_on=["categorize"])
+        .add("merge", merge, depends_on=["registry", "parse_bp"])
+        .add("adapt", adapt, depends_on=["merge"])
+    )
+
+
+def build_analyze_response(run: StageRun) -> Dict[str, Any]:
+    categorized = run.results["categorize"]
+    merged_nodes = run.results["adapt"]
+
+    # STEP 7: Ensure Sequential Connections
+    for i, node in enumerate(merged_nodes):
+        node.setdefault("input_connections", [])
+        node.setdefault("output_connections", [])
+
+        if i > 0:
+            node["input_connections"] = [merged_nodes[i - 1]["name"]]
+        if i < len(merged_nodes) - 1:
+            node["output_connections"] = [merged_nodes[i + 1]["name"]]
+
+    return {
+        "success": True,
+        "message": "Prompt analyzed successfully",
+        "data": {
+            "categorization": {
+                "techniques": [t.value for t in categorized["techniques"]],
+                "confidence": categorized["confidence"]
+            },
+            "parsedBestPractices": {
+                "nodes": merged_nodes
+            }
+        }
+    }
 
-        # STEP 7: Ensure Sequential Connections
-        for i, node in enumerate(merged_nodes):
-            node.setdefault("input_connections", [])
-            node.setdefault("output_connections", [])
 
-            if i > 0:
-                node["input_connections"] = [merged_nodes[i - 1]["name"]]
-            if i < len(merged_nodes) - 1:
-                node["output_connections"] = [merged_nodes[i + 1]["name"]]
+async def run_analyze_pipeline(
+    prompt: str,
+    on_stage_complete: Optional[StageCallback] = None,
+    on_token: Optional[Callable[[str], Any]] = None,
+) -> StageRun:
+    return await build_analyze_graph(prompt, on_token).run(on_stage_complete)
 
-        return {
-            "success": True,
-            "message": "Prompt analyzed successfully",
-            "data": {
-                "categorization": {
-                    "techniques": [t.value for t in normalized_techniques],
-                    "confidence": confidence
-                },
-                "parsedBestPractices": {
-                    "nodes": merged_nodes
-                }
-            }
-        }
+
+async def analyze_prompt(
+    prompt: str,
+    on_stage_complete: Optional[StageCallback] = None,
+    on_token: Optional[Callable[[str], Any]] = None,
+) -> Dict[str, Any]:
+    try:
+        run = await run_analyze_pipeline(prompt, on_stage_complete, on_token)
+        return build_analyze_response(run)
 
     except Exception as e:
         traceback.print_exc()
+        record_error("analyze")
         return {
             "success": False,
             "message": f"Failed to analyze prompt: {str(e)}",
@@ -165,56 +227,138 @@ def analyze(req: AnalyzeRequest):
         }
 
 
+@app.post("/analyze")
+async def analyze(req: AnalyzeRequest):
+    return await analyze_prompt(req.prompt)
+
+
+# ---------------------------- streaming (SSE) --------------------------
+#
+# /analyze/stream and /chat/stream send one event per finished pipeline stage
+# (see ANALYZE_STAGE_EVENTS), "token" events while the adapt LLM call streams,
+# and a final "result" event carrying the same body the non-streaming endpoint
+# returns, followed by "done".
+
+ANALYZE_STAGE_EVENTS: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+    "categorize": lambda result: {
+        "event": "categorization",
+        "techniques": [t.value for t in result["techniques"]],
+        "confidence": result["confidence"],
+    },
+    "parse_bp": lambda nodes: {"event": "bp_nodes", "nodes": [asdict(n) for n in nodes]},
+    "registry": lambda nodes: {"event": "registry_nodes", "nodes": nodes},
+    "adapt": lambda nodes: {"event": "adapted_nodes", "nodes": nodes},
+}
+
+
+def analyze_event_publishers(channel: EventChannel):
+    """Stage and token callbacks that publish analyze progress to channel"""
+    def on_stage_complete(stage: str, result: Any) -> None:
+        to_payload = ANALYZE_STAGE_EVENTS.get(stage)
+        if to_payload:
+            payload = to_payload(result)
+            channel.publish(payload.pop("event"), payload)
+
+    def on_token(text: str) -> None:
+        channel.publish("token", {"stage": "adapt", "text": text})
+
+    return on_stage_complete, on_token
+
+
+def event_stream(channel: EventChannel, pipeline: Callable[[], Any]) -> StreamingResponse:
+    async def run() -> None:
+        try:
+            channel.publish("result", await pipeline())
+        except Exception as e:
+            traceback.print_exc()
+            channel.publish("error", {"message": str(e)})
+        channel.publish("done", {})
+
+    return StreamingResponse(channel.relay(run), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.post("/analyze/stream")
+async def analyze_stream(req: AnalyzeRequest):
+    channel = EventChannel()
+    on_stage_complete, on_token = analyze_event_publishers(channel)
+    return event_stream(channel, lambda: analyze_prompt(req.prompt, on_stage_complete, on_token))
+
+
 class ChatRequest(BaseModel):
     session_id: str
     message: str
 
-class ChatSession:
-    def __init__(self):
-        self.history = []
+SESSIONS = get_session_store()
+register_collector("chat_sessions", "gauge", "Live chat sessions", lambda: len(SESSIONS))
 
-SESSIONS: Dict[str, ChatSession] = {}
+async def process_chat_message(
+    req: ChatRequest,
+    channel: Optional[EventChannel] = None,
+) -> Dict[str, Any]:
+    """Shared body of /chat and /chat/stream; progress goes to channel when given"""
+    if req.message == "__FINALIZE__":
+        req.message = "done"
 
-@app.post("/chat")
-def chat(req: ChatRequest):
-    """Enhanced chat endpoint for clean prompt and get intent finalization."""
-    try:
-        if req.message == "__FINALIZE__":
-            req.message = "done"
+    async with SESSIONS.lock(req.session_id):
+        session = SESSIONS.get(req.session_id)
+        try:
+            result = await run_in_threadpool(
+                process_user_prompt, req.message, session.history, session
+            )
+        finally:
+            SESSIONS.save(req.session_id, session)
 
-        if req.session_id not in SESSIONS:
-            SESSIONS[req.session_id] = ChatSession()
+        if result.get("finalized"):
+            SESSIONS.delete(req.session_id)
 
-        session = SESSIONS[req.session_id]
-        result = process_user_prompt(req.message, session.history)
+    if result.get("finalized"):
+        final_intent = result["clean_prompt"]
+        on_stage_complete = on_token = None
+        if channel:
+            channel.publish("final_intent", {"final_intent": final_intent})
+            on_stage_complete, on_token = analyze_event_publishers(channel)
 
-        if result.get("finalized"):
-            final_intent = result["clean_prompt"]
-            
-            # Get analysis
-            analysis = None
-            try:
-                analysis = analyze(AnalyzeRequest(prompt=final_intent))
-            except Exception as e:
-                print(f"Error getting analysis: {e}")
-                analysis = {"success": False, "error": str(e)}
-            
-            # Clean up session
-            if req.session_id in SESSIONS:
-                del SESSIONS[req.session_id]
-            
-            return {"finalized": True, "final_intent": final_intent, "analysis": analysis}
-
-        if result.get("stop"):
-            return {"finalized": False, "response": result["reply"]}
-
-        return {"finalized": False, "response": result["clean_prompt"]}
+        # Get analysis
+        analysis = None
+        try:
+            analysis = await analyze_prompt(final_intent, on_stage_complete, on_token)
+        except Exception as e:
+            print(f"Error getting analysis: {e}")
+            analysis = {"success": False, "error": str(e)}
+        
+        return {"finalized": True, "final_intent": final_intent, "analysis": analysis}
+
+    if result.get("stop"):
+        return {"finalized": False, "response": result["reply"]}
+
+    return {"finalized": False, "response": result["clean_prompt"]}
+
+
+@app.post("/chat")
+async def chat(req: ChatRequest):
+    """Enhanced chat endpoint for clean prompt and get intent finalization."""
+    try:
+        return await process_chat_message(req)
         
     except Exception as e:
         print(f"Error in /chat: {e}")
         traceback.print_exc()
+        record_error("chat")
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@app.post("/chat/stream")
+async def chat_stream(req: ChatRequest):
+    """/chat over SSE: the reply, or the final intent followed by analyze progress"""
+    channel = EventChannel()
+    return event_stream(channel, lambda: process_chat_message(req, channel))
+
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus metrics: stage / tool / LLM timings, tokens, cache and errors"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # ---------------------------- main tool api end file //--------------------------
 
 
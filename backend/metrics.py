@@ -0,0 +1,247 @@
+"""
+Lightweight in-process metrics with a Prometheus text exporter.
+
+Counters and histograms are plain dicts behind a lock, so recording a value
+costs about a microsecond; render() produces the Prometheus text format
+served on GET /metrics. What is recorded:
+
+    pipeline_stage_seconds      StageGraph stages (analyze: categorize, parse_bp, ...)
+    tool_seconds / tool_calls   tools using createProgressReporter
+    llm_call_seconds            ChatGroq calls (callback handler) and raw Groq calls
+    llm_tokens_total            prompt / completion tokens reported by the API
+    llm_http_retries_total      retried HTTP requests to the LLM API
+    errors_total                failures by component
+    llm_cache_*, sessions       read from the cache and session store at scrape time
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels.get(n, "")) for n in self.labelnames), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        lines += [f"{self.name}{_format_labels(self.labelnames, k)} {v:g}" for k, v in items]
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket (+Inf last), sum]
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(tuple(str(labels.get(n, "")) for n in self.labelnames))
+        return sum(entry[0]) if entry else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(counts), total[0]) for k, (counts, total) in self._values.items()]
+
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                bucket = _format_labels(self.labelnames, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {total:g}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# ===== Registry =====
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "pipeline_stage_seconds", "Wall time of pipeline stages", ["pipeline", "stage"]
+)
+TOOL_SECONDS = Histogram("tool_seconds", "Wall time of tool executions", ["tool"])
+TOOL_CALLS = Counter("tool_calls_total", "Tool executions by outcome", ["tool", "status"])
+LLM_CALL_SECONDS = Histogram(
+    "llm_call_seconds", "Wall time of LLM calls, including cache hits", ["model", "client"]
+)
+LLM_TOKENS = Counter("llm_tokens_total", "Tokens reported by the LLM API", ["model", "kind"])
+LLM_HTTP_RETRIES = Counter("llm_http_retries_total", "HTTP requests to the LLM API that were retries")
+ERRORS = Counter("errors_total", "Failures by component", ["component"])
+
+METRICS: List[Any] = [
+    PIPELINE_STAGE_SECONDS,
+    TOOL_SECONDS,
+    TOOL_CALLS,
+    LLM_CALL_SECONDS,
+    LLM_TOKENS,
+    LLM_HTTP_RETRIES,
+    ERRORS,
+]
+
+# (name, type, help, read value) sampled when /metrics is scraped
+_collectors: List[Tuple[str, str, str, Callable[[], float]]] = []
+
+
+def register_collector(name: str, kind: str, help: str, read: Callable[[], float]) -> None:
+    """Expose a value owned elsewhere (cache stats, store sizes) at scrape time"""
+    _collectors.append((name, kind, help, read))
+
+
+def record_error(component: str) -> None:
+    ERRORS.inc(component=component)
+
+
+@contextmanager
+def span(histogram: Histogram, component: Optional[str] = None, **labels: str) -> Iterator[None]:
+    """Time a block into histogram; count an error for component if it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        if component:
+            ERRORS.inc(component=component)
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - started, **labels)
+
+
+# per-task token tally, see track_tokens
+_token_tally: ContextVar[Optional[Dict[str, float]]] = ContextVar("token_tally", default=None)
+
+
+def record_token_usage(model: str, usage: Optional[Dict[str, Any]]) -> None:
+    if not usage:
+        return
+    prompt = usage.get("prompt_tokens") or 0
+    completion = usage.get("completion_tokens") or 0
+    LLM_TOKENS.inc(prompt, model=model, kind="prompt")
+    LLM_TOKENS.inc(completion, model=model, kind="completion")
+
+    tally = _token_tally.get()
+    if tally is not None:
+        tally["prompt"] += prompt
+        tally["completion"] += completion
+
+
+@contextmanager
+def track_tokens() -> Iterator[Dict[str, float]]:
+    """
+    Tally the tokens of LLM calls made inside the block, including calls from
+    tasks and threads started in it (they inherit the context). Unlike
+    LLM_TOKENS this stays separate for concurrent requests.
+    """
+    tally = {"prompt": 0.0, "completion": 0.0}
+    token = _token_tally.set(tally)
+    try:
+        yield tally
+    finally:
+        _token_tally.reset(token)
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in METRICS:
+        lines += metric.render()
+    for name, kind, help, read in _collectors:
+        try:
+            value = read()
+        except Exception:
+            continue
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}", f"{name} {value:g}"]
+    return "\n".join(lines) + "\n"
+
+
+# ===== LLM hooks =====
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """LangChain callback recording latency, token usage and errors of chat model calls"""
+
+    # cheap enough to run on the event loop instead of a worker thread
+    run_inline = True
+
+    def __init__(self, model: str):
+        self.model = model
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            LLM_CALL_SECONDS.observe(time.perf_counter() - started, model=self.model, client="langchain")
+        # cache hits carry no llm_output, so only real API calls count tokens
+        record_token_usage(self.model, (response.llm_output or {}).get("token_usage"))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started.pop(run_id, None)
+        ERRORS.inc(component="llm")
+
+
+def count_retry(request: Any) -> None:
+    """httpx request hook: the Groq SDK numbers its retries in x-stainless-retry-count"""
+    if request.headers.get("x-stainless-retry-count", "0") != "0":
+        LLM_HTTP_RETRIES.inc()
+
+
+async def acount_retry(request: Any) -> None:
+    count_retry(request)
@@ -634,11 +634,12 @@
 
 # --------------------Add Node (Final code ) Implementation-----------------------
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field, ValidationError as PydanticValidationError
 
 from backend.n8n_worflow.inode_type_description import INode, INodeParameters, INodeTypeDescription
+from backend.n8n_worflow.workflow_graph import WorkflowGraph
 
 from backend.utills.stream_processor import BuilderTool, BuilderToolBase
 
@@ -649,7 +650,7 @@ from backend.utills.node_helpers import is_sub_node
 
 from backend.mytools.helpers.progress import createProgressReporter
 from backend.mytools.helpers.response import create_success_response, create_error_response
-from backend.mytools.helpers.state import get_current_workflow, add_node_to_workflow, get_workflow_state
+from backend.mytools.helpers.state import add_node_to_workflow, get_workflow_graph, get_workflow_state
 from backend.mytools.helpers.validation import find_node_type
 
 from backend.mytypes.nodes import AddedNode
@@ -678,7 +679,7 @@ def create_node(
     node_type: INodeTypeDescription,
     type_version: int,
     custom_name: str,
-    existing_nodes: list[INode],
+    existing_nodes: Union[list[INode], WorkflowGraph],
     node_types: list[INodeTypeDescription],
     connection_parameters: Optional[INodeParameters] = None,
     node_id: Optional[str] = None,
@@ -688,7 +689,7 @@ def create_node(
     unique_name = generate_unique_name(base_name, existing_nodes)
 
     position = calculate_node_position(
-        existing_nodes,
+        existing_nodes.nodes if isinstance(existing_nodes, WorkflowGraph) else existing_nodes,
         is_sub_node(node_type),
         node_types
     )
@@ -792,7 +793,7 @@ def create_add_node_tool(
 
             state = get_workflow_state()
             print("state:", state)
-            workflow = get_current_workflow(state)
+            graph = get_workflow_graph(state)
 
             reporter.progress(
                 f"Adding {validated.name} ({validated.connectionParametersReasoning})"
@@ -813,12 +814,12 @@ def create_add_node_tool(
                 reporter.error(error)
                 return create_error_response(config, error)
             print("line 849")
-            print(workflow)
+            print(graph.nodes)
             new_node = create_node(
                 node_type=node_type_desc,
                 type_version=validated.nodeVersion,
                 custom_name=validated.name,
-                existing_nodes=workflow["nodes"],
+                existing_nodes=graph,
                 node_types=node_types,
                 connection_parameters=validated.connectionParameters,
                 node_id=node_id,
@@ -840,6 +841,8 @@ def create_add_node_tool(
                 "message": message,
             })
 
+            # later calls on the same state see the node before workflowJSON is updated
+            graph.add_node(new_node)
             state_updates = add_node_to_workflow(new_node)
             return create_success_response(config, message, state_updates)
 
@@ -0,0 +1,121 @@
+# backend/mytools/catalog_snapshot.py
+"""
+Versioned binary snapshot of the node catalog and registry search index.
+
+Parsing nodes_catalog.json and building the search index on every worker
+start is wasted work, so the result is pickled once and loaded by each
+worker. The snapshot carries a checksum over the catalog file and the modules
+that shape its contents (curated registry, catalog layout, index); a snapshot
+with a stale checksum is ignored and rebuilt.
+
+Build ahead of deploy:
+    python -m backend.mytools.catalog_snapshot build
+    python -m backend.mytools.catalog_snapshot check
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+from backend.mytools.node_catalog import CATALOG_PATH
+
+SNAPSHOT_VERSION = 1
+
+SNAPSHOT_PATH = os.getenv(
+    "NODES_SNAPSHOT_PATH",
+    str(Path(CATALOG_PATH).with_suffix(".snapshot.pkl")),
+)
+
+# Sources whose changes invalidate a snapshot
+_MODULE_DIR = Path(__file__).resolve().parent
+SNAPSHOT_SOURCES = [
+    _MODULE_DIR / "node_registry.py",
+    _MODULE_DIR / "node_catalog.py",
+    _MODULE_DIR / "engine" / "registry_index.py",
+]
+
+
+def snapshot_enabled() -> bool:
+    return os.getenv("NODES_SNAPSHOT_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+
+
+def compute_checksum(catalog_path: str = CATALOG_PATH) -> str:
+    digest = hashlib.sha256(f"snapshot-v{SNAPSHOT_VERSION}".encode())
+    for path in [Path(catalog_path), *SNAPSHOT_SOURCES]:
+        digest.update(path.name.encode())
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+def save_snapshot(payload: Any, checksum: str, path: str = SNAPSHOT_PATH) -> None:
+    """Atomically write the snapshot so concurrent workers never read a partial file"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(
+                {"version": SNAPSHOT_VERSION, "checksum": checksum, "payload": payload},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load_snapshot(checksum: str, path: str = SNAPSHOT_PATH) -> Optional[Any]:
+    """Payload of a matching snapshot, or None when missing, stale or unreadable"""
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ignoring unreadable node snapshot {path}: {e}")
+        return None
+
+    if not isinstance(snapshot, dict):
+        return None
+    if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("checksum") != checksum:
+        return None
+    return snapshot.get("payload")
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or check the node catalog snapshot")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--output", default=SNAPSHOT_PATH, help="snapshot file path")
+    args = parser.parse_args(argv)
+
+    from backend.mytools.node_registry import build_registry_data
+
+    checksum = compute_checksum()
+
+    if args.command == "check":
+        if load_snapshot(checksum, args.output) is None:
+            print(f"Snapshot {args.output} is missing or stale")
+            return 1
+        print(f"Snapshot {args.output} is up to date")
+        return 0
+
+    payload = build_registry_data()
+    save_snapshot(payload, checksum, args.output)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output)} bytes, {len(payload.catalog)} catalog nodes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,10 @@ from typing import Any
 from pydantic import BaseModel, Field
 from typing_extensions import TypedDict
 
-from backend.Chains.prompt_categorization import prompt_categorization_chain
+from backend.Chains.prompt_categorization import (
+    prompt_categorization_chain,
+    aprompt_categorization_chain,
+)
 from backend.error import ValidationError, ToolExecutionError
 from backend.mytools.helpers.progress  import createProgressReporter
 from backend.mytools.helpers.response import (
@@ -35,6 +38,33 @@ def build_categorization_message(categorization) -> str:
     return "\n".join(parts)
 
 
+def _success(reporter, categorization):
+    output = CategorizePromptOutput(categorization=categorization)
+    reporter.complete(output)
+
+    return create_success_response(
+        build_categorization_message(categorization),
+        {
+            "categorization": categorization.__dict__,
+            "techniqueCategories": categorization.techniques,
+        },
+    )
+
+
+def _failure(reporter, e: Exception):
+    if isinstance(e, ValidationError):
+        reporter.error(e)
+        return create_error_response(e)
+
+    tool_error = ToolExecutionError(
+        str(e),
+        tool_name=CATEGORIZE_PROMPT_TOOL["tool_name"],
+        cause=e,
+    )
+    reporter.error(tool_error)
+    return create_error_response(tool_error)
+
+
 def create_categorize_prompt_tool(llm):
     def tool(input_data: dict[str, Any]):
         reporter = createProgressReporter(
@@ -49,28 +79,32 @@ def create_categorize_prompt_tool(llm):
             reporter.progress("Analyzing prompt to identify use case and techniques...")
             categorization = prompt_categorization_chain(llm, validated.prompt)
 
-            output = CategorizePromptOutput(categorization=categorization)
-            reporter.complete(output)
+            return _success(reporter, categorization)
+
+        except Exception as e:
+            return _failure(reporter, e)
+
+    return tool
+
+
+def create_async_categorize_prompt_tool(llm):
+    """Same contract as create_categorize_prompt_tool, but awaits the LLM call"""
+    async def tool(input_data: dict[str, Any]):
+        reporter = createProgressReporter(
+            CATEGORIZE_PROMPT_TOOL["tool_name"],
+            CATEGORIZE_PROMPT_TOOL["display_title"],
+        )
 
-            return create_success_response(
-                build_categorization_message(categorization),
-                {
-                    "categorization": categorization.__dict__,
-                    "techniqueCategories": categorization.techniques,
-                },
-            )
+        try:
+            validated = CategorizePromptSchema(**input_data)
+            reporter.start(validated.dict())
+
+            reporter.progress("Analyzing prompt to identify use case and techniques...")
+            categorization = await aprompt_categorization_chain(llm, validated.prompt)
 
-        except ValidationError as e:
-            reporter.error(e)
-            return create_error_response(e)
+            return _success(reporter, categorization)
 
         except Exception as e:
-            tool_error = ToolExecutionError(
-                str(e),
-                tool_name=CATEGORIZE_PROMPT_TOOL["tool_name"],
-                cause=e,
-            )
-            reporter.error(tool_error)
-            return create_error_response(tool_error)
+            return _failure(reporter, e)
 
     return tool
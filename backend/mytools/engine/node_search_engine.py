@@ -457,14 +457,65 @@
 
 
 
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 
+from backend.n8n_worflow.node_connection_types import NodeConnectionTypes
+
 
 class NodeSearchEngine:
+    """
+    Built once per catalog: searchable text is lowered up front and nodes are
+    indexed by the connection types they output, so a query is an index
+    lookup plus a bounded walk instead of a catalog scan.
+    """
+
     def __init__(self, nodes: List[Dict[str, Any]]):
         
         self.nodes = [n for n in nodes if n.get("type") == "node"]
 
+        self._texts: List[str] = []
+        self._results: List[Dict[str, Any]] = []
+        self._outputs: List[Any] = []
+        for node in self.nodes:
+            props = node.get("properties", {})
+            self._texts.append(
+                props.get("displayName", "").lower()
+                + " "
+                + props.get("description", "").lower()
+                + " "
+                + props.get("name", "").lower()
+            )
+            self._results.append(self._to_result(node, 0))
+            self._outputs.append(props.get("outputs", []) or [])
+
+        # trigram -> node indices whose text contains it; bitsets are built
+        # from these on first use
+        self._trigram_postings: Dict[str, List[int]] = {}
+        self._trigram_bits: Dict[str, int] = {}
+        for i, text in enumerate(self._texts):
+            for gram in {text[j:j + 3] for j in range(len(text) - 2)}:
+                self._trigram_postings.setdefault(gram, []).append(i)
+
+        # connection type -> node indices, in catalog order; types outside
+        # NodeConnectionTypes are indexed on first use
+        self._by_connection_type: Dict[str, List[int]] = {}
+        for connection_type in NodeConnectionTypes.all():
+            self._nodes_with_output(connection_type)
+
+    def _nodes_with_output(self, connection_type: str) -> List[int]:
+        indices = self._by_connection_type.get(connection_type)
+        if indices is None:
+            # `in` also covers outputs given as an expression string
+            indices = [i for i, outputs in enumerate(self._outputs) if connection_type in outputs]
+            self._by_connection_type[connection_type] = indices
+        return indices
+
+    def _result(self, index: int, score: int) -> Dict[str, Any]:
+        return {**self._results[index], "score": score}
+
     # 1 Search by connection type
     def search_by_connection_type(
         self,
@@ -472,33 +523,29 @@ class NodeSearchEngine:
         limit: int = 10,
         name_filter: Optional[str] = None,
     ):
-        results = []
+        if connection_type == "main":
+            score = 50
+        elif connection_type and connection_type.startswith("ai_"):
+            score = 100
+        else:
+            return []
 
-        for node in self.nodes:
-            props = node.get("properties", {})
-            outputs = props.get("outputs", []) or []
-
-            if connection_type == "main" and "main" in outputs:
-                score = 50
-            elif connection_type.startswith("ai_") and connection_type in outputs:
-                score = 100
-            else:
-                continue
+        if limit <= 0:
+            return []
 
-            if name_filter:
-                text = (
-                    props.get("displayName", "").lower()
-                    + " "
-                    + props.get("description", "").lower()
-                    + " "
-                    + props.get("name", "").lower()
-                )
-                if name_filter.lower() not in text:
-                    continue
+        name_filter = name_filter.lower() if name_filter else None
+        results = []
 
-            results.append(self._to_result(node, score))
+        # every match shares one score, so the first `limit` in catalog order
+        # are the top results
+        for i in self._nodes_with_output(connection_type):
+            if name_filter and name_filter not in self._texts[i]:
+                continue
+            results.append(self._result(i, score))
+            if len(results) >= limit:
+                break
 
-        return sorted(results, key=lambda x: x["score"], reverse=True)[:limit]
+        return results
 
     # -------------------------
     # 2️⃣ Search by name / intent
@@ -506,28 +553,75 @@ class NodeSearchEngine:
     def search_by_name(self, query: str, limit: int = 10):
         query = query.lower()
         results = []
+        if limit <= 0:
+            return results
 
-        for node in self.nodes:
-            props = node.get("properties", {})
-            text = (
-                props.get("displayName", "").lower()
-                + " "
-                + props.get("description", "").lower()
-                + " "
-                + props.get("name", "").lower()
-            )
-
+        for i, text in enumerate(self._texts):
             if query in text:
-                results.append(self._to_result(node, 80))
+                results.append(self._result(i, 80))
+                if len(results) >= limit:
+                    break
+
+        return results
+
+    def _candidate_bits(self, query: str) -> int:
+        """Bitset of nodes that contain every trigram of the query"""
+        if len(query) < 3:
+            return (1 << len(self._texts)) - 1
+
+        bits = -1
+        for gram in {query[j:j + 3] for j in range(len(query) - 2)}:
+            gram_bits = self._trigram_bits.get(gram)
+            if gram_bits is None:
+                gram_bits = 0
+                for i in self._trigram_postings.get(gram, ()):
+                    gram_bits |= 1 << i
+                self._trigram_bits[gram] = gram_bits
+            bits &= gram_bits
+            if not bits:
+                break
+        return bits
+
+    def search_by_names(self, queries: List[str], limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Batch form of search_by_name: same results per query, keyed by the
+        query string. Repeated queries are answered once, and all of them
+        share one pass over the nodes their trigrams can match.
+        """
+        pending: Dict[str, int] = {}
+        for query in queries:
+            lowered = query.lower()
+            if lowered not in pending:
+                pending[lowered] = self._candidate_bits(lowered)
+
+        found: Dict[str, List[Dict[str, Any]]] = {q: [] for q in pending}
+        active = {q: bits for q, bits in pending.items() if bits and limit > 0}
+
+        remaining = 0
+        for bits in active.values():
+            remaining |= bits
+
+        while remaining and active:
+            lowest = remaining & -remaining
+            remaining ^= lowest
+            i = lowest.bit_length() - 1
+            text = self._texts[i]
+
+            for query in list(active):
+                if not active[query] & lowest or query not in text:
+                    continue
+                results = found[query]
+                results.append(self._result(i, 80))
+                if len(results) >= limit:
+                    del active[query]
 
-        return results[:limit]
+        return {query: found[query.lower()] for query in queries}
 
     # -------------------------
     # 3️⃣ Normalize result
     # -------------------------
     def _to_result(self, node: Dict[str, Any], score: int):
         props = node.get("properties", {})
-
         return {
             "key": node.get("key"),
             "name": props.get("name"),
@@ -537,3 +631,39 @@ class NodeSearchEngine:
             "categories": props.get("codex", {}).get("categories", []),
             "score": score,
         }
+
+
+# ===== Shared engines =====
+# One engine per catalog version, shared by every tool built over it. Only the
+# most recently used versions are kept, so a catalog reload frees the old one.
+
+MAX_CACHED_ENGINES = 2
+
+_engines: "OrderedDict[str, NodeSearchEngine]" = OrderedDict()
+_engines_lock = threading.Lock()
+
+
+def catalog_version(nodes: List[Dict[str, Any]]) -> str:
+    """Fingerprint of a node list by keys and versions"""
+    digest = hashlib.sha1()
+    for node in nodes:
+        digest.update(str(node.get("key") or node.get("name")).encode())
+        digest.update(str(node.get("version", "")).encode())
+        digest.update(b"\x00")
+    return f"{len(nodes)}:{digest.hexdigest()}"
+
+
+def get_node_search_engine(
+    nodes: List[Dict[str, Any]],
+    version: Optional[str] = None,
+) -> NodeSearchEngine:
+    version = version or catalog_version(nodes)
+    with _engines_lock:
+        engine = _engines.get(version)
+        if engine is None:
+            engine = NodeSearchEngine(nodes)
+            _engines[version] = engine
+        _engines.move_to_end(version)
+        while len(_engines) > MAX_CACHED_ENGINES:
+            _engines.popitem(last=False)
+    return engine
@@ -0,0 +1,179 @@
+# backend/mytools/engine/registry_index.py
+"""
+Inverted token index with BM25F-style ranking for node registries.
+
+Documents are plain dicts of field -> text. Every field is tokenized once at
+build time (camelCase identifiers are split as well as kept whole), postings
+hold a field-weighted term frequency per document, and a trigram index over
+the vocabulary lets a query token also match terms that contain it, which
+keeps the old substring semantics ("openai" still finds "lmChatOpenAi").
+"""
+
+import heapq
+import math
+import re
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+FIELD_WEIGHTS: Dict[str, float] = {
+    "name": 3.0,
+    "display_name": 3.0,
+    "node_id": 2.0,
+    "category": 1.5,
+    "codex": 1.5,
+    "purpose": 1.0,
+    "description": 1.0,
+}
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "i", "in",
+    "into", "is", "it", "me", "my", "of", "on", "or", "the", "to", "we",
+    "when", "with", "want", "need", "please", "then", "that", "this",
+})
+
+INFIX_MATCH_WEIGHT = 0.5
+MIN_INFIX_LENGTH = 3
+
+# query tokens whose expansion is remembered, least recently used dropped first
+MAX_CACHED_EXPANSIONS = 4096
+
+_CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; camelCase words also yield their parts"""
+    tokens: List[str] = []
+    for word in _WORD_RE.findall(text or ""):
+        lowered = word.lower()
+        if lowered not in STOPWORDS:
+            tokens.append(lowered)
+
+        parts = _CAMEL_RE.split(word)
+        if len(parts) > 1:
+            tokens.extend(p.lower() for p in parts if p.lower() not in STOPWORDS)
+    return tokens
+
+
+def trigrams(term: str) -> Set[str]:
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+class RegistrySearchIndex:
+    """
+    Build once, query many times.
+
+    `docs` are field dicts in a fixed order; `search` returns (doc_index, score)
+    pairs, best first, ties broken by document order. `boosts` optionally
+    multiplies the score of individual documents.
+    """
+
+    def __init__(
+        self,
+        docs: Sequence[Dict[str, str]],
+        field_weights: Optional[Dict[str, float]] = None,
+        boosts: Optional[Sequence[float]] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.field_weights = field_weights or FIELD_WEIGHTS
+        self.k1 = k1
+        self.b = b
+        self.size = len(docs)
+        self.boosts = list(boosts) if boosts is not None else None
+
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.doc_lengths: List[float] = []
+
+        for doc_index, doc in enumerate(docs):
+            length = 0.0
+            for field_name, text in doc.items():
+                weight = self.field_weights.get(field_name, 1.0)
+                for token in tokenize(text):
+                    postings = self.postings.setdefault(token, {})
+                    postings[doc_index] = postings.get(doc_index, 0.0) + weight
+                    length += weight
+            self.doc_lengths.append(length)
+
+        self.avg_doc_length = (sum(self.doc_lengths) / self.size) if self.size else 0.0
+        self.idf: Dict[str, float] = {
+            term: math.log(1 + (self.size - len(p) + 0.5) / (len(p) + 0.5))
+            for term, p in self.postings.items()
+        }
+
+        # trigram -> vocabulary terms, for infix expansion of query tokens
+        self._term_trigrams: Dict[str, Set[str]] = {}
+        for term in self.postings:
+            for gram in trigrams(term):
+                self._term_trigrams.setdefault(gram, set()).add(term)
+
+        self._expansions: "OrderedDict[str, List[Tuple[str, float]]]" = OrderedDict()
+
+    def expand(self, token: str) -> List[Tuple[str, float]]:
+        """Vocabulary terms a query token matches, with a match weight"""
+        cached = self._expansions.get(token)
+        if cached is not None:
+            # no lock (the index is pickled into the snapshot); another thread
+            # may have evicted the token in between
+            try:
+                self._expansions.move_to_end(token)
+            except KeyError:
+                pass
+            return cached
+
+        matches: List[Tuple[str, float]] = []
+        if token in self.postings:
+            matches.append((token, 1.0))
+
+        if len(token) >= MIN_INFIX_LENGTH:
+            grams = sorted(trigrams(token), key=lambda g: len(self._term_trigrams.get(g, ())))
+            candidates: Optional[Set[str]] = None
+            for gram in grams:
+                terms = self._term_trigrams.get(gram)
+                if not terms:
+                    candidates = set()
+                    break
+                candidates = set(terms) if candidates is None else candidates & terms
+                if not candidates:
+                    break
+
+            for term in sorted(candidates or ()):
+                if term != token and token in term:
+                    matches.append((term, INFIX_MATCH_WEIGHT))
+
+        self._expansions[token] = matches
+        while len(self._expansions) > MAX_CACHED_EXPANSIONS:
+            self._expansions.popitem(last=False)
+        return matches
+
+    def search(self, query: str, k: Optional[int] = None) -> List[Tuple[int, float]]:
+        return self.search_tokens(tokenize(query), k)
+
+    def search_tokens(self, tokens: Iterable[str], k: Optional[int] = None) -> List[Tuple[int, float]]:
+        """search() for a query that is already tokenized"""
+        scores: Dict[int, float] = {}
+
+        for token in dict.fromkeys(tokens):
+            # a document counts once per query token, via its best-matching term
+            best: Dict[int, float] = {}
+            for term, match_weight in self.expand(token):
+                idf = self.idf[term]
+                for doc_index, tf in self.postings[term].items():
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_index] / self.avg_doc_length)
+                    score = match_weight * idf * tf * (self.k1 + 1) / (tf + norm)
+                    if score > best.get(doc_index, 0.0):
+                        best[doc_index] = score
+
+            for doc_index, score in best.items():
+                scores[doc_index] = scores.get(doc_index, 0.0) + score
+
+        if self.boosts is not None:
+            for doc_index in scores:
+                scores[doc_index] *= self.boosts[doc_index]
+
+        ranked: Iterable[Tuple[int, float]] = scores.items()
+        order = lambda item: (-item[1], item[0])
+        if k is not None:
+            return heapq.nsmallest(k, ranked, key=order)
+        return sorted(ranked, key=order)
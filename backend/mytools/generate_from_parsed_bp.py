@@ -6,6 +6,9 @@ from backend.llm_config import get_llm
 from langchain_core.prompts import ChatPromptTemplate
 from backend.mytools.parse_best_practices import parse_best_practices, NodeInfo
 from backend.mytools.node_registry import search_registry, NODE_REGISTRY
+from backend.mytypes.prompt_features import PromptFeatures, extract_prompt_features
+from backend.utills.keyword_matcher import register_keywords
+import inspect
 import json
 import re
 
@@ -71,27 +74,7 @@ def validate_and_fix_adapted_nodes(adapted_nodes: List[Dict[str, Any]]) -> List[
     return fixed_nodes
 
 
-def llm_select_and_adapt_nodes_for_intent(
-    user_intent: str,
-    parsed_nodes: List[NodeInfo]
-) -> List[Dict[str, Any]]:
-    """
-    Uses LLM to intelligently select and adapt nodes from the parsed best practices
-    to perfectly match the user's specific intent.
-    
-    NOW WITH VALIDATION to prevent LLM mistakes.
-    """
-    llm = get_llm()
-
-    nodes_description = "\n".join([
-        f"- Name: {node.name}\n"
-        f"  ID: {node.node_id}\n"
-        f"  Category: {node.category}\n"
-        f"  Original Purpose: {node.purpose}\n"
-        f"  Pitfalls: {', '.join(node.pitfalls) if node.pitfalls else 'None'}"
-        for node in parsed_nodes
-    ])
-
+def _build_adapt_chain(llm):
     prompt = ChatPromptTemplate.from_messages([
         ("system", """You are an expert n8n workflow architect.
 Your task is to select and adapt ONLY from the provided parsed nodes to build a workflow that exactly fulfills the user's intent.
@@ -114,12 +97,37 @@ Available Parsed Nodes (use only these):
 Generate the exact list of nodes needed for this workflow as JSON array only:""")
     ])
 
-    chain = prompt | llm
-    response = chain.invoke({
-        "intent": user_intent,
-        "nodes": nodes_description
-    })
+    return prompt | llm
+
+
+def _describe_parsed_nodes(parsed_nodes: List[NodeInfo]) -> str:
+    return "\n".join([
+        f"- Name: {node.name}\n"
+        f"  ID: {node.node_id}\n"
+        f"  Category: {node.category}\n"
+        f"  Original Purpose: {node.purpose}\n"
+        f"  Pitfalls: {', '.join(node.pitfalls) if node.pitfalls else 'None'}"
+        for node in parsed_nodes
+    ])
 
+
+# Intent words that boost trigger / AI nodes in the heuristic fallback of
+# llm_select_and_adapt_nodes_for_intent
+FALLBACK_BOOST_KEYWORDS: Dict[str, List[str]] = {
+    "trigger": ["trigger", "webhook", "chat", "schedule"],
+    "ai": ["generate", "claude", "anthropic", "gpt", "llm"],
+}
+
+register_keywords(*FALLBACK_BOOST_KEYWORDS.values())
+
+
+def _adapted_nodes_from_response(
+    response: Any,
+    user_intent: str,
+    parsed_nodes: List[NodeInfo],
+    features: Optional[PromptFeatures] = None
+) -> List[Dict[str, Any]]:
+    """Parse the LLM JSON array, falling back to heuristic scoring when it is unusable"""
     content = response.content if hasattr(response, 'content') else str(response)
 
     try:
@@ -142,18 +150,20 @@ Generate the exact list of nodes needed for this workflow as JSON array only:"""
         print(f"LLM node selection failed: {e}")
 
     # Fallback: return top relevant nodes heuristically
-    intent_lower = user_intent.lower()
-    keywords = intent_lower.split()
+    features = features or extract_prompt_features(user_intent)
+    keywords = features.tokens
+    wants_trigger = features.hits.any(FALLBACK_BOOST_KEYWORDS["trigger"])
+    wants_ai = features.hits.any(FALLBACK_BOOST_KEYWORDS["ai"])
     scored = []
     for node in parsed_nodes:
         score = sum(k in (node.name + node.purpose + node.node_id).lower() for k in keywords)
-        if "trigger" in node.category.lower() and any(t in intent_lower for t in ["trigger", "webhook", "chat", "schedule"]):
+        if "trigger" in node.category.lower() and wants_trigger:
             score += 5
-        if "ai" in node.category.lower() and any(t in intent_lower for t in ["generate", "claude", "anthropic", "gpt", "llm"]):
+        if "ai" in node.category.lower() and wants_ai:
             score += 5
         scored.append((score, node))
 
-    scored.sort(reverse=True)
+    scored.sort(key=lambda item: item[0], reverse=True)
     top_nodes = [node for _, node in scored[:8]]
 
     return [
@@ -172,36 +182,112 @@ Generate the exact list of nodes needed for this workflow as JSON array only:"""
         for node in top_nodes
     ]
 
-def generalize_phases(intent: str) -> List[Tuple[str, Callable]]:
+
+def llm_select_and_adapt_nodes_for_intent(
+    user_intent: str,
+    parsed_nodes: List[NodeInfo],
+    features: Optional[PromptFeatures] = None
+) -> List[Dict[str, Any]]:
+    """
+    Uses LLM to intelligently select and adapt nodes from the parsed best practices
+    to perfectly match the user's specific intent.
+    
+    NOW WITH VALIDATION to prevent LLM mistakes.
+    """
+    chain = _build_adapt_chain(get_llm())
+    response = chain.invoke({
+        "intent": user_intent,
+        "nodes": _describe_parsed_nodes(parsed_nodes)
+    })
+
+    return _adapted_nodes_from_response(response, user_intent, parsed_nodes, features)
+
+
+async def allm_select_and_adapt_nodes_for_intent(
+    user_intent: str,
+    parsed_nodes: List[NodeInfo],
+    features: Optional[PromptFeatures] = None,
+    on_token: Optional[Callable[[str], Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Async variant of llm_select_and_adapt_nodes_for_intent.
+    With on_token the LLM response is streamed and every text chunk is passed
+    to it as it arrives (streamed calls do not go through the LLM cache).
+    """
+    chain = _build_adapt_chain(get_llm())
+    chain_input = {
+        "intent": user_intent,
+        "nodes": _describe_parsed_nodes(parsed_nodes)
+    }
+
+    if on_token is None:
+        response = await chain.ainvoke(chain_input)
+    else:
+        parts = []
+        async for chunk in chain.astream(chain_input):
+            text = chunk.content if isinstance(getattr(chunk, "content", None), str) else ""
+            if text:
+                parts.append(text)
+                notified = on_token(text)
+                if inspect.isawaitable(notified):
+                    await notified
+        response = "".join(parts)
+
+    return _adapted_nodes_from_response(response, user_intent, parsed_nodes, features)
+
+
+# Intent words that open each phase in generalize_phases
+PHASE_KEYWORDS: Dict[str, List[str]] = {
+    "fetch": ["fetch", "get", "api", "http", "request", "data from", "read", "load", "query", "scrape"],
+    "extract": ["extract", "parse", "json", "split", "iterate", "loop over", "item"],
+    "transform": ["set", "edit", "transform", "modify", "compose", "text", "body", "message", "format", "code", "function", "reply"],
+    "control": ["if", "condition", "switch", "branch", "merge", "loop", "filter"],
+    "ai": ["ai", "llm", "chat", "model", "generate", "bot", "agent", "openai", "grok", "gemini", "reply"],
+    "action": ["send", "post", "notify", "email", "slack", "telegram", "whatsapp", "msg", "message", "via", "to", "output", "store", "save"],
+    "safety": ["wait", "delay", "error", "catch", "handle", "fallback"],
+}
+
+# Intent words heuristic_node_selection picks nodes by
+HEURISTIC_KEYWORDS: Dict[str, List[str]] = {
+    "webhook": ["bot", "reply", "webhook", "receive"],
+    "transform": ["text", "body", "message", "compose", "reply", "format"],
+    "action": ["send", "email", "slack", "telegram", "whatsapp", "msg", "notify", "store", "sheet"],
+    "fetch": ["fetch", "api", "scrape"],
+}
+
+register_keywords(*PHASE_KEYWORDS.values(), *HEURISTIC_KEYWORDS.values())
+
+
+def generalize_phases(intent: str, features: Optional[PromptFeatures] = None) -> List[Tuple[str, Callable]]:
     """Dynamically generate phases with trigger always first and better ordering."""
-    intent_lower = intent.lower()
+    hits = (features or extract_prompt_features(intent)).hits
     phases = []
 
     # ALWAYS include trigger phase first – essential for 99% of workflows
     phases.append(("trigger", lambda n: n.category == "trigger"))
 
     # Data fetching
-    if any(k in intent_lower for k in ["fetch", "get", "api", "http", "request", "data from", "read", "load", "query", "scrape"]):
+    if hits.any(PHASE_KEYWORDS["fetch"]):
         phases.append(("fetch", lambda n: any(t in n.node_id.lower() for t in ["http", "request"]) or "fetch" in n.name.lower()))
 
     # Extract / Parse
-    if any(k in intent_lower for k in ["extract", "parse", "json", "split", "iterate", "loop over", "item"]):
+    if hits.any(PHASE_KEYWORDS["extract"]):
         phases.append(("extract", lambda n: any(t in n.name.lower() for t in ["extract", "split", "item", "json", "parse"])))
 
     # Transform / Compose – prioritize if message/body mentioned
-    if any(k in intent_lower for k in ["set", "edit", "transform", "modify", "compose", "text", "body", "message", "format", "code", "function", "reply"]):
+    if hits.any(PHASE_KEYWORDS["transform"]):
         phases.append(("transform", lambda n: n.category == "transform" or any(t in n.name.lower() for t in ["set", "code", "function", "edit"])))
 
     # Control flow
-    if any(k in intent_lower for k in ["if", "condition", "switch", "branch", "merge", "loop", "filter"]):
+    if hits.any(PHASE_KEYWORDS["control"]):
         phases.append(("control", lambda n: n.category == "control" or any(t in n.name.lower() for t in ["if", "switch", "merge"])))
 
     # AI / Generation
-    if any(k in intent_lower for k in ["ai", "llm", "chat", "model", "generate", "bot", "agent", "openai", "grok", "gemini", "reply"]):
+    if hits.any(PHASE_KEYWORDS["ai"]):
         phases.append(("ai", lambda n: n.category == "ai" or "langchain" in n.node_id.lower()))
 
     # Action / Send – last major phase
-    if any(k in intent_lower for k in ["send", "post", "notify", "email", "slack", "telegram", "whatsapp", "msg", "message", "via", "to", "output", "store", "save"]):
+    if hits.any(PHASE_KEYWORDS["action"]):
         action_matcher = lambda n: (
             n.category == "action" or
             any(t in n.name.lower() or t in n.node_id.lower() for t in ["email", "slack", "telegram", "whatsapp", "send", "smtp", "gmail", "post", "notify", "sheet"])
@@ -209,7 +295,7 @@ def generalize_phases(intent: str) -> List[Tuple[str, Callable]]:
         phases.append(("action", action_matcher))
 
     # Safety
-    if any(k in intent_lower for k in ["wait", "delay", "error", "catch", "handle", "fallback"]):
+    if hits.any(PHASE_KEYWORDS["safety"]):
         phases.append(("safety", lambda n: any(t in n.name.lower() for t in ["wait", "error", "no-op"])))
 
     # If no specific phases beyond trigger, use a minimal default
@@ -222,26 +308,31 @@ def generalize_phases(intent: str) -> List[Tuple[str, Callable]]:
     return phases
 
 
-def align_nodes_after_parsing(intent: str, parsed_nodes: List[NodeInfo]) -> List[NodeInfo]:
+def align_nodes_after_parsing(
+    intent: str,
+    parsed_nodes: List[NodeInfo],
+    features: Optional[PromptFeatures] = None
+) -> List[NodeInfo]:
     """Order nodes strictly by phases – no auto-append of all remaining."""
     workflow_nodes: List[NodeInfo] = []
     used_ids = set()
 
-    phases = generalize_phases(intent)
+    features = features or extract_prompt_features(intent)
+    phases = generalize_phases(intent, features)
     print(f"\nUsing phases for intent '{intent}': {[name for name, _ in phases]}")
 
     for phase_name, matcher in phases:
         matching = [n for n in parsed_nodes if n.node_id not in used_ids and matcher(n)]
         if matching:
             # Pick the BEST match (prioritize exact keyword hits)
-            best = max(matching, key=lambda n: sum(k in n.name.lower() + n.node_id.lower() for k in intent.lower().split()))
+            best = max(matching, key=lambda n: sum(k in n.name.lower() + n.node_id.lower() for k in features.tokens))
             workflow_nodes.append(best)
             used_ids.add(best.node_id)
             print(f"  → Phase '{phase_name}': {best.name} ({best.node_id})")
 
     # If too few nodes (<3), supplement with heuristic
     if len(workflow_nodes) < 3:
-        heuristic_add = heuristic_node_selection(intent, [n for n in parsed_nodes if n.node_id not in used_ids])
+        heuristic_add = heuristic_node_selection(intent, [n for n in parsed_nodes if n.node_id not in used_ids], features)
         for add in heuristic_add:
             if add.node_id not in used_ids:
                 workflow_nodes.append(add)
@@ -303,28 +394,32 @@ Return refined JSON array of node_ids:""")
     return initial_selection  # Fallback
 
 
-def heuristic_node_selection(user_intent: str, available_nodes: List[NodeInfo]) -> List[NodeInfo]:
-    intent_lower = user_intent.lower()
+def heuristic_node_selection(
+    user_intent: str,
+    available_nodes: List[NodeInfo],
+    features: Optional[PromptFeatures] = None
+) -> List[NodeInfo]:
+    hits = (features or extract_prompt_features(user_intent)).hits
     selected = []
 
     # Trigger
     triggers = [n for n in available_nodes if n.category == "trigger"]
     if triggers:
         # Prefer webhook for bots/replies, schedule otherwise
-        if any(k in intent_lower for k in ["bot", "reply", "webhook", "receive"]):
+        if hits.any(HEURISTIC_KEYWORDS["webhook"]):
             webhook = next((n for n in triggers if "webhook" in n.name.lower()), triggers[0])
             selected.append(webhook)
         else:
             selected.append(triggers[0])
 
     # Transform for composition
-    if any(k in intent_lower for k in ["text", "body", "message", "compose", "reply", "format"]):
+    if hits.any(HEURISTIC_KEYWORDS["transform"]):
         transforms = [n for n in available_nodes if "set" in n.name.lower() or n.category == "transform"]
         if transforms:
             selected.append(transforms[0])
 
     # Action
-    if any(k in intent_lower for k in ["send", "email", "slack", "telegram", "whatsapp", "msg", "notify", "store", "sheet"]):
+    if hits.any(HEURISTIC_KEYWORDS["action"]):
         actions = [n for n in available_nodes if n.category == "action"]
         relevant = [n for n in actions if any(k in n.name.lower() or k in n.node_id.lower() for k in ["email", "slack", "telegram", "whatsapp", "sheet", "send"])]
         if relevant:
@@ -333,7 +428,7 @@ def heuristic_node_selection(user_intent: str, available_nodes: List[NodeInfo])
             selected.extend(actions[:2])
 
     # Fetch for API/scrape
-    if any(k in intent_lower for k in ["fetch", "api", "scrape"]):
+    if hits.any(HEURISTIC_KEYWORDS["fetch"]):
         fetch = [n for n in available_nodes if "http" in n.node_id.lower()]
         if fetch:
             selected.append(fetch[0])
@@ -545,8 +640,8 @@ def generate_workflow_from_parsed_bp(
     workflow_specific_nodes = []
 
     # 1. Search registry with full intent
-    intent_lower = user_intent.lower()
-    registry_matches = search_registry(intent_lower)
+    features = extract_prompt_features(user_intent)
+    registry_matches = search_registry(features.normalized, tokens=features.search_tokens)
     print(f"Registry search found {len(registry_matches)} nodes")
 
     # Add all registry matches
@@ -631,7 +726,7 @@ def generate_workflow_from_parsed_bp(
         for n in workflow_specific_nodes
     ]
 
-    ordered_nodes = align_nodes_after_parsing(user_intent, selected_node_infos)
+    ordered_nodes = align_nodes_after_parsing(user_intent, selected_node_infos, features)
     workflow = generate_workflow_structure(
         user_intent=user_intent,
         selected_nodes=ordered_nodes,
@@ -26,8 +26,10 @@
 
 # Progress reporter implementation
 
+import time
 from typing import Any, Dict, Optional, TypeVar
 
+from backend.metrics import ERRORS, TOOL_CALLS, TOOL_SECONDS
 from backend.mytypes.tools import (
     ToolProgressMessage,
     ToolError,
@@ -52,13 +54,20 @@ def createProgressReporter(
     
 
     customDisplayTitle = customTitle
+    startedAt: Optional[float] = None
+
+    def recordOutcome(status: str) -> None:
+        TOOL_CALLS.inc(tool=toolName, status=status)
+        if startedAt is not None:
+            TOOL_SECONDS.observe(time.perf_counter() - startedAt, tool=toolName)
     
     def emit(message: ToolProgressMessage) -> None:
         if config and getattr(config, "writer", None):
             config.writer(message)
 
     def start(input: T, options: Optional[Dict[str, str]] = None) -> None:
-        nonlocal customDisplayTitle
+        nonlocal customDisplayTitle, startedAt
+        startedAt = time.perf_counter()
         if options and "customDisplayTitle" in options:
             customDisplayTitle = options["customDisplayTitle"]
 
@@ -94,6 +103,7 @@ def createProgressReporter(
         })
 
     def complete(output: T) -> None:
+        recordOutcome("completed")
         emit({
             "type": "tool",
             "toolName": toolName,
@@ -110,6 +120,8 @@ def createProgressReporter(
         })
 
     def error(err: ToolError) -> None:
+        recordOutcome("error")
+        ERRORS.inc(component=f"tool.{toolName}")
         emit({
             "type": "tool",
             "toolName": toolName,
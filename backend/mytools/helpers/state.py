@@ -180,6 +180,7 @@ from typing import Dict, Any, List
 
 from backend.mytypes.nodes import SimpleWorkflow
 from backend.n8n_worflow.inode_type_description import INode, IConnections
+from backend.n8n_worflow.workflow_graph import WorkflowGraph
 
 
 # Workflow state is always a DICT
@@ -219,6 +220,19 @@ def get_current_workflow(state: WorkflowStateType) -> SimpleWorkflow:
     )
 
 
+def get_workflow_graph(state: WorkflowStateType) -> WorkflowGraph:
+    """
+    Indexed view of the workflow in state, kept under "workflowGraph" so it
+    is built once per state and not on every tool call. It shares nodes and
+    links with workflowJSON; whoever replaces workflowJSON drops the graph.
+    """
+    graph = state.get("workflowGraph")
+    if not isinstance(graph, WorkflowGraph):
+        graph = WorkflowGraph.from_json(get_current_workflow(state), copy_input=False, strict=False)
+        state["workflowGraph"] = graph
+    return graph
+
+
 # ─────────────────────────────────────────────────────────────
 # Workflow update creators
 # ─────────────────────────────────────────────────────────────
@@ -266,12 +280,7 @@ def update_node_in_workflow(
     Create state update to modify an existing node.
     Returns empty dict if node doesn't exist.
     """
-    workflow = get_current_workflow(state)
-
-    existing_node = next(
-        (n for n in workflow["nodes"] if n.get("id") == node_id),
-        None,
-    )
+    existing_node = get_workflow_graph(state).get_by_id(node_id)
 
     if not existing_node:
         return {}
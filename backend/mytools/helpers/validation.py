@@ -13,28 +13,37 @@ from backend.n8n_worflow.inode_type_description import INode, INodeTypeDescripti
 
 from backend.mytypes.tools import ToolError
 from backend.mytypes.workflow import SimpleWorkflow
+from backend.n8n_worflow.workflow_graph import WorkflowGraph
 
+# Lookups take either the node list or a WorkflowGraph; the graph answers
+# from its indexes instead of scanning
+NodesOrGraph = Union[List[INode], WorkflowGraph]
 
-def validate_node_exists(node_id: str, nodes: List[INode]) -> Optional[INode]:
+
+def validate_node_exists(node_id: str, nodes: NodesOrGraph) -> Optional[INode]:
     """
     Validate that a node exists in the workflow by ID
     
     Returns:
         The found node or None if not found
     """
+    if isinstance(nodes, WorkflowGraph):
+        return nodes.get_by_id(node_id)
     for node in nodes:
         if node["id"] == node_id:
             return node
     return None
 
 
-def find_node_by_name(node_name: str, nodes: List[INode]) -> Optional[INode]:
+def find_node_by_name(node_name: str, nodes: NodesOrGraph) -> Optional[INode]:
     """
     Find a node by name (case-insensitive)
     
     Returns:
         The found node or None
     """
+    if isinstance(nodes, WorkflowGraph):
+        return nodes.get_by_name(node_name, case_sensitive=False)
     search_name = node_name.lower()
     for node in nodes:
         if node["name"].lower() == search_name:
@@ -42,7 +51,7 @@ def find_node_by_name(node_name: str, nodes: List[INode]) -> Optional[INode]:
     return None
 
 
-def find_node_by_id_or_name(node_identifier: str, nodes: List[INode]) -> Optional[INode]:
+def find_node_by_id_or_name(node_identifier: str, nodes: NodesOrGraph) -> Optional[INode]:
     """
     Find a node by either ID (preferred) or name
     
@@ -0,0 +1,151 @@
+# backend/mytools/node_catalog.py
+"""
+Compact, read-only view of data/nodes_catalog.json.
+
+The catalog is stored column-wise: one list per scalar field, and a single
+flat list of interned strings plus an offset array for each list-valued field
+(group, codex categories, documentation urls). No per-node dicts or objects
+are kept around; callers get a plain record for a row only when they ask for
+it, and node_registry turns that into a RegistryNode.
+"""
+
+import json
+import os
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CATALOG_PATH = os.getenv(
+    "NODES_CATALOG_PATH",
+    str(Path(__file__).resolve().parents[2] / "data" / "nodes_catalog.json"),
+)
+
+
+def _intern(value: Any) -> str:
+    return sys.intern(value) if isinstance(value, str) else ""
+
+
+class _ListColumn:
+    """Variable-length string lists packed into one list and an offset array"""
+    __slots__ = ("values", "offsets")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.offsets = array("I", [0])
+
+    def append(self, items: Iterable[str]) -> None:
+        self.values.extend(_intern(item) for item in items)
+        self.offsets.append(len(self.values))
+
+    def get(self, row: int) -> List[str]:
+        return self.values[self.offsets[row]:self.offsets[row + 1]]
+
+
+class NodeCatalog:
+    __slots__ = (
+        "uuids", "keys", "names", "display_names", "descriptions",
+        "subcategories", "types", "icon_urls", "outputs",
+        "groups", "codex_categories", "primary_docs", "credential_docs",
+        "has_codex", "row_by_key",
+    )
+
+    def __init__(self):
+        self.uuids: List[str] = []
+        self.keys: List[str] = []
+        self.names: List[str] = []
+        self.display_names: List[str] = []
+        self.descriptions: List[str] = []
+        self.subcategories: List[str] = []
+        self.types: List[str] = []
+        self.icon_urls: List[Optional[str]] = []
+        # a tuple of connection types, or the raw expression string for
+        # nodes whose outputs depend on parameters
+        self.outputs: List[Any] = []
+
+        self.groups = _ListColumn()
+        self.codex_categories = _ListColumn()
+        self.primary_docs = _ListColumn()
+        self.credential_docs = _ListColumn()
+        self.has_codex = bytearray()
+
+        self.row_by_key: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, data: Dict[str, Any]) -> int:
+        """Append one raw n8n node entry (the shape from_n8n_data accepts)"""
+        props = data.get("properties", {})
+        defaults = props.get("defaults", {})
+        codex = props.get("codex") or {}
+        resources = codex.get("resources", {})
+
+        icon_url = props.get("iconUrl")
+        if isinstance(icon_url, dict):
+            icon_url = icon_url.get("light") or icon_url.get("dark")
+
+        outputs = props.get("outputs", ["main"])
+        outputs = tuple(_intern(o) for o in outputs) if isinstance(outputs, list) else outputs
+
+        row = len(self.keys)
+        key = _intern(data.get("key", ""))
+
+        self.uuids.append(data.get("uuid", ""))
+        self.keys.append(key)
+        self.names.append(defaults.get("name", props.get("name", "")))
+        self.display_names.append(props.get("displayName", ""))
+        self.descriptions.append(props.get("description", ""))
+        self.subcategories.append(_intern(data.get("subcategory", "*")))
+        self.types.append(_intern(data.get("type", "node")))
+        self.icon_urls.append(icon_url)
+        self.outputs.append(outputs)
+
+        self.groups.append(props.get("group", []))
+        self.codex_categories.append(codex.get("categories", []))
+        self.primary_docs.append(doc.get("url", "") for doc in resources.get("primaryDocumentation", []))
+        self.credential_docs.append(doc.get("url", "") for doc in resources.get("credentialDocumentation", []))
+        self.has_codex.append(1 if codex else 0)
+
+        self.row_by_key.setdefault(key, row)
+        return row
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """Plain field dict for one row, ready for RegistryNode(**...)"""
+        outputs = self.outputs[row]
+        return {
+            "uuid": self.uuids[row],
+            "key": self.keys[row],
+            "node_id": self.keys[row],
+            "name": self.names[row],
+            "display_name": self.display_names[row],
+            "description": self.descriptions[row],
+            "subcategory": self.subcategories[row],
+            "group": self.groups.get(row),
+            "outputs": list(outputs) if isinstance(outputs, tuple) else outputs,
+            "icon_url": self.icon_urls[row],
+            "purpose": self.descriptions[row],
+            "type": self.types[row],
+        }
+
+    def codex(self, row: int) -> Optional[Tuple[List[str], List[str], List[str]]]:
+        """(categories, primary docs, credential docs), or None without codex"""
+        if not self.has_codex[row]:
+            return None
+        return (
+            self.codex_categories.get(row),
+            self.primary_docs.get(row),
+            self.credential_docs.get(row),
+        )
+
+
+def load_catalog(path: str = CATALOG_PATH, entries: Optional[Sequence[Dict[str, Any]]] = None) -> NodeCatalog:
+    """Read the catalog JSON (or use already-parsed entries) into a NodeCatalog"""
+    if entries is None:
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+
+    catalog = NodeCatalog()
+    for data in entries:
+        catalog.add(data)
+    return catalog
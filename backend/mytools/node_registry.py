@@ -1,8 +1,12 @@
 # backend/mytools/node_registry.py - UPGRADED with Full n8n Node Data
 
-from typing import List, Optional, Dict, Any
+from itertools import islice
+from typing import Callable, List, Optional, Dict, Any, Sequence, Union
 from dataclasses import dataclass, field
 
+from backend.mytools.engine.registry_index import RegistrySearchIndex
+from backend.mytools.node_catalog import NodeCatalog, load_catalog
+
 @dataclass
 class NodeCodex:
     """Documentation and resource links for a node"""
@@ -11,6 +15,15 @@ class NodeCodex:
     credential_documentation: List[str] = field(default_factory=list)
 
 
+def category_from_group(group: List[str]) -> str:
+    """Our simplified category for an n8n group list"""
+    if "trigger" in group:
+        return "trigger"
+    if any(t in group for t in ["transform", "data"]):
+        return "transform"
+    return "action"
+
+
 @dataclass
 class RegistryNode:
     """Full n8n node metadata"""
@@ -50,11 +63,8 @@ class RegistryNode:
             self.node_id = self.key
         
         # Auto-derive category from group if not set
-        if self.category == "action" and self.group:
-            if "trigger" in self.group:
-                self.category = "trigger"
-            elif any(t in self.group for t in ["transform", "data"]):
-                self.category = "transform"
+        if self.category == "action":
+            self.category = category_from_group(self.group)
     
     @classmethod
     def from_n8n_data(cls, data: Dict[str, Any], our_metadata: Dict[str, Any] = None):
@@ -424,33 +434,204 @@ NODE_BY_ID = {node.node_id: node for node in NODE_REGISTRY}
 NODE_BY_UUID = {node.uuid: node for node in NODE_REGISTRY}
 NODE_BY_KEY = {node.key: node for node in NODE_REGISTRY}
 
-def search_registry(keyword: str) -> List[RegistryNode]:
-    """Search registry by keyword in name, purpose, category, or node_id"""
-    keyword = keyword.lower()
-    return [
-        node for node in NODE_REGISTRY
-        if (keyword in node.name.lower() or 
-            keyword in node.display_name.lower() or
-            keyword in node.purpose.lower() or 
-            keyword in node.node_id.lower() or
-            keyword in node.description.lower() or
-            keyword in node.category.lower())
-    ]
+# ===== Full n8n catalog =====
+# data/nodes_catalog.json is loaded on first use into a compact NodeCatalog.
+# Curated NODE_REGISTRY entries override catalog rows with the same key and
+# rank above them; core and AI catalog nodes rank above third-party
+# integrations. Catalog rows become RegistryNode objects only when returned.
+# The catalog and index are read from a prebuilt snapshot when one matches
+# (see catalog_snapshot.py) and rebuilt otherwise.
+
+CURATED_BOOST = 1.5
+INTEGRATION_BOOST = 0.6
+
+CORE_CODEX_CATEGORY = "Core Nodes"
+AI_PACKAGE_PREFIX = "@n8n/n8n-nodes-langchain."
+
+def _is_integration(key: str, codex_categories: Sequence[str]) -> bool:
+    return (
+        key not in NODE_BY_KEY
+        and not key.startswith(AI_PACKAGE_PREFIX)
+        and CORE_CODEX_CATEGORY not in codex_categories
+    )
+
+def is_integration_node(node: RegistryNode) -> bool:
+    """Third-party service node from the catalog (Slack, Typeform, ...), not a curated, core or AI node"""
+    return _is_integration(node.key, node.codex.categories if node.codex else [])
+
+@dataclass
+class RegistryData:
+    catalog: NodeCatalog
+    index: RegistrySearchIndex
+    # per index document: curated node key, or catalog row
+    refs: List[Union[str, int]]
+
+_registry_data: Optional[RegistryData] = None
+
+def _load_catalog_or_empty() -> NodeCatalog:
+    try:
+        return load_catalog()
+    except (OSError, ValueError) as e:
+        print(f"Node catalog unavailable, using curated registry only: {e}")
+        return NodeCatalog()
+
+def _index_fields(node: RegistryNode) -> Dict[str, str]:
+    return {
+        "name": node.name,
+        "display_name": node.display_name,
+        "node_id": node.node_id,
+        "category": node.category,
+        "codex": " ".join(node.codex.categories) if node.codex else "",
+        "purpose": node.purpose,
+        "description": node.description,
+    }
+
+def _catalog_category(catalog: NodeCatalog, row: int) -> str:
+    """Our category for a catalog row; non-trigger nodes in the AI codex category are ai"""
+    category = category_from_group(catalog.groups.get(row))
+    if category != "trigger" and "AI" in catalog.codex_categories.get(row):
+        return "ai"
+    return category
+
+def _catalog_index_fields(catalog: NodeCatalog, row: int) -> Dict[str, str]:
+    return {
+        "name": catalog.names[row],
+        "display_name": catalog.display_names[row],
+        "node_id": catalog.keys[row],
+        "category": _catalog_category(catalog, row),
+        "codex": " ".join(catalog.codex_categories.get(row)),
+        "description": catalog.descriptions[row],
+    }
+
+def build_registry_data() -> RegistryData:
+    """Load the catalog and build the search index over curated + catalog nodes"""
+    catalog = _load_catalog_or_empty()
+    refs: List[Union[str, int]] = [node.key for node in NODE_REGISTRY]
+    docs = [_index_fields(node) for node in NODE_REGISTRY]
+    boosts = [CURATED_BOOST] * len(docs)
+
+    for key, row in catalog.row_by_key.items():
+        if key in NODE_BY_KEY:
+            continue
+        refs.append(row)
+        docs.append(_catalog_index_fields(catalog, row))
+        boosts.append(INTEGRATION_BOOST if _is_integration(key, catalog.codex_categories.get(row)) else 1.0)
+
+    return RegistryData(catalog=catalog, index=RegistrySearchIndex(docs, boosts=boosts), refs=refs)
+
+def get_registry_data() -> RegistryData:
+    global _registry_data
+    if _registry_data is not None:
+        return _registry_data
+
+    from backend.mytools.catalog_snapshot import (
+        compute_checksum, load_snapshot, save_snapshot, snapshot_enabled,
+    )
+
+    if not snapshot_enabled():
+        _registry_data = build_registry_data()
+        return _registry_data
+
+    checksum = compute_checksum()
+    data = load_snapshot(checksum)
+    if data is None:
+        data = build_registry_data()
+        try:
+            save_snapshot(data, checksum)
+        except OSError as e:
+            print(f"Could not write node snapshot: {e}")
+
+    _registry_data = data
+    return _registry_data
+
+def get_catalog() -> NodeCatalog:
+    return get_registry_data().catalog
+
+def get_registry_index() -> RegistrySearchIndex:
+    """Search index over curated nodes plus the catalog"""
+    return get_registry_data().index
+
+def _catalog_node(row: int) -> RegistryNode:
+    catalog = get_catalog()
+    codex = catalog.codex(row)
+    return RegistryNode(
+        **catalog.record(row),
+        category=_catalog_category(catalog, row),
+        codex=NodeCodex(*codex) if codex else None,
+    )
+
+def get_node(node_id: str) -> Optional[RegistryNode]:
+    """Curated node for node_id, else the catalog node, else None"""
+    node = NODE_BY_ID.get(node_id)
+    if node:
+        return node
+    row = get_catalog().row_by_key.get(node_id)
+    return _catalog_node(row) if row is not None else None
+
+def get_catalog_node(node_id: str) -> Optional[RegistryNode]:
+    """Catalog node only; curated entries carry placeholder inputs/outputs"""
+    row = get_catalog().row_by_key.get(node_id)
+    return _catalog_node(row) if row is not None else None
+
+def _materialize(ref: Union[str, int]) -> RegistryNode:
+    return _catalog_node(ref) if isinstance(ref, int) else NODE_BY_KEY[ref]
+
+def _ref_category(data: RegistryData, ref: Union[str, int]) -> str:
+    return _catalog_category(data.catalog, ref) if isinstance(ref, int) else NODE_BY_KEY[ref].category
+
+def search_registry(
+    keyword: str,
+    limit: Optional[int] = None,
+    tokens: Optional[Sequence[str]] = None,
+    category: Optional[str] = None,
+) -> List[RegistryNode]:
+    """
+    Ranked search by keyword(s) over name, purpose, category, node_id and description.
+    Pass `tokens` (e.g. PromptFeatures.search_tokens) to skip tokenizing keyword again.
+    With `category` only nodes of that category are returned (and materialized).
+    """
+    data = get_registry_data()
+    index_limit = None if category else limit
+    ranked = data.index.search(keyword, index_limit) if tokens is None else data.index.search_tokens(tokens, index_limit)
+    refs = (data.refs[i] for i, _ in ranked)
+    if category:
+        refs = (ref for ref in refs if _ref_category(data, ref) == category)
+    return [_materialize(ref) for ref in islice(refs, limit)]
+
+def _select_nodes(
+    curated: Callable[[RegistryNode], bool],
+    catalog_row: Callable[[NodeCatalog, int], bool],
+) -> List[RegistryNode]:
+    """Curated nodes, then catalog nodes, matching on columns before materializing"""
+    catalog = get_catalog()
+    nodes = [node for node in NODE_REGISTRY if curated(node)]
+    nodes.extend(
+        _catalog_node(row)
+        for key, row in catalog.row_by_key.items()
+        if key not in NODE_BY_KEY and catalog_row(catalog, row)
+    )
+    return nodes
 
 def get_nodes_by_category(category: str) -> List[RegistryNode]:
     """Get all nodes in a specific category"""
-    return [node for node in NODE_REGISTRY if node.category == category]
+    return _select_nodes(
+        lambda node: node.category == category,
+        lambda catalog, row: _catalog_category(catalog, row) == category,
+    )
 
 def get_nodes_by_group(group: str) -> List[RegistryNode]:
     """Get nodes by n8n group (trigger, transform, etc)"""
-    return [node for node in NODE_REGISTRY if group in node.group]
+    return _select_nodes(
+        lambda node: group in node.group,
+        lambda catalog, row: group in catalog.groups.get(row),
+    )
 
 def get_nodes_by_codex_category(codex_category: str) -> List[RegistryNode]:
     """Get nodes by codex category (AI, Marketing, etc)"""
-    return [
-        node for node in NODE_REGISTRY 
-        if node.codex and codex_category in node.codex.categories
-    ]
+    return _select_nodes(
+        lambda node: bool(node.codex) and codex_category in node.codex.categories,
+        lambda catalog, row: codex_category in catalog.codex_categories.get(row),
+    )
 
 def get_ai_nodes() -> List[RegistryNode]:
     """Get all AI/LLM nodes"""
@@ -462,31 +643,11 @@ def get_trigger_nodes() -> List[RegistryNode]:
 
 def suggest_nodes(task_description: str) -> List[RegistryNode]:
     """Suggest relevant nodes based on task description"""
-    keywords = task_description.lower().split()
-    scored_nodes = []
-    
-    for node in NODE_REGISTRY:
-        score = 0
-        searchable = f"{node.name} {node.display_name} {node.purpose} {node.description} {node.category}".lower()
-        
-        # Add codex categories to search
-        if node.codex:
-            searchable += " " + " ".join(node.codex.categories).lower()
-        
-        for keyword in keywords:
-            if keyword in searchable:
-                score += 1
-        
-        if score > 0:
-            scored_nodes.append((score, node))
-    
-    # Sort by score descending
-    scored_nodes.sort(reverse=True, key=lambda x: x[0])
-    return [node for score, node in scored_nodes[:10]]
+    return search_registry(task_description, limit=10)
 
 def get_node_documentation(node_id: str) -> Dict[str, Any]:
     """Get documentation URLs for a node"""
-    node = NODE_BY_ID.get(node_id)
+    node = get_node(node_id)
     if not node or not node.codex:
         return {"primary": [], "credentials": []}
     
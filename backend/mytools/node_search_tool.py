@@ -5,7 +5,7 @@ from pydantic import BaseModel, ValidationError as PydanticValidationError
 
 from backend.utills.stream_processor import BuilderToolBase
 from backend.error import ValidationError, ToolExecutionError
-from backend.mytools.engine.node_search_engine import NodeSearchEngine
+from backend.mytools.engine.node_search_engine import get_node_search_engine
     
 from backend.mytools.helpers.progress import createProgressReporter, createBatchProgressReporter
 from backend.mytools.helpers.response import create_success_response, create_error_response         
@@ -28,6 +28,9 @@ NODE_SEARCH_TOOL: BuilderToolBase = {
 
 SEARCH_LIMIT = 5
 def create_node_search_tool(node_types: List[Dict[str, Any]]):
+
+    # Built once per catalog version and shared across tool calls
+    engine = get_node_search_engine(node_types)
  
     def tool(**kwargs):
         input_data = NodeSearchSchema(**kwargs)
@@ -40,24 +43,28 @@ def create_node_search_tool(node_types: List[Dict[str, Any]]):
         config: Dict[str, Any] = {}
 
         reporter = createProgressReporter(
-            config,
             NODE_SEARCH_TOOL["toolName"],
             NODE_SEARCH_TOOL["displayTitle"],
+            config,
         )
 
         try:
             reporter.start(input_data.dict())
 
-            engine = NodeSearchEngine(node_types)
-
             batch = createBatchProgressReporter(reporter, "Searching nodes")
             batch.init(len(input_data.queries))
 
             all_results = []
 
+            # all name queries are answered in one shared pass
+            name_results = engine.search_by_names(
+                [q.query or "" for q in input_data.queries if q.queryType == "name"],
+                SEARCH_LIMIT,
+            )
+
             for q in input_data.queries:
                 if q.queryType == "name":
-                    results = engine.search_by_name(q.query or "", SEARCH_LIMIT)
+                    results = name_results[q.query or ""]
                     identifier = q.query or ""
                 else:
                     results = engine.search_by_connection_type(
@@ -1,9 +1,117 @@
 # File: backend/mytools/parse_best_practices.py
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Iterable, List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel
 import re
-from dataclasses import dataclass, field
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field, replace
+
+from backend.mytools.best_practices.index import documentation
+
+
+# ===== Precompiled patterns =====
+
+_CRITICAL_RE = re.compile(r'CRITICAL:(.*?)(?=\n\n|\n[A-Z]|$)', re.DOTALL | re.IGNORECASE)
+
+# ### Node Name (@package.nodeId) and **Node Name** (package.nodeId):
+_NODE_HEADER_PATTERNS = (
+    re.compile(r'###\s+(.+?)\s+\((@?[\w/-]+\.[\w]+)\)'),
+    re.compile(r'\*\*(.+?)\*\*\s+\((@?[\w/-]+\.[\w]+)\):'),
+)
+_LIST_NODE_RE = re.compile(r'-\s+(.+?)\s+\((@?[\w/-]+\.[\w]+)\)')
+
+_PURPOSE_RE = re.compile(
+    r'Purpose:\s*(.+?)(?=\n\n|\nPitfalls:|\nUse cases?:|\n[A-Z][a-z]+:|###|\*\*[A-Z]|$)',
+    re.DOTALL | re.IGNORECASE,
+)
+_BULLET_PURPOSE_RE = re.compile(r'-\s+Purpose:\s*(.+?)(?=\n|$)', re.IGNORECASE)
+_BULLET_OR_LABEL_RE = re.compile(r'^[\-\*]|^[A-Z][a-z]+:')
+_PITFALLS_RE = re.compile(
+    r'Pitfalls?:\s*\n((?:(?:\s*-\s*.+\n?)+|(?:(?!\n\n|###).)+)+)',
+    re.IGNORECASE | re.DOTALL,
+)
+_EXAMPLE_RE = re.compile(r'(?:For example|Example):\s*(.+?)(?=\n\n|$)', re.DOTALL | re.IGNORECASE)
+_ALTERNATIVE_PATTERNS = (
+    re.compile(r'rather than\s+([^,.]+)', re.IGNORECASE),
+    re.compile(r'instead of\s+([^,.]+)', re.IGNORECASE),
+    re.compile(r'over\s+([^,.]+?)(?:\s+(?:for|node))', re.IGNORECASE),
+    re.compile(r'alternative(?:s)?:\s*([^.]+)', re.IGNORECASE),
+)
+_NODE_SUFFIX_RE = re.compile(r'\s+node[s]?$', re.IGNORECASE)
+
+# "Example pattern:" / "Pattern:" blocks; the label is located first and the
+# block body matched from its colon
+_PATTERN_LABEL_RE = re.compile(r'pattern:', re.IGNORECASE)
+_PATTERN_BODY_RE = re.compile(r':\s*\n((?:.*?→.*?\n?)+)', re.IGNORECASE)
+_PATTERN_BRACKETS_RE = re.compile(r'[\[\]\(\)]')
+_PATTERN_NODE_RE = re.compile(r'([A-Za-z][\w\s]+?)(?:\s*(?:via|node|through)|$)')
+
+
+def _find_all(text: str, token: str) -> List[int]:
+    """Start offsets of every (possibly overlapping) occurrence of token"""
+    positions = []
+    pos = text.find(token)
+    while pos != -1:
+        positions.append(pos)
+        pos = text.find(token, pos + 1)
+    return positions
+
+
+class SectionIndex:
+    """
+    Section offsets of a best practices text, collected once up front so
+    extractors can bound their work without rescanning the text:
+
+    - node_breaks: the newline before every line starting with '###' or
+      '**X', where a recommended node's section ends
+    - hash_marks: every '##' occurrence, where general guideline sections
+      start and end
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.node_breaks: List[int] = sorted(
+            _find_all(text, '\n###')
+            + [pos for pos in _find_all(text, '\n**') if 'A' <= text[pos + 3:pos + 4] <= 'Z']
+        )
+        self.hash_marks: List[int] = _find_all(text, '##')
+
+    def node_section_end(self, start: int) -> int:
+        """End of the node section that starts at `start`"""
+        i = bisect_left(self.node_breaks, start)
+        return self.node_breaks[i] if i < len(self.node_breaks) else len(self.text)
+
+    def next_hash_mark(self, start: int) -> int:
+        i = bisect_left(self.hash_marks, start)
+        return self.hash_marks[i] if i < len(self.hash_marks) else len(self.text)
+
+    def headed_sections(self) -> Iterable[Tuple[str, str]]:
+        """
+        (title, content) of every '## Title\\n\\ncontent' section. The content
+        runs up to the next '##'; a title with empty content extends to the
+        next blank line, as the original section regex did.
+        """
+        text = self.text
+        length = len(text)
+        resume = 0
+
+        for mark in self.hash_marks:
+            title_start = mark + 2
+            if mark < resume or title_start >= length or not text[title_start].isspace():
+                continue
+            while title_start < length and text[title_start].isspace():
+                title_start += 1
+
+            title_end = text.find('\n\n', title_start + 1)
+            while title_end != -1:
+                content_start = title_end + 2
+                content_end = self.next_hash_mark(content_start)
+                if content_end > content_start:
+                    yield text[title_start:title_end], text[content_start:content_end]
+                    resume = content_end
+                    break
+                title_end = text.find('\n\n', title_end + 1)
 
 
 @dataclass
@@ -39,7 +147,7 @@ class BestPracticeParser:
     - Critical instructions
     """
     
-    def __init__(self, best_practices_text: str):
+    def __init__(self, best_practices_text: str, parse: bool = True):
         self.text = best_practices_text
         self.nodes: List[NodeInfo] = []
         self.patterns: List[WorkflowPattern] = []
@@ -47,11 +155,14 @@ class BestPracticeParser:
         self.general_guidelines: List[str] = []
         self.input_connections: List[str]= []
         self.output_connections: List[str]= []
+        self.index: Optional[SectionIndex] = None
         
-        self._parse()
+        if parse:
+            self._parse()
     
     def _parse(self):
         """Main parsing logic"""
+        self.index = SectionIndex(self.text)
         self._extract_critical_instructions()
         self._extract_recommended_nodes()
         self._extract_workflow_patterns()
@@ -60,10 +171,7 @@ class BestPracticeParser:
     
     def _extract_critical_instructions(self):
         """Extract CRITICAL marked instructions"""
-        critical_pattern = r'CRITICAL:(.*?)(?=\n\n|\n[A-Z]|$)'
-        matches = re.findall(critical_pattern, self.text, re.DOTALL | re.IGNORECASE)
-        
-        for match in matches:
+        for match in _CRITICAL_RE.findall(self.text):
             instruction = match.strip()
             if instruction:
                 self.critical_instructions.append(instruction)
@@ -71,18 +179,11 @@ class BestPracticeParser:
     def _extract_recommended_nodes(self):
         """Extract node information from Recommended Nodes section"""
         
-        # Pattern 1: Nodes with full IDs like @n8n/n8n-nodes-langchain.chatTrigger
-        # Pattern: ### Node Name (@package.nodeId) or (package.nodeId)
-        # Also match **Node Name** (package.nodeId): for inline bold nodes
-        node_patterns = [
-            r'###\s+(.+?)\s+\((@?[\w/-]+\.[\w]+)\)',  # Header format
-            r'\*\*(.+?)\*\*\s+\((@?[\w/-]+\.[\w]+)\):',  # Bold inline format
-        ]
-        
-        for pattern in node_patterns:
-            node_matches = re.finditer(pattern, self.text)
-            
-            for match in node_matches:
+        # Nodes with full IDs like @n8n/n8n-nodes-langchain.chatTrigger, either
+        # as ### Node Name (@package.nodeId) headers or as inline bold
+        # **Node Name** (package.nodeId): entries
+        for pattern in _NODE_HEADER_PATTERNS:
+            for match in pattern.finditer(self.text):
                 node_name = match.group(1).strip()
                 node_id = match.group(2).strip()
                 
@@ -92,9 +193,7 @@ class BestPracticeParser:
                 
                 # Get the section text after this node (until next ### or end)
                 start_pos = match.end()
-                next_section = re.search(r'\n(?:###|\*\*[A-Z])', self.text[start_pos:])
-                end_pos = start_pos + next_section.start() if next_section else len(self.text)
-                section_text = self.text[start_pos:end_pos]
+                section_text = self.text[start_pos:self.index.node_section_end(start_pos)]
                 
                 # Extract purpose
                 purpose = self._extract_purpose(section_text)
@@ -129,11 +228,7 @@ class BestPracticeParser:
     def _extract_list_nodes(self):
         """Extract nodes from bulleted lists with IDs"""
         # Pattern: - Node Name (package.nodeId)
-        list_pattern = r'-\s+(.+?)\s+\((@?[\w/-]+\.[\w]+)\)'
-        
-        list_matches = re.finditer(list_pattern, self.text)
-        
-        for match in list_matches:
+        for match in _LIST_NODE_RE.finditer(self.text):
             node_name = match.group(1).strip()
             node_id = match.group(2).strip()
             
@@ -161,8 +256,7 @@ class BestPracticeParser:
     def _extract_purpose(self, section_text: str) -> str:
         """Extract purpose from node section"""
         # Pattern 1: Explicit "Purpose:" label
-        purpose_match = re.search(r'Purpose:\s*(.+?)(?=\n\n|\nPitfalls:|\nUse cases?:|\n[A-Z][a-z]+:|###|\*\*[A-Z]|$)', 
-                                  section_text, re.DOTALL | re.IGNORECASE)
+        purpose_match = _PURPOSE_RE.search(section_text)
         if purpose_match:
             purpose = purpose_match.group(1).strip()
             # Clean up multi-line purposes
@@ -170,7 +264,7 @@ class BestPracticeParser:
             return purpose
         
         # Pattern 2: Text right after "- Purpose:" in bullet points
-        bullet_purpose = re.search(r'-\s+Purpose:\s*(.+?)(?=\n|$)', section_text, re.IGNORECASE)
+        bullet_purpose = _BULLET_PURPOSE_RE.search(section_text)
         if bullet_purpose:
             return bullet_purpose.group(1).strip()
         
@@ -181,7 +275,7 @@ class BestPracticeParser:
             # Skip empty lines, headers, and labels
             if line and not line.startswith('#') and not line.startswith('Purpose:') and not line.startswith('Pitfalls:'):
                 # If it's not a bullet point or label, use it
-                if not re.match(r'^[\-\*]|^[A-Z][a-z]+:', line):
+                if not _BULLET_OR_LABEL_RE.match(line):
                     return line
         
         return "No purpose specified"
@@ -204,8 +298,7 @@ class BestPracticeParser:
         pitfalls = []
         
         # Look for Pitfalls section - now handles multi-line bullets
-        pitfalls_match = re.search(r'Pitfalls?:\s*\n((?:(?:\s*-\s*.+\n?)+|(?:(?!\n\n|###).)+)+)', 
-                                   section_text, re.IGNORECASE | re.DOTALL)
+        pitfalls_match = _PITFALLS_RE.search(section_text)
         if pitfalls_match:
             pitfall_text = pitfalls_match.group(1).strip()
             
@@ -237,10 +330,7 @@ class BestPracticeParser:
         use_cases = []
         
         # Look for "For example" or "Example:"
-        example_pattern = r'(?:For example|Example):\s*(.+?)(?=\n\n|$)'
-        matches = re.findall(example_pattern, section_text, re.DOTALL | re.IGNORECASE)
-        
-        for match in matches:
+        for match in _EXAMPLE_RE.findall(section_text):
             use_cases.append(match.strip())
         
         return use_cases
@@ -250,20 +340,12 @@ class BestPracticeParser:
         alternatives = []
         
         # Look for "rather than", "instead of", "over"
-        alt_patterns = [
-            r'rather than\s+([^,.]+)',
-            r'instead of\s+([^,.]+)',
-            r'over\s+([^,.]+?)(?:\s+(?:for|node))',
-            r'alternative(?:s)?:\s*([^.]+)'
-        ]
-        
-        for pattern in alt_patterns:
-            matches = re.findall(pattern, section_text, re.IGNORECASE)
-            for match in matches:
+        for pattern in _ALTERNATIVE_PATTERNS:
+            for match in pattern.findall(section_text):
                 # Clean up the match
                 alt = match.strip()
                 # Remove common suffixes
-                alt = re.sub(r'\s+node[s]?$', '', alt, flags=re.IGNORECASE)
+                alt = _NODE_SUFFIX_RE.sub('', alt)
                 if alt and alt != node_name:
                     alternatives.append(alt)
         
@@ -273,7 +355,6 @@ class BestPracticeParser:
         """Determine node category based on name, ID, and context"""
         name_lower = node_name.lower()
         id_lower = node_id.lower()
-        context_lower = context.lower()
         
         # Trigger nodes
         if 'trigger' in name_lower or 'trigger' in id_lower:
@@ -306,10 +387,15 @@ class BestPracticeParser:
         """Extract example workflow patterns"""
         
         # Look for example patterns with arrows
-        pattern_regex = r'(?:Example pattern|Pattern):\s*\n((?:.*?→.*?\n?)+)'
-        matches = re.finditer(pattern_regex, self.text, re.IGNORECASE)
-        
-        for match in matches:
+        resume = 0
+        for label in _PATTERN_LABEL_RE.finditer(self.text):
+            if label.start() < resume:
+                continue
+            match = _PATTERN_BODY_RE.match(self.text, label.end() - 1)
+            if not match:
+                continue
+            resume = match.end()
+
             pattern_text = match.group(1).strip()
             lines = pattern_text.split('\n')
             
@@ -338,9 +424,9 @@ class BestPracticeParser:
         for part in parts:
             part = part.strip()
             # Remove brackets and other markers
-            part = re.sub(r'[\[\]\(\)]', '', part)
+            part = _PATTERN_BRACKETS_RE.sub('', part)
             # Take first meaningful word/phrase
-            node_match = re.search(r'([A-Za-z][\w\s]+?)(?:\s*(?:via|node|through)|$)', part)
+            node_match = _PATTERN_NODE_RE.search(part)
             if node_match:
                 nodes.append(node_match.group(1).strip())
         
@@ -350,12 +436,9 @@ class BestPracticeParser:
         """Extract general guidelines from sections"""
         
         # Extract from sections like "Workflow Design", "Context Management", etc.
-        section_pattern = r'##\s+(.+?)\n\n((?:(?!##).)+)'
-        matches = re.finditer(section_pattern, self.text, re.DOTALL)
-        
-        for match in matches:
-            section_name = match.group(1).strip()
-            section_content = match.group(2).strip()
+        for section_name, section_content in self.index.headed_sections():
+            section_name = section_name.strip()
+            section_content = section_content.strip()
             
             # Skip "Recommended Nodes" section as we handle that separately
             if 'recommended nodes' in section_name.lower():
@@ -477,4 +560,95 @@ class BestPracticeParser:
 # Helper function for easy use
 def parse_best_practices(text: str) -> BestPracticeParser:
     """Parse best practices text and return parser instance"""
-    return BestPracticeParser(text)
\ No newline at end of file
+    return BestPracticeParser(text)
+
+
+# ===== Cached parses per technique =====
+# Best practice documents are static per deploy, so each one is parsed once
+# per (technique, version) and requests merge the cached results.
+
+@dataclass(frozen=True)
+class ParsedBestPractices:
+    """Immutable parse result of one BestPracticesDocument"""
+    technique: str
+    version: str
+    text: str
+    nodes: Tuple[NodeInfo, ...]
+    patterns: Tuple[WorkflowPattern, ...]
+    critical_instructions: Tuple[str, ...]
+    general_guidelines: Tuple[str, ...]
+
+
+_parsed_documents: Dict[Tuple[str, str], ParsedBestPractices] = {}
+_parsed_documents_lock = threading.Lock()
+
+
+def get_parsed_best_practices(technique) -> Optional[ParsedBestPractices]:
+    """Cached parse of the documentation for one technique"""
+    doc = documentation.get(technique)
+    if not doc:
+        return None
+
+    key = (getattr(doc.technique, "value", str(doc.technique)), doc.version)
+    parsed = _parsed_documents.get(key)
+    if parsed is None:
+        text = doc.get_documentation()
+        parser = BestPracticeParser(text)
+        parsed = ParsedBestPractices(
+            technique=key[0],
+            version=key[1],
+            text=text,
+            nodes=tuple(parser.nodes),
+            patterns=tuple(parser.patterns),
+            critical_instructions=tuple(parser.critical_instructions),
+            general_guidelines=tuple(parser.general_guidelines),
+        )
+        with _parsed_documents_lock:
+            parsed = _parsed_documents.setdefault(key, parsed)
+    return parsed
+
+
+def _copy_node(node: NodeInfo) -> NodeInfo:
+    return replace(
+        node,
+        pitfalls=list(node.pitfalls),
+        alternatives=list(node.alternatives),
+        use_cases=list(node.use_cases),
+        input_connections=[],
+        output_connections=[],
+    )
+
+
+def parse_best_practices_for_techniques(techniques: Iterable) -> BestPracticeParser:
+    """
+    Same shape as parse_best_practices(format_best_practices(techniques)),
+    built from cached per-document parses. Nodes are fresh copies, so callers
+    may mutate them.
+
+    For one technique the result equals the single-document parse, except
+    that the last general guideline no longer ends in the </best_practices>
+    wrapper. With several techniques it differs on purpose:
+    - nodes come document by document, each in its own parse order, where
+      the merged-text parse listed every document's header nodes before any
+      inline or list nodes;
+    - _assign_connections chains nodes in that order, so each document's
+      nodes stay connected to each other and the last node of one document
+      feeds the first node of the next;
+    - node sections, purposes and guidelines no longer run into the
+      following document.
+    """
+    parts = [p for p in (get_parsed_best_practices(t) for t in techniques) if p]
+
+    text = ""
+    if parts:
+        text = "\n".join(["<best_practices>", "\n---\n".join(p.text for p in parts), "</best_practices>"])
+
+    parser = BestPracticeParser(text, parse=False)
+    for part in parts:
+        parser.nodes.extend(_copy_node(node) for node in part.nodes)
+        parser.patterns.extend(part.patterns)
+        parser.critical_instructions.extend(part.critical_instructions)
+        parser.general_guidelines.extend(part.general_guidelines)
+    parser._assign_connections()
+
+    return parser
@@ -7,8 +7,11 @@ from backend.mytools.node_registry import (
     search_registry, 
     get_nodes_by_category,
     format_node_for_api,
+    is_integration_node,
     RegistryNode
 )
+from backend.mytypes.prompt_features import PromptFeatures, extract_prompt_features
+from backend.utills.keyword_matcher import KeywordHits, register_keywords
 
 @dataclass
 class WorkflowRequirements:
@@ -22,110 +25,99 @@ class WorkflowRequirements:
     raw_intent: str
 
 
-def analyze_workflow_requirements(user_intent: str) -> WorkflowRequirements:
-    """Enhanced intent analysis with comprehensive keyword detection"""
-    intent_lower = user_intent.lower()
-    
-    # === TRIGGER DETECTION ===
-    trigger_keywords = []
-    
-    if any(w in intent_lower for w in ["webhook", "receive", "incoming", "listen", "api call", "http post", "http get"]):
-        trigger_keywords.append("webhook")
-    
-    if any(w in intent_lower for w in ["schedule", "daily", "weekly", "hourly", "every", "cron", "periodic", "regularly", "automated"]):
-        trigger_keywords.append("schedule")
-    
-    if any(w in intent_lower for w in ["chat", "message", "bot", "conversation", "chatbot", "ask", "answer"]):
-        trigger_keywords.append("chat")
-    
-    if any(w in intent_lower for w in ["email received", "new email", "inbox", "when email"]):
-        trigger_keywords.append("email")
-    
-    if any(w in intent_lower for w in ["form", "submission", "submit", "input"]):
-        trigger_keywords.append("form")
-    
-    if not trigger_keywords or any(w in intent_lower for w in ["create", "generate", "build", "make"]):
-        trigger_keywords.insert(0, "manual")
-    
-    # === ACTION KEYWORDS ===
-    action_keywords = []
-    
+# ===== Intent keyword tables =====
+# Each entry maps a requirement to the words that signal it; entries are
+# checked in order, so the order here is the order requirements are reported.
+
+TRIGGER_KEYWORDS: Dict[str, List[str]] = {
+    "webhook": ["webhook", "receive", "incoming", "listen", "api call", "http post", "http get"],
+    "schedule": ["schedule", "daily", "weekly", "hourly", "every", "cron", "periodic", "regularly", "automated"],
+    "chat": ["chat", "message", "bot", "conversation", "chatbot", "ask", "answer"],
+    "email": ["email received", "new email", "inbox", "when email"],
+    "form": ["form", "submission", "submit", "input"],
+}
+
+# A manual trigger is added first when nothing else triggers the workflow or
+# the user asks to build something on demand
+MANUAL_TRIGGER_KEYWORDS = ["create", "generate", "build", "make"]
+
+ACTION_KEYWORDS: Dict[str, List[str]] = {
     # Communication
-    if any(w in intent_lower for w in ["send email", "email", "mail"]):
-        action_keywords.append("email")
-    if any(w in intent_lower for w in ["slack", "post to slack"]):
-        action_keywords.append("slack")
-    if any(w in intent_lower for w in ["telegram"]):
-        action_keywords.append("telegram")
-    
+    "email": ["send email", "email", "mail"],
+    "slack": ["slack", "post to slack"],
+    "telegram": ["telegram"],
     # Data sources
-    if any(w in intent_lower for w in ["youtube", "video"]):
-        action_keywords.append("youtube")
-    if any(w in intent_lower for w in ["scrape", "crawl", "extract from web", "web data"]):
-        action_keywords.append("scraping")
-    if any(w in intent_lower for w in ["fetch", "get data", "download", "retrieve", "api"]):
-        action_keywords.append("http")
-    
+    "youtube": ["youtube", "video"],
+    "scraping": ["scrape", "crawl", "extract from web", "web data"],
+    "http": ["fetch", "get data", "download", "retrieve", "api"],
     # Data storage
-    if any(w in intent_lower for w in ["sheets", "spreadsheet", "google sheets", "excel"]):
-        action_keywords.append("sheets")
-    if any(w in intent_lower for w in ["database", "postgres", "mysql", "sql", "db", "store in"]):
-        action_keywords.append("database")
-    
+    "sheets": ["sheets", "spreadsheet", "google sheets", "excel"],
+    "database": ["database", "postgres", "mysql", "sql", "db", "store in"],
     # AI/LLM
-    if any(w in intent_lower for w in ["generate", "create content", "ai", "llm", "claude", "gpt", "write", "compose", "summarize"]):
-        action_keywords.append("ai")
-    
-    # === PROCESSING KEYWORDS ===
-    processing_keywords = []
-    
-    if any(w in intent_lower for w in ["extract", "parse", "get from", "pull out"]):
-        processing_keywords.append("extract")
-    if any(w in intent_lower for w in ["transform", "modify", "change", "format", "convert", "set", "edit", "compose", "append", "update", "prepare"]):
-        processing_keywords.append("transform")
-    if any(w in intent_lower for w in ["if", "when", "condition", "check", "filter"]):
-        processing_keywords.append("condition")
-    if any(w in intent_lower for w in ["reply", "respond", "answer", "send back"]):
-        processing_keywords.append("respond")
-    
-    # === DATA & PLATFORM KEYWORDS ===
-    data_keywords = []
-    if any(w in intent_lower for w in ["json", "data structure", "object"]):
-        data_keywords.append("json")
-    if any(w in intent_lower for w in ["csv", "spreadsheet data"]):
-        data_keywords.append("csv")
-    
-    integration_keywords = []
-    if any(w in intent_lower for w in ["integrate", "connect", "sync", "push to", "send to"]):
-        integration_keywords.append("integration")
-    
-    platform_keywords = []
-    platforms = {
-        "youtube": ["youtube", "video"],
-        "slack": ["slack"],
-        "telegram": ["telegram"],
-        "email": ["email", "gmail", "smtp"],
-        "sheets": ["sheets", "spreadsheet", "google sheets"],
-        "claude": ["claude", "anthropic"],
-        "openai": ["openai", "gpt", "chatgpt"],
-        "gemini": ["gemini", "google ai"],
-    }
+    "ai": ["generate", "create content", "ai", "llm", "claude", "gpt", "write", "compose", "summarize"],
+}
+
+PROCESSING_KEYWORDS: Dict[str, List[str]] = {
+    "extract": ["extract", "parse", "get from", "pull out"],
+    "transform": ["transform", "modify", "change", "format", "convert", "set", "edit", "compose", "append", "update", "prepare"],
+    "condition": ["if", "when", "condition", "check", "filter"],
+    "respond": ["reply", "respond", "answer", "send back"],
+}
+
+DATA_KEYWORDS: Dict[str, List[str]] = {
+    "json": ["json", "data structure", "object"],
+    "csv": ["csv", "spreadsheet data"],
+}
+
+INTEGRATION_KEYWORDS: Dict[str, List[str]] = {
+    "integration": ["integrate", "connect", "sync", "push to", "send to"],
+}
+
+_INTENT_TABLES = [
+    TRIGGER_KEYWORDS, ACTION_KEYWORDS, PROCESSING_KEYWORDS,
+    DATA_KEYWORDS, INTEGRATION_KEYWORDS,
+]
+register_keywords(MANUAL_TRIGGER_KEYWORDS, *(words for table in _INTENT_TABLES for words in table.values()))
+
+
+def _matching_requirements(hits: KeywordHits, table: Dict[str, List[str]]) -> List[str]:
+    return [name for name, words in table.items() if hits.any(words)]
+
+
+def analyze_workflow_requirements(
+    user_intent: str,
+    features: Optional[PromptFeatures] = None,
+) -> WorkflowRequirements:
+    """Enhanced intent analysis with comprehensive keyword detection"""
+    features = features or extract_prompt_features(user_intent)
+    hits = features.hits
     
-    for platform, keywords in platforms.items():
-        if any(k in intent_lower for k in keywords):
-            platform_keywords.append(platform)
+    # === TRIGGER DETECTION ===
+    trigger_keywords = _matching_requirements(hits, TRIGGER_KEYWORDS)
+    if not trigger_keywords or hits.any(MANUAL_TRIGGER_KEYWORDS):
+        trigger_keywords.insert(0, "manual")
     
     return WorkflowRequirements(
         trigger_keywords=trigger_keywords,
-        action_keywords=action_keywords,
-        processing_keywords=processing_keywords,
-        platform_keywords=platform_keywords,
-        data_keywords=data_keywords,
-        integration_keywords=integration_keywords,
+        action_keywords=_matching_requirements(hits, ACTION_KEYWORDS),
+        processing_keywords=_matching_requirements(hits, PROCESSING_KEYWORDS),
+        platform_keywords=list(features.platforms),
+        data_keywords=_matching_requirements(hits, DATA_KEYWORDS),
+        integration_keywords=_matching_requirements(hits, INTEGRATION_KEYWORDS),
         raw_intent=user_intent
     )
 
 
+# top search results checked when a node is picked by its name
+NAME_MATCH_CANDIDATES = 10
+
+
+def _vendor_named(node: RegistryNode, user_intent: str) -> bool:
+    """Whether the prompt names the service of an integration node ("Typeform Trigger" -> "typeform")"""
+    vendor = node.display_name.lower().removesuffix(" trigger").strip()
+    return bool(vendor) and vendor in user_intent.lower()
+
+
 def select_nodes_from_registry(requirements: WorkflowRequirements) -> List[Dict[str, Any]]:
     """Enhanced node selection with full metadata"""
     selected_nodes = []
@@ -134,10 +126,15 @@ def select_nodes_from_registry(requirements: WorkflowRequirements) -> List[Dict[
     # === 1. SELECT TRIGGER ===
     trigger_node = None
     for trigger_kw in requirements.trigger_keywords:
-        candidates = search_registry(trigger_kw)
-        trigger_candidates = [n for n in candidates if n.category == "trigger"]
-        if trigger_candidates:
-            trigger_node = trigger_candidates[0]
+        # a generic "form" or "email" trigger must not pick some vendor's trigger
+        trigger_node = next(
+            (
+                node for node in search_registry(trigger_kw, limit=NAME_MATCH_CANDIDATES, category="trigger")
+                if not is_integration_node(node) or _vendor_named(node, requirements.raw_intent)
+            ),
+            None,
+        )
+        if trigger_node:
             break
     
     if trigger_node:
@@ -151,7 +148,7 @@ def select_nodes_from_registry(requirements: WorkflowRequirements) -> List[Dict[
     if ("http" in requirements.action_keywords or 
         "scraping" in requirements.action_keywords):
         
-        http_nodes = search_registry("http request")
+        http_nodes = search_registry("http request", limit=1)
         if http_nodes and http_nodes[0].node_id not in used_ids:
             node = http_nodes[0]
             node_data = format_node_for_api(node)
@@ -164,8 +161,9 @@ def select_nodes_from_registry(requirements: WorkflowRequirements) -> List[Dict[
     if "ai" in requirements.action_keywords:
         for platform in requirements.platform_keywords:
             if platform in ["claude", "openai", "gemini"]:
-                ai_nodes = search_registry(platform)
-                ai_candidates = [n for n in ai_nodes if n.category == "ai" and n.node_id not in used_ids]
+                # enough to get past every node already used
+                ai_nodes = search_registry(platform, limit=len(used_ids) + 1, category="ai")
+                ai_candidates = [n for n in ai_nodes if n.node_id not in used_ids]
                 if ai_candidates:
                     node = ai_candidates[0]
                     node_data = format_node_for_api(node)
@@ -177,7 +175,7 @@ def select_nodes_from_registry(requirements: WorkflowRequirements) -> List[Dict[
     
     # === 4. SELECT TRANSFORM NODES ===
     if "transform" in requirements.processing_keywords:
-        transform_nodes = search_registry("set edit")
+        transform_nodes = search_registry("set edit", limit=NAME_MATCH_CANDIDATES)
         for node in transform_nodes:
             if "set" in node.name.lower() and node.node_id not in used_ids:
                 node_data = format_node_for_api(node)
@@ -189,7 +187,7 @@ def select_nodes_from_registry(requirements: WorkflowRequirements) -> List[Dict[
     
     # === 5. SELECT RESPOND NODE ===
     if "respond" in requirements.processing_keywords or "chat" in requirements.trigger_keywords:
-        respond_nodes = search_registry("respond chat")
+        respond_nodes = search_registry("respond chat", limit=NAME_MATCH_CANDIDATES)
         for node in respond_nodes:
             if "respond" in node.name.lower() and node.node_id not in used_ids:
                 node_data = format_node_for_api(node)
@@ -202,8 +200,8 @@ def select_nodes_from_registry(requirements: WorkflowRequirements) -> List[Dict[
     # === 6. SELECT OUTPUT NODES ===
     for action_kw in requirements.action_keywords:
         if action_kw in ["email", "slack", "telegram", "youtube", "sheets"]:
-            action_nodes = search_registry(action_kw)
-            for node in action_nodes[:1]:
+            action_nodes = search_registry(action_kw, limit=1)
+            for node in action_nodes:
                 if node.node_id not in used_ids and node.category == "action":
                     node_data = format_node_for_api(node)
                     node_data["is_recommended"] = True
@@ -213,11 +211,14 @@ def select_nodes_from_registry(requirements: WorkflowRequirements) -> List[Dict[
     return selected_nodes
 
 
-def generate_workflow_nodes_from_registry(user_intent: str) -> List[Dict[str, Any]]:
+def generate_workflow_nodes_from_registry(
+    user_intent: str,
+    features: Optional[PromptFeatures] = None,
+) -> List[Dict[str, Any]]:
     """Main function: Generate workflow-specific nodes using registry"""
     print(f"\n🔍 Analyzing intent: {user_intent}")
     
-    requirements = analyze_workflow_requirements(user_intent)
+    requirements = analyze_workflow_requirements(user_intent, features)
     
     print(f"   Triggers: {requirements.trigger_keywords}")
     print(f"   Actions: {requirements.action_keywords}")
@@ -0,0 +1,57 @@
+# backend/mytypes/prompt_features.py
+"""
+Normalized views of a user prompt, computed once per request.
+
+Pipeline stages used to lowercase, split and keyword-scan the same prompt on
+their own. The analyze pipeline now extracts a PromptFeatures up front and
+hands it to every stage; functions that take one still accept a bare prompt
+and extract the features themselves when called on their own.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, List, Tuple
+
+from backend.mytools.engine.registry_index import tokenize
+from backend.utills.keyword_matcher import KeywordHits, keyword_hits, register_keywords
+
+
+# Platforms a prompt can name, with the words that signal each
+PLATFORM_KEYWORDS: Dict[str, List[str]] = {
+    "youtube": ["youtube", "video"],
+    "slack": ["slack"],
+    "telegram": ["telegram"],
+    "email": ["email", "gmail", "smtp"],
+    "sheets": ["sheets", "spreadsheet", "google sheets"],
+    "claude": ["claude", "anthropic"],
+    "openai": ["openai", "gpt", "chatgpt"],
+    "gemini": ["gemini", "google ai"],
+}
+
+register_keywords(*PLATFORM_KEYWORDS.values())
+
+
+@dataclass(frozen=True)
+class PromptFeatures:
+    text: str                       # prompt as the user wrote it
+    normalized: str                 # lowercased prompt
+    tokens: Tuple[str, ...]         # whitespace tokens of the normalized prompt
+    hits: KeywordHits               # registered keywords found in the prompt
+    platforms: Tuple[str, ...]      # PLATFORM_KEYWORDS entries the prompt names
+
+    @cached_property
+    def search_tokens(self) -> Tuple[str, ...]:
+        """Registry index tokens (camelCase split, no stopwords), built on first use"""
+        return tuple(tokenize(self.text))
+
+
+def extract_prompt_features(prompt: str) -> PromptFeatures:
+    hits = keyword_hits(prompt)
+    tokens = tuple(hits.text.split())
+    return PromptFeatures(
+        text=prompt,
+        normalized=hits.text,
+        tokens=tokens,
+        hits=hits,
+        platforms=tuple(name for name, words in PLATFORM_KEYWORDS.items() if hits.any(words)),
+    )
@@ -42,6 +42,7 @@
 
 from typing import List
 from backend.mytypes.categorization import WorkflowTechnique
+from backend.utills.keyword_matcher import keyword_hits, register_keywords
 
 
 KEYWORD_TECHNIQUE_MAP = {
@@ -208,19 +209,25 @@ KEYWORD_TECHNIQUE_MAP = {
     
 }
 
+register_keywords(KEYWORD_TECHNIQUE_MAP)
+
+TECHNIQUE_BY_VALUE = {technique.value: technique for technique in WorkflowTechnique}
+
+
 def normalize_techniques(raw_techniques: List[str]) -> List[WorkflowTechnique]:
     normalized: set[WorkflowTechnique] = set()
 
     for raw in raw_techniques:
         text = raw.lower().strip()
 
-        for technique in WorkflowTechnique:
-            if text == technique.value:
+        technique = TECHNIQUE_BY_VALUE.get(text)
+        if technique:
+            normalized.add(technique)
+            continue
+
+        for keyword in keyword_hits(text).matched:
+            technique = KEYWORD_TECHNIQUE_MAP.get(keyword)
+            if technique:
                 normalized.add(technique)
-                break
-        else:
-            for keyword, technique in KEYWORD_TECHNIQUE_MAP.items():
-                if keyword in text:
-                    normalized.add(technique)
 
     return sorted(normalized, key=lambda t: t.value)
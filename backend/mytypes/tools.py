@@ -139,18 +139,11 @@ class ProgressReporter:
 #     def complete(self) -> None:
 #         ...
 
+@dataclass
 class BatchReporter:
-    def __init__(self, total: int) -> None:
-        self.total = total
-        self.current = 0
-
-    def next(self, item_description: str) -> None:
-        self.current += 1
-        # emit progress here
-
-    def complete(self) -> None:
-        # mark batch completed
-        pass
+    init: Callable[[int], None]
+    next: Callable[[str], None]
+    complete: Callable[[], None]
 
 # Tool output types
 
@@ -0,0 +1,191 @@
+
+import heapq
+from array import array
+from difflib import SequenceMatcher
+from typing import List, Dict, Any, Optional, Tuple
+
+
+def trigrams(text: str) -> List[str]:
+    """Character trigrams of a (lowercased) string"""
+    return [text[i:i + 3] for i in range(len(text) - 2)]
+
+
+def item_strings(item: Dict[str, Any], keys: List[str]) -> List[str]:
+    """Lowercased searchable strings of an item, in key order"""
+    strings: List[str] = []
+    for key in keys:
+        value = item.get(key)
+        if not value:
+            continue
+
+        # Handle list values (e.g., tags, keywords)
+        values = value if isinstance(value, list) else [value]
+        strings.extend(v.lower() for v in values if isinstance(v, str) and v)
+    return strings
+
+
+class FuzzyMatcher:
+    """
+    Precomputed fuzzy matcher over a fixed list of items.
+
+    Build once per item list, then query as often as needed. Candidate strings
+    are lowercased and turned into trigram bitsets (plain ints) up front. A
+    query is scored in three cheaper-to-dearer steps:
+
+    1. trigram overlap via bitwise AND + popcount picks the survivors,
+    2. SequenceMatcher's length and character-count upper bounds skip
+       survivors that cannot reach the current top-k,
+    3. the full SequenceMatcher ratio runs only on what is left.
+
+    Scores are the same 0-100 SequenceMatcher ratio sublimeSearch uses.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], keys: List[str]):
+        self.items = items
+        self.keys = keys
+
+        self._strings: List[str] = []
+        self._owners = array("I")
+        self._bits: List[int] = []
+        self._gram_counts = array("H")
+        self._gram_ids: Dict[str, int] = {}
+
+        for index, item in enumerate(items):
+            for text in item_strings(item, keys):
+                self._add_string(index, text)
+
+    def _add_string(self, owner: int, text: str) -> None:
+        bits = 0
+        grams = set(trigrams(text))
+        for gram in grams:
+            gram_id = self._gram_ids.setdefault(gram, len(self._gram_ids))
+            bits |= 1 << gram_id
+
+        self._strings.append(text)
+        self._owners.append(owner)
+        self._bits.append(bits)
+        self._gram_counts.append(min(len(grams), 0xFFFF))
+
+    def _query_bits(self, query: str) -> Tuple[int, int]:
+        bits = 0
+        grams = set(trigrams(query))
+        for gram in grams:
+            gram_id = self._gram_ids.get(gram)
+            if gram_id is not None:
+                bits |= 1 << gram_id
+        return bits, len(grams)
+
+    def _survivors(self, query: str, count: int) -> Optional[List[int]]:
+        """String indices with the best trigram overlap, or None to scan all"""
+        bits, gram_count = self._query_bits(query)
+        if not bits:
+            return None
+
+        overlaps = []
+        for i, candidate_bits in enumerate(self._bits):
+            shared = (bits & candidate_bits).bit_count()
+            if shared:
+                overlaps.append((2 * shared / (gram_count + self._gram_counts[i]), i))
+
+        return [i for _, i in heapq.nlargest(count, overlaps)]
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = 20,
+        min_score: float = 0.0,
+        exact: bool = False,
+        survivors: Optional[int] = None,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Top `limit` (item, score) pairs, best first; ties keep item order.
+
+        With exact=True (or limit=None) every candidate string is considered
+        and the result equals a full scan. Otherwise only the trigram
+        survivors are scored, which is what makes per-keystroke search cheap.
+        """
+        ranked = self.rank(query, limit, min_score, exact, survivors)
+        return [(self.items[index], score) for index, score in ranked]
+
+    def rank(
+        self,
+        query: str,
+        limit: Optional[int] = 20,
+        min_score: float = 0.0,
+        exact: bool = False,
+        survivors: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """search() returning (item index, score) pairs"""
+        if not query or not self._strings:
+            return []
+
+        query = query.lower()
+
+        candidates: Optional[List[int]] = None
+        if not exact and limit is not None and len(query) >= 3:
+            candidates = self._survivors(query, survivors or max(4 * limit, 50))
+        if candidates is None:
+            candidates = range(len(self._strings))
+
+        # Group candidate strings per item and visit items in order of their
+        # length-only upper bound, so the top-k threshold rises quickly and
+        # prunes the rest
+        query_length = len(query)
+
+        # same arithmetic as SequenceMatcher.ratio() so equal values compare equal
+        def length_bound(i: int) -> float:
+            length = len(self._strings[i])
+            return 2.0 * min(query_length, length) / (query_length + length) * 100
+
+        per_item: Dict[int, List[int]] = {}
+        for i in candidates:
+            per_item.setdefault(self._owners[i], []).append(i)
+
+        if limit is None:
+            # no top-k threshold to raise, every item is scored anyway
+            ordered = list(per_item.items())
+        else:
+            ordered = sorted(
+                per_item.items(),
+                key=lambda entry: (-max(length_bound(i) for i in entry[1]), entry[0]),
+            )
+
+        scored: List[Tuple[int, float]] = []
+        top: List[float] = []  # min-heap of the best `limit` item scores
+
+        def cannot_win(bound: float, kth: float, best: float) -> bool:
+            # a tie with the current k-th score may still win on item order
+            return bound < kth or bound <= min_score or bound <= best
+
+        for owner, strings in ordered:
+            kth = top[0] if limit is not None and len(top) >= limit else -1.0
+            if cannot_win(max(length_bound(i) for i in strings), kth, 0.0):
+                if kth >= 0:
+                    break
+                continue
+
+            best = 0.0
+            for i in strings:
+                if cannot_win(length_bound(i), kth, best):
+                    continue
+
+                matcher = SequenceMatcher(None, query, self._strings[i])
+                # quick_ratio only pays off when there is a score to beat
+                if (kth >= 0 or best or min_score) and cannot_win(matcher.quick_ratio() * 100, kth, best):
+                    continue
+
+                best = max(best, matcher.ratio() * 100)
+
+            if best <= min_score:
+                continue
+
+            scored.append((owner, best))
+            if limit is not None:
+                heapq.heappush(top, best)
+                if len(top) > limit:
+                    heapq.heappop(top)
+
+        scored.sort(key=lambda x: (-x[1], x[0]))
+        if limit is not None:
+            scored = scored[:limit]
+        return scored
@@ -12,6 +12,8 @@ class NodeConnectionTypes:
     AiVectorStore = "ai_vectorStore"
     AiDocument = "ai_document"
     AiTextSplitter = "ai_textSplitter"
+    AiOutputParser = "ai_outputParser"
+    AiRetriever = "ai_retriever"
     
 
     @classmethod
@@ -27,6 +29,8 @@ class NodeConnectionTypes:
             cls.AiVectorStore,
             cls.AiDocument,
             cls.AiTextSplitter,
+            cls.AiOutputParser,
+            cls.AiRetriever,
         ]
 
     @classmethod
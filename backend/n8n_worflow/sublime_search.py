@@ -1,21 +1,49 @@
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 
-from difflib import SequenceMatcher
-from typing import List, Dict, Any, Tuple
+from backend.n8n_worflow.fuzzy_matcher import FuzzyMatcher, item_strings
 
+# matchers for the item lists searched most recently
+MAX_CACHED_MATCHERS = 8
 
-def _similarity(a: str, b: str) -> float:
-    """Return similarity score between two strings (0–100)."""
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio() * 100
+# (keys, searchable strings per item) -> matcher built over them
+_matchers: "OrderedDict[Tuple[Tuple[str, ...], Tuple[Tuple[str, ...], ...]], FuzzyMatcher]" = OrderedDict()
+
+
+def get_matcher(items: List[Dict[str, Any]], keys: List[str]) -> FuzzyMatcher:
+    """
+    FuzzyMatcher over the searchable strings of items, reused for any list
+    with the same strings in the same order. The cache is keyed on content,
+    so lists edited in place get a new matcher. Use the matcher's rank() and
+    map indices back to your own list; its items are those it was built from.
+    """
+    cache_key = (tuple(keys), tuple(tuple(item_strings(item, keys)) for item in items))
+    matcher = _matchers.get(cache_key)
+    if matcher is None:
+        matcher = FuzzyMatcher(items, keys)
+    _matchers[cache_key] = matcher
+    _matchers.move_to_end(cache_key)
+    while len(_matchers) > MAX_CACHED_MATCHERS:
+        _matchers.popitem(last=False)
+    return matcher
 
 
 def sublimeSearch(
     query: str,
     items: List[Dict[str, Any]],
     keys: List[str],
+    limit: Optional[int] = None,
+    exact: bool = True,
 ) -> List[Tuple[Dict[str, Any], float]]:
     """
     Fuzzy search implementation similar to sublimeSearch in TS
 
+    By default every item is scored and the result equals the original full
+    scan; that costs about the same as before. For per-keystroke search pass
+    `limit` with exact=False: only the items sharing the most trigrams with
+    the query are scored, which can miss a weak match the full scan finds.
+    Callers searching one list repeatedly can hold a FuzzyMatcher instead.
+
     Returns:
         List of tuples: (item, score)
     """
@@ -23,33 +51,5 @@ def sublimeSearch(
     if not query or not items:
         return []
 
-    results: List[Tuple[Dict[str, Any], float]] = []
-
-    for item in items:
-        best_score = 0.0
-
-        for key in keys:
-            value = item.get(key)
-
-            if not value:
-                continue
-
-            # Handle list values (e.g., tags, keywords)
-            if isinstance(value, list):
-                for v in value:
-                    if isinstance(v, str):
-                        best_score = max(best_score, _similarity(query, v))
-
-            # Handle string values
-            elif isinstance(value, str):
-                best_score = max(best_score, _similarity(query, value))
-
-        if best_score > 0:
-            results.append((item, best_score))
-
-    # Sort by score descending (most relevant first)
-    results.sort(key=lambda x: x[1], reverse=True)
-
-    return results
-
-
+    ranked = get_matcher(items, keys).rank(query, limit, exact=exact)
+    return [(items[index], score) for index, score in ranked]
@@ -0,0 +1,367 @@
+"""
+Indexed in-memory workflow.
+
+WorkflowGraph holds the nodes and connections of an n8n workflow JSON with
+hash indexes by id and by name and forward / reverse adjacency, so lookups,
+adding, removing and renaming nodes cost O(1) plus the node's degree instead
+of a scan over every node or connection.
+
+The n8n `connections` object is kept as the primary store, in n8n's own
+shape ({source name: {type: [[{node, type, index}, ...] per output]}}), and
+the reverse index points at the same link dicts. Importing and exporting is
+therefore lossless: to_json(from_json(w)) == w for any well-formed workflow,
+including extra node fields, extra workflow fields and key order.
+"""
+
+import copy
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from backend.error import ConnectionError, NodeNotFoundError, ValidationError
+from backend.n8n_worflow.inode_type_description import INode
+from backend.n8n_worflow.node_connection_types import NodeConnectionTypes
+
+
+class WorkflowConnection(NamedTuple):
+    source: str
+    target: str
+    type: str
+    source_index: int = 0
+    target_index: int = 0
+
+
+# (source name, connection type, output index, link dict inside connections)
+_IncomingLink = Tuple[str, str, int, Dict[str, Any]]
+
+
+class WorkflowGraph:
+    """n8n workflow with id / name indexes and adjacency per connection type"""
+
+    def __init__(self, name: str = "Untitled Workflow"):
+        # every workflow field in import order; nodes and connections are
+        # filled in by to_json
+        self.fields: Dict[str, Any] = {"name": name, "nodes": None, "connections": None}
+
+        self._nodes: Dict[str, INode] = {}                  # name -> node
+        self._order: Dict[int, INode] = {}                  # slot -> node, in workflow order
+        self._slots: Dict[str, int] = {}                    # name -> slot, kept across renames
+        self._next_slot = 0
+        self._ids: Dict[str, str] = {}                      # id -> name
+        self._lower_names: Dict[str, List[str]] = {}        # lowercased name -> names
+        self._name_suffixes: Dict[str, int] = {}            # base name -> first suffix worth probing
+        self._connections: Dict[str, Dict[str, List[List[Dict[str, Any]]]]] = {}
+        self._incoming: Dict[str, List[_IncomingLink]] = {}
+
+    # ===== Import / export =====
+
+    @classmethod
+    def from_json(cls, workflow: Dict[str, Any], copy_input: bool = True, strict: bool = True) -> "WorkflowGraph":
+        """
+        Build from n8n workflow JSON. With copy_input=False the graph takes
+        ownership of the node and link dicts. strict=False skips malformed
+        nodes and links (LLM output) instead of raising ValidationError.
+        """
+        if copy_input:
+            workflow = copy.deepcopy(workflow)
+
+        graph = cls()
+        graph.fields = {key: value for key, value in workflow.items()}
+        graph.fields.setdefault("nodes", None)
+        graph.fields.setdefault("connections", None)
+
+        for node in workflow.get("nodes") or []:
+            if not (isinstance(node, dict) and isinstance(node.get("name"), str)):
+                if strict:
+                    raise ValidationError("Workflow node without a name", details={"node": repr(node)[:200]})
+                continue
+            if not strict and node["name"] in graph._nodes:
+                graph._order.pop(graph._unindex(graph._nodes[node["name"]]))
+            graph._order[graph._next_slot] = node
+            graph._index(node, strict, graph._next_slot)
+            graph._next_slot += 1
+
+        for source, by_type in (workflow.get("connections") or {}).items():
+            if not isinstance(by_type, dict):
+                if strict:
+                    raise ValidationError(f"Invalid connections of {source}")
+                continue
+            outputs_by_type = graph._connections.setdefault(source, {})
+            for connection_type, outputs in by_type.items():
+                kept_outputs = outputs_by_type.setdefault(connection_type, [])
+                for output_index, links in enumerate(outputs or []):
+                    kept_links: List[Dict[str, Any]] = []
+                    for link in links or []:
+                        if not (isinstance(link, dict) and isinstance(link.get("node"), str)):
+                            if strict:
+                                raise ValidationError(f"Invalid connection from {source}", details={"link": repr(link)[:200]})
+                            continue
+                        kept_links.append(link)
+                        graph._incoming.setdefault(link["node"], []).append(
+                            (source, connection_type, output_index, link)
+                        )
+                    kept_outputs.append(kept_links)
+        return graph
+
+    def to_json(self) -> Dict[str, Any]:
+        """n8n workflow JSON (a deep copy)"""
+        workflow = dict(self.fields)
+        workflow["nodes"] = list(self._order.values())
+        workflow["connections"] = self._connections
+        return copy.deepcopy(workflow)
+
+    # ===== Lookups =====
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __iter__(self) -> Iterator[INode]:
+        return iter(self._order.values())
+
+    def __contains__(self, identifier: object) -> bool:
+        return isinstance(identifier, str) and self.get(identifier) is not None
+
+    @property
+    def nodes(self) -> List[INode]:
+        return list(self._order.values())
+
+    @property
+    def names(self) -> Dict[str, INode]:
+        """Read-only view: name -> node"""
+        return self._nodes
+
+    def get_by_id(self, node_id: str) -> Optional[INode]:
+        name = self._ids.get(node_id)
+        return self._nodes.get(name) if name is not None else None
+
+    def get_by_name(self, name: str, case_sensitive: bool = True) -> Optional[INode]:
+        node = self._nodes.get(name)
+        if node is not None or case_sensitive:
+            return node
+        names = self._lower_names.get(name.lower())
+        return self._nodes[names[0]] if names else None
+
+    def get(self, identifier: str) -> Optional[INode]:
+        """By id, then exact name, then case-insensitive name"""
+        return (
+            self.get_by_id(identifier)
+            or self.get_by_name(identifier)
+            or self.get_by_name(identifier, case_sensitive=False)
+        )
+
+    def require(self, identifier: str) -> INode:
+        node = self.get(identifier)
+        if node is None:
+            raise NodeNotFoundError(identifier)
+        return node
+
+    def unique_name(self, base_name: str) -> str:
+        """
+        base_name, or base_name1, base_name2, ... if taken. Suffixes are
+        probed from where the last call for the same base stopped, so adding
+        many nodes of one type does not rescan the taken ones.
+        """
+        base_name = base_name or "Node"
+        if base_name not in self._nodes:
+            return base_name
+        counter = self._name_suffixes.get(base_name, 1)
+        while f"{base_name}{counter}" in self._nodes:
+            counter += 1
+        self._name_suffixes[base_name] = counter
+        return f"{base_name}{counter}"
+
+    # ===== Adjacency =====
+
+    def outgoing(self, identifier: str, connection_type: Optional[str] = None) -> List[WorkflowConnection]:
+        name = self.require(identifier)["name"]
+        return [
+            WorkflowConnection(name, link["node"], kind, output_index, link.get("index", 0))
+            for kind, outputs in self._connections.get(name, {}).items()
+            if connection_type is None or kind == connection_type
+            for output_index, links in enumerate(outputs)
+            for link in links
+        ]
+
+    def incoming(self, identifier: str, connection_type: Optional[str] = None) -> List[WorkflowConnection]:
+        name = self.require(identifier)["name"]
+        return [
+            WorkflowConnection(source, name, kind, output_index, link.get("index", 0))
+            for source, kind, output_index, link in self._incoming.get(name, [])
+            if connection_type is None or kind == connection_type
+        ]
+
+    def successors(self, identifier: str, connection_type: Optional[str] = None) -> List[str]:
+        return list(dict.fromkeys(c.target for c in self.outgoing(identifier, connection_type)))
+
+    def predecessors(self, identifier: str, connection_type: Optional[str] = None) -> List[str]:
+        return list(dict.fromkeys(c.source for c in self.incoming(identifier, connection_type)))
+
+    def connections(self) -> Iterator[WorkflowConnection]:
+        """Every connection, also those from or to names that are not nodes"""
+        for source, by_type in self._connections.items():
+            for kind, outputs in by_type.items():
+                for output_index, links in enumerate(outputs):
+                    for link in links:
+                        yield WorkflowConnection(source, link["node"], kind, output_index, link.get("index", 0))
+
+    # ===== Node changes =====
+
+    def add_node(self, node: INode) -> INode:
+        if not isinstance(node.get("name"), str):
+            raise ValidationError("Node name is required")
+        self._index(node, strict=True, slot=self._next_slot)
+        self._order[self._next_slot] = node
+        self._next_slot += 1
+        return node
+
+    def remove_node(self, identifier: str) -> INode:
+        """Remove a node and every connection from or to it"""
+        node = self.require(identifier)
+        name = node["name"]
+
+        for source, kind, output_index, link in self._incoming.pop(name, []):
+            links = self._connections[source][kind][output_index]
+            links[:] = [l for l in links if l is not link]
+
+        for kind, outputs in self._connections.pop(name, {}).items():
+            for links in outputs:
+                for link in links:
+                    self._drop_incoming(link["node"], link)
+
+        del self._order[self._unindex(node)]
+        return node
+
+    def rename_node(self, identifier: str, new_name: str) -> INode:
+        """Rename a node and update every connection referring to it"""
+        node = self.require(identifier)
+        old_name = node["name"]
+        if new_name == old_name:
+            return node
+        if new_name in self._nodes:
+            raise ValidationError(f"A node named {new_name} already exists", details={"name": new_name})
+
+        slot = self._unindex(node)
+        node["name"] = new_name
+        self._index(node, strict=True, slot=slot)
+
+        incoming = self._incoming.pop(old_name, [])
+        for _, _, _, link in incoming:
+            link["node"] = new_name
+        if incoming:
+            self._incoming[new_name] = incoming
+
+        if old_name in self._connections:
+            outputs_by_type = self._connections.pop(old_name)
+            self._connections[new_name] = outputs_by_type
+            for kind, outputs in outputs_by_type.items():
+                for output_index, links in enumerate(outputs):
+                    for link in links:
+                        entries = self._incoming.get(link["node"], [])
+                        for i, entry in enumerate(entries):
+                            if entry[3] is link:
+                                entries[i] = (new_name, kind, output_index, link)
+        return node
+
+    def update_node(self, identifier: str, updates: Dict[str, Any]) -> INode:
+        """Apply a partial node update; name and id changes keep the indexes consistent"""
+        node = self.require(identifier)
+        updates = dict(updates)
+        if "name" in updates:
+            self.rename_node(node["name"], updates.pop("name"))
+        if "id" in updates and updates["id"] != node.get("id"):
+            if updates["id"] in self._ids:
+                raise ValidationError(f"A node with id {updates['id']} already exists", details={"id": updates["id"]})
+            self._ids.pop(node.get("id"), None)
+            self._ids[updates["id"]] = node["name"]
+        node.update(updates)
+        return node
+
+    # ===== Connection changes =====
+
+    def add_connection(
+        self,
+        source: str,
+        target: str,
+        connection_type: str = NodeConnectionTypes.Main,
+        source_index: int = 0,
+        target_index: int = 0,
+    ) -> WorkflowConnection:
+        source_name = self.require(source)["name"]
+        target_name = self.require(target)["name"]
+        if source_name == target_name:
+            raise ConnectionError("Cannot connect a node to itself", details={"node": source_name})
+
+        outputs = self._connections.setdefault(source_name, {}).setdefault(connection_type, [])
+        while len(outputs) <= source_index:
+            outputs.append([])
+
+        connection = WorkflowConnection(source_name, target_name, connection_type, source_index, target_index)
+        for link in outputs[source_index]:
+            if link["node"] == target_name and link.get("index", 0) == target_index:
+                return connection
+
+        link = {"node": target_name, "type": connection_type, "index": target_index}
+        outputs[source_index].append(link)
+        self._incoming.setdefault(target_name, []).append((source_name, connection_type, source_index, link))
+        return connection
+
+    def remove_connection(
+        self,
+        source: str,
+        target: str,
+        connection_type: str = NodeConnectionTypes.Main,
+        source_index: int = 0,
+        target_index: int = 0,
+    ) -> bool:
+        """False when there was no such connection"""
+        source_name = self.require(source)["name"]
+        target_name = self.require(target)["name"]
+        outputs = self._connections.get(source_name, {}).get(connection_type, [])
+        if source_index >= len(outputs):
+            return False
+
+        links = outputs[source_index]
+        for i, link in enumerate(links):
+            if link["node"] == target_name and link.get("index", 0) == target_index:
+                del links[i]
+                self._drop_incoming(target_name, link)
+                return True
+        return False
+
+    # ===== Internals =====
+
+    def _index(self, node: INode, strict: bool, slot: int) -> None:
+        name = node["name"]
+        if name in self._nodes:
+            raise ValidationError(f"A node named {name} already exists", details={"name": name})
+        node_id = node.get("id")
+        if node_id is not None and node_id in self._ids:
+            if strict:
+                raise ValidationError(f"A node with id {node_id} already exists", details={"id": node_id})
+            node_id = None
+
+        self._nodes[name] = node
+        self._slots[name] = slot
+        if node_id is not None:
+            self._ids[node_id] = name
+        self._lower_names.setdefault(name.lower(), []).append(name)
+
+    def _unindex(self, node: INode) -> int:
+        """Drop the node from the indexes and return its slot"""
+        name = node["name"]
+        del self._nodes[name]
+        slot = self._slots.pop(name)
+        if self._ids.get(node.get("id")) == name:
+            del self._ids[node["id"]]
+        names = self._lower_names.get(name.lower(), [])
+        if name in names:
+            names.remove(name)
+        if not names:
+            self._lower_names.pop(name.lower(), None)
+        return slot
+
+    def _drop_incoming(self, target: str, link: Dict[str, Any]) -> None:
+        entries = self._incoming.get(target)
+        if not entries:
+            return
+        entries[:] = [entry for entry in entries if entry[3] is not link]
+        if not entries:
+            del self._incoming[target]
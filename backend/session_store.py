@@ -0,0 +1,282 @@
+"""
+Chat session storage for /chat.
+
+Each session holds its own conversation history and intent-refinement state
+(last intent, refining flag), so concurrent users no longer share the state
+that backend/llm.py used to keep in module globals. Stores are bounded: idle
+sessions expire after a TTL, the least recently used ones are evicted past
+max_sessions, and history is compacted to the last max_history messages
+(llm_classify_and_improve only reads the last 8).
+
+Requests for the same session are serialized with a per-session asyncio lock.
+The SQLite store lets several uvicorn workers serve the same session; the
+locks are per process, so concurrent requests for one session that land on
+different workers are last-write-wins.
+
+Env:
+    SESSION_MAX                 max live sessions (default 1000)
+    SESSION_TTL_SECONDS         idle lifetime, 0 = never expire (default 1800)
+    SESSION_MAX_HISTORY         history messages kept per session (default 16)
+    SESSION_STORE_SQLITE_PATH   use the SQLite store when set
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+@dataclass
+class SessionState:
+    history: List[dict] = field(default_factory=list)
+    last_intent_message: Optional[str] = None
+    is_refining: bool = False
+
+    def compact(self, max_history: int) -> None:
+        """Keep only the last max_history messages"""
+        if max_history and len(self.history) > max_history:
+            del self.history[:-max_history]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, value: str) -> "SessionState":
+        return cls(**json.loads(value))
+
+
+# ===== Per-session locks =====
+
+class SessionLocks:
+    """asyncio locks keyed by session id, dropped once nobody holds or awaits them"""
+
+    def __init__(self) -> None:
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+    @asynccontextmanager
+    async def hold(self, session_id: str) -> AsyncIterator[None]:
+        lock, users = self._locks.get(session_id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._locks[session_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[session_id]
+            if users <= 1:
+                del self._locks[session_id]
+            else:
+                self._locks[session_id] = (lock, users - 1)
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+# ===== Stores =====
+
+class SessionStore(ABC):
+    """
+    Base store. get() returns the session (a fresh one when missing or
+    expired), save() writes it back compacted, delete() drops it.
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl_seconds: float = 1800, max_history: int = 16):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_history = max_history
+        self.evictions = 0
+        self._locks = SessionLocks()
+
+    def lock(self, session_id: str):
+        """Async context manager serializing requests for one session"""
+        return self._locks.hold(session_id)
+
+    def _expired(self, touched: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - touched > self.ttl_seconds
+
+    @abstractmethod
+    def get(self, session_id: str) -> SessionState:
+        ...
+
+    @abstractmethod
+    def save(self, session_id: str, state: SessionState) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self),
+            "evictions": self.evictions,
+            "locked": len(self._locks),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+class MemorySessionStore(SessionStore):
+    """In-process LRU with idle TTL"""
+
+    def __init__(self, max_sessions: int = 1000, ttl_seconds: float = 1800, max_history: int = 16):
+        super().__init__(max_sessions, ttl_seconds, max_history)
+        # least recently touched first, so expired sessions sit at the front
+        self._sessions: "OrderedDict[str, Tuple[float, SessionState]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._sessions:
+            session_id, (touched, _) = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and not self._expired(touched, now):
+                break
+            del self._sessions[session_id]
+            self.evictions += 1
+
+    def get(self, session_id: str) -> SessionState:
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            entry = self._sessions.get(session_id)
+            state = entry[1] if entry else SessionState()
+            self._sessions[session_id] = (now, state)
+            self._sessions.move_to_end(session_id)
+            return state
+
+    def save(self, session_id: str, state: SessionState) -> None:
+        state.compact(self.max_history)
+        now = time.time()
+        with self._lock:
+            self._sessions[session_id] = (now, state)
+            self._sessions.move_to_end(session_id)
+            self._evict(now)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions in a SQLite table shared by every worker pointing at the same file"""
+
+    def __init__(
+        self,
+        path: str,
+        max_sessions: int = 1000,
+        ttl_seconds: float = 1800,
+        max_history: int = 16,
+        table: str = "chat_sessions",
+        prune_every: int = 64,
+    ):
+        super().__init__(max_sessions, ttl_seconds, max_history)
+        self.path = path
+        self.table = table
+        self.prune_every = prune_every
+        self._saves = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(id TEXT PRIMARY KEY, state TEXT NOT NULL, touched REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_touched ON {table} (touched)")
+        self._conn.commit()
+
+    def _prune(self, now: float) -> None:
+        removed = 0
+        if self.ttl_seconds:
+            removed += self._conn.execute(
+                f"DELETE FROM {self.table} WHERE touched < ?", (now - self.ttl_seconds,)
+            ).rowcount
+        removed += self._conn.execute(
+            f"DELETE FROM {self.table} WHERE id IN "
+            f"(SELECT id FROM {self.table} ORDER BY touched DESC LIMIT -1 OFFSET ?)",
+            (self.max_sessions,),
+        ).rowcount
+        self.evictions += removed
+
+    def get(self, session_id: str) -> SessionState:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT state, touched FROM {self.table} WHERE id = ?", (session_id,)
+            ).fetchone()
+        if row is None or self._expired(row[1], now):
+            return SessionState()
+        return SessionState.from_json(row[0])
+
+    def save(self, session_id: str, state: SessionState) -> None:
+        state.compact(self.max_history)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (id, state, touched) VALUES (?, ?, ?)",
+                (session_id, state.to_json(), now),
+            )
+            self._saves += 1
+            if self._saves % self.prune_every == 0:
+                self._prune(now)
+            self._conn.commit()
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE id = ?", (session_id,))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "sqlite": self.path}
+
+
+# ===== Process-wide instance =====
+
+_session_store: Optional[SessionStore] = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Shared store configured from env"""
+    global _session_store
+
+    if _session_store is None:
+        with _session_store_lock:
+            if _session_store is None:
+                options = dict(
+                    max_sessions=int(os.getenv("SESSION_MAX", "1000")),
+                    ttl_seconds=float(os.getenv("SESSION_TTL_SECONDS", "1800")),
+                    max_history=int(os.getenv("SESSION_MAX_HISTORY", "16")),
+                )
+                sqlite_path = os.getenv("SESSION_STORE_SQLITE_PATH")
+                if sqlite_path:
+                    _session_store = SQLiteSessionStore(sqlite_path, **options)
+                else:
+                    _session_store = MemorySessionStore(**options)
+    return _session_store
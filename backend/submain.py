@@ -1,5 +1,6 @@
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 # from langchain_openai import ChatOpenAI
 
@@ -10,13 +11,15 @@ from backend.evalution_chain.evalution import EvaluationInput, EvaluationResult
 from backend.evalution_chain.functionality_evalution import evaluateFunctionality
 from backend.evalution_chain.maintainability_evalution import evaluateMaintainability
 from backend.evalution_chain.node_config_evalution import evaluate_node_configuration
-from backend.evalution_chain.workflow_evaluator import evaluate_workflow
+from backend.evalution_chain.workflow_evaluator import evaluate_workflow, aevaluate_workflow
 from backend.mytypes.workflow import SimpleWorkflow
 from backend.llm_config import get_llm # Assuming llm is defined in llm_config.py 
 from langchain_core.language_models.chat_models import BaseChatModel
 from backend.evalution_chain.connection_evalution import evaluate_connections
 from backend.evalution_chain.efficiency_evalution import evaluateEfficiency
 from backend.evalution_chain.expression_evalution import evaluateExpressions
+from backend.metrics import render as render_metrics
+from backend.evalution_chain.eval_cache import cached_category
 
 # FASTAPI APP
 app = FastAPI(
@@ -52,10 +55,7 @@ def evaluate_best_practices(request: EvaluateRequest):
             ),
         )
 
-        result =  evaluateBestPractices(
-            llm=llm,
-            input=evaluation_input,
-        )
+        result = cached_category("bestPractices", llm, evaluation_input, evaluateBestPractices)
 
         # Pydantic v2 safe
         return result
@@ -69,10 +69,7 @@ def evaluate_connections_api(payload: EvaluationInput):
     try:
         llm: BaseChatModel = get_llm()
 
-        result = evaluate_connections(
-            llm=llm,
-            input=payload,
-        )
+        result = cached_category("connections", llm, payload, evaluate_connections)
 
         return {
             "success": True,
@@ -90,10 +87,7 @@ def evaluate_functionality_api(payload: EvaluationInput):
     try:
         llm: BaseChatModel = get_llm()
 
-        result = evaluateFunctionality(
-            llm=llm,
-            input=payload,
-        )
+        result = cached_category("functionality", llm, payload, evaluateFunctionality)
 
         return {
             "success": True,
@@ -110,10 +104,7 @@ def evaluate_data_flow_api(payload: EvaluationInput):
     try:
         llm: BaseChatModel = get_llm()
 
-        result = evaluateDataFlow(
-            llm=llm,
-            input=payload,
-        )
+        result = cached_category("dataFlow", llm, payload, evaluateDataFlow)
 
         return {
             "success": True,
@@ -130,10 +121,7 @@ def evaluate_efficiency_api(payload: EvaluationInput):
     try:
         llm: BaseChatModel = get_llm()
 
-        result = evaluateEfficiency(
-            llm=llm,
-            input=payload,
-        )
+        result = cached_category("efficiency", llm, payload, evaluateEfficiency)
 
         return {
             "success": True,
@@ -149,10 +137,7 @@ def evaluate_expressions_api(payload: EvaluationInput):
     try:
         llm: BaseChatModel = get_llm()
 
-        result = evaluateExpressions(
-            llm=llm,
-            input=payload,
-        )
+        result = cached_category("expressions", llm, payload, evaluateExpressions)
 
         return {
             "success": True,
@@ -169,10 +154,7 @@ def evaluate_maintainability_api(payload: EvaluationInput):
     try:
         llm: BaseChatModel = get_llm()
 
-        result = evaluateMaintainability(
-            llm=llm,
-            input=payload,
-        )
+        result = cached_category("maintainability", llm, payload, evaluateMaintainability)
 
         return {
             "success": True,
@@ -189,10 +171,7 @@ def evaluate_node_configuration_api(payload: EvaluationInput):
     try:
         llm: BaseChatModel = get_llm()
 
-        result = evaluate_node_configuration(
-            llm=llm,
-            input=payload,
-        )
+        result = cached_category("nodeConfiguration", llm, payload, evaluate_node_configuration)
 
         return {
             "success": True,
@@ -226,11 +205,12 @@ def evaluate_node_configuration_api(payload: EvaluationInput):
 
 
 @app.post("/evaluate/workflow", response_model=EvaluationResult)
-def evaluate_workflow_api(payload: EvaluationInput):
+async def evaluate_workflow_api(payload: EvaluationInput):
     try:
         llm: BaseChatModel = get_llm()
 
-        result = evaluate_workflow(
+        # categories run concurrently; a failed one is marked not applicable
+        result = await aevaluate_workflow(
             llm=llm,
             input=payload,
         )
@@ -242,3 +222,9 @@ def evaluate_workflow_api(payload: EvaluationInput):
             status_code=500,
             detail=f"Error during workflow evaluation: {str(e)}",
         )
+
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus metrics: evaluator LLM timings, tokens, cache and errors"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,126 @@
+"""
+Shared keyword matcher for prompt analysis.
+
+Several modules decide what a prompt is about by checking dozens of keyword
+lists with `any(k in text for k in [...])`, which rescans the prompt once per
+keyword. Instead, every module registers its keyword tables here at import
+time, one Aho–Corasick automaton is compiled over all of them, and a prompt is
+scanned once into a KeywordHits set that every call site checks against.
+
+Matching keeps the substring semantics of the old checks: a keyword hits when
+it occurs anywhere in the lowercased text ("ai" hits "email").
+"""
+
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+class KeywordAutomaton:
+    """Aho–Corasick automaton over a fixed set of keywords"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: FrozenSet[str] = frozenset(k for k in keywords if k)
+
+        # trie
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[str, ...]] = [()]
+        for keyword in sorted(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    outputs.append(())
+                    goto[state][ch] = nxt
+                state = nxt
+            outputs[state] = (keyword,)
+
+        # failure links in BFS order, folded into a full transition table so
+        # a scan is one dict lookup per character
+        fail = [0] * len(goto)
+        self._delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            delta = dict(self._delta[fail[state]])
+            delta.update(goto[state])
+            self._delta[state] = delta
+            for ch, nxt in goto[state].items():
+                fail[nxt] = self._delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(nxt)
+
+        self._outputs = outputs
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Every keyword that occurs in text"""
+        hits: Set[str] = set()
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                hits.update(outputs[state])
+        return frozenset(hits)
+
+
+class KeywordHits:
+    """Keywords found in one prompt"""
+    __slots__ = ("text", "matched")
+
+    def __init__(self, text: str, matched: FrozenSet[str]):
+        self.text = text
+        self.matched = matched
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self.matched
+
+    def any(self, keywords: Iterable[str]) -> bool:
+        """True when any of the keywords occurs in the prompt"""
+        return not self.matched.isdisjoint(keywords)
+
+
+# ===== Shared registry =====
+
+_registered: Set[str] = set()
+_automaton: Optional[KeywordAutomaton] = None
+_lock = threading.Lock()
+
+
+def register_keywords(*tables: Iterable[str]) -> None:
+    """Add keyword lists to the shared automaton (call at module import)"""
+    global _automaton
+    with _lock:
+        new = {k for table in tables for k in table} - _registered
+        if new:
+            _registered.update(new)
+            _automaton = None
+            _cached_hits.cache_clear()
+
+
+def get_keyword_automaton() -> KeywordAutomaton:
+    global _automaton
+    automaton = _automaton
+    if automaton is None:
+        with _lock:
+            if _automaton is None:
+                _automaton = KeywordAutomaton(_registered)
+            automaton = _automaton
+    return automaton
+
+
+@lru_cache(maxsize=256)
+def _cached_hits(text: str) -> KeywordHits:
+    return KeywordHits(text, get_keyword_automaton().find(text))
+
+
+def keyword_hits(text: str) -> KeywordHits:
+    """
+    Registered keywords occurring in text (lowercased). Results are cached per
+    text, so every analysis step of the same prompt shares a single scan.
+    """
+    return _cached_hits((text or "").lower())
@@ -6,21 +6,26 @@ import uuid
 from typing import List, Tuple, Dict, Any, Union, Optional
 
 from backend.n8n_worflow.inode_type_description import INode, INodeTypeDescription 
+from backend.n8n_worflow.workflow_graph import WorkflowGraph
 
 
 
 
-def generate_unique_name(base_name: str, existing_nodes: List[INode]) -> str:
+def generate_unique_name(base_name: str, existing_nodes: Union[List[INode], WorkflowGraph]) -> str:
     """
     Generate a unique node name by appending incrementing numbers if necessary.
 
     Args:
         base_name: Desired base name for the node
-        existing_nodes: List of current nodes in the workflow
+        existing_nodes: List of current nodes in the workflow, or its WorkflowGraph
+            (checks names against its index instead of collecting them)
 
     Returns:
         A unique node name
     """
+    if isinstance(existing_nodes, WorkflowGraph):
+        return existing_nodes.unique_name(base_name)
+
     if not base_name:
         base_name = "Node"
 
@@ -0,0 +1,54 @@
+"""
+Server-Sent Events helpers for streaming pipeline progress over HTTP.
+
+A streaming endpoint starts its pipeline as a task that publishes events to an
+EventChannel; relay() yields the formatted events as they arrive and stops once
+the pipeline has finished and the channel is drained. If the client goes away,
+the pipeline task is cancelled.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+
+SSE_HEADERS: Dict[str, str] = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # disable proxy buffering (nginx)
+}
+
+
+def sse_event(event: str, data: Any) -> str:
+    """One SSE frame with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class EventChannel:
+    """Queue of formatted SSE frames, filled from the event loop thread"""
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def publish(self, event: str, data: Any) -> None:
+        self._queue.put_nowait(sse_event(event, data))
+
+    async def relay(self, pipeline: Callable[[], Awaitable[Any]]) -> AsyncIterator[str]:
+        """Run pipeline() and yield every frame published while it runs"""
+        task = asyncio.create_task(pipeline())
+        try:
+            while not task.done():
+                getter = asyncio.ensure_future(self._queue.get())
+                done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    yield getter.result()
+                else:
+                    getter.cancel()
+
+            while not self._queue.empty():
+                yield self._queue.get_nowait()
+
+            # surface pipeline errors to the caller
+            task.result()
+        finally:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,314 @@
+# benchmarks/bench_analyze.py
+"""
+End-to-end benchmark of the /analyze pipeline over data/example_prompts.json.
+
+Every prompt goes through run_analyze_pipeline with a fake or replayed LLM
+(see backend/llm_backend.py), so the numbers measure our own code: registry
+search, best practice parsing, merging and the pipeline plumbing. Reports:
+
+- latency percentiles per pipeline stage and per request
+- throughput at the given concurrency
+- allocations per request (tracemalloc, separate sequential pass)
+- technique classification accuracy against expectedTechniques
+
+    python -m benchmarks.bench_analyze --concurrency 8 --repeat 3 --output report.json
+    python -m benchmarks.bench_analyze --baseline report.json
+
+With --baseline, latencies, throughput and accuracy are compared against a
+saved report and the exit code is 1 when anything regressed by more than
+--threshold.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_PROMPTS = os.path.join("data", "example_prompts.json")
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """p50 / p90 / p99 (nearest rank), mean and max"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, round(p * len(ordered)) - 1))]
+
+    return {
+        "p50": round(rank(0.50), 3),
+        "p90": round(rank(0.90), 3),
+        "p99": round(rank(0.99), 3),
+        "mean": round(statistics.fmean(ordered), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def technique_accuracy(results: List[Tuple[List[str], List[str]]]) -> Dict[str, Any]:
+    """Micro-averaged precision / recall / F1 and exact-match rate over (expected, predicted)"""
+    true_pos = false_pos = false_neg = exact = 0
+    for expected, predicted in results:
+        expected_set, predicted_set = set(expected), set(predicted)
+        true_pos += len(expected_set & predicted_set)
+        false_pos += len(predicted_set - expected_set)
+        false_neg += len(expected_set - predicted_set)
+        exact += expected_set == predicted_set
+
+    precision = true_pos / (true_pos + false_pos) if true_pos + false_pos else 0.0
+    recall = true_pos / (true_pos + false_neg) if true_pos + false_neg else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "prompts": len(results),
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1": round(f1, 4),
+        "exact_match": round(exact / len(results), 4) if results else 0.0,
+    }
+
+
+@contextlib.contextmanager
+def quiet(enabled: bool):
+    """Swallow the pipeline's progress prints"""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+# ===== Runs =====
+
+async def run_prompts(
+    prompts: List[Dict[str, Any]],
+    concurrency: int,
+    repeat: int,
+) -> Dict[str, Any]:
+    from backend.main import run_analyze_pipeline
+
+    semaphore = asyncio.Semaphore(concurrency)
+    stage_ms: Dict[str, List[float]] = {}
+    request_ms: List[float] = []
+    classified: List[Tuple[List[str], List[str]]] = []
+    errors: List[str] = []
+
+    async def one(item: Dict[str, Any], record_accuracy: bool) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                run = await run_analyze_pipeline(item["prompt"])
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+                return
+            request_ms.append((time.perf_counter() - started) * 1000)
+
+        for stage, seconds in run.timings.items():
+            stage_ms.setdefault(stage, []).append(seconds * 1000)
+        if record_accuracy:
+            predicted = [t.value for t in run.results["categorize"]["techniques"]]
+            classified.append((item.get("expectedTechniques", []), predicted))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        one(item, record_accuracy=round_ == 0)
+        for round_ in range(repeat)
+        for item in prompts
+    ))
+    wall = time.perf_counter() - started
+
+    requests = len(prompts) * repeat
+    return {
+        "throughput": {
+            "requests": requests,
+            "errors": len(errors),
+            "wall_seconds": round(wall, 3),
+            "requests_per_second": round((requests - len(errors)) / wall, 3) if wall else 0.0,
+        },
+        "latency_ms": {
+            "request": percentiles(request_ms),
+            **{stage: percentiles(values) for stage, values in stage_ms.items()},
+        },
+        "accuracy": technique_accuracy(classified),
+        "error_samples": errors[:5],
+    }
+
+
+async def measure_allocations(prompts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Peak and retained traced memory per request, one request at a time"""
+    from backend.main import run_analyze_pipeline
+
+    peak_kb: List[float] = []
+    retained_kb: List[float] = []
+    tracemalloc.start()
+    try:
+        for item in prompts:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            try:
+                await run_analyze_pipeline(item["prompt"])
+            except Exception:
+                continue
+            current, peak = tracemalloc.get_traced_memory()
+            peak_kb.append((peak - before) / 1024)
+            retained_kb.append((current - before) / 1024)
+    finally:
+        tracemalloc.stop()
+
+    return {"peak_kb": percentiles(peak_kb), "retained_kb": percentiles(retained_kb)}
+
+
+# ===== Baseline comparison =====
+
+# (report section, metric, larger_is_better)
+COMPARED_METRICS = [
+    ("throughput", "requests_per_second", True),
+    ("accuracy", "f1", True),
+    ("accuracy", "exact_match", True),
+]
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """One row per metric present in both reports, flagged when it regressed by more than threshold"""
+    rows = []
+
+    def add(name: str, old: Optional[float], new: Optional[float], larger_is_better: bool) -> None:
+        if old is None or new is None:
+            return
+        change = (new - old) / old if old else 0.0
+        worse = -change if larger_is_better else change
+        rows.append({
+            "metric": name,
+            "baseline": old,
+            "current": new,
+            "change": round(change, 4),
+            "regressed": worse > threshold,
+        })
+
+    for section, metric, larger_is_better in COMPARED_METRICS:
+        add(
+            f"{section}.{metric}",
+            baseline.get(section, {}).get(metric),
+            current.get(section, {}).get(metric),
+            larger_is_better,
+        )
+
+    for stage, stats in current.get("latency_ms", {}).items():
+        for p in ("p50", "p90"):
+            add(f"latency_ms.{stage}.{p}", baseline.get("latency_ms", {}).get(stage, {}).get(p), stats.get(p), False)
+
+    for kind in ("peak_kb", "retained_kb"):
+        add(
+            f"allocations.{kind}.p50",
+            (baseline.get("allocations") or {}).get(kind, {}).get("p50"),
+            (current.get("allocations") or {}).get(kind, {}).get("p50"),
+            False,
+        )
+    return rows
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    throughput = report["throughput"]
+    print(
+        f"{throughput['requests']} requests, {throughput['errors']} errors, "
+        f"{throughput['wall_seconds']:.2f} s, {throughput['requests_per_second']:.1f} req/s "
+        f"at concurrency {report['meta']['concurrency']}"
+    )
+    for stage, stats in report["latency_ms"].items():
+        print(
+            f"  {stage:<10} p50 {stats['p50']:9.2f} ms   p90 {stats['p90']:9.2f} ms"
+            f"   p99 {stats['p99']:9.2f} ms   max {stats['max']:9.2f} ms"
+        )
+    if report.get("allocations"):
+        for kind, stats in report["allocations"].items():
+            print(f"  {kind:<12} p50 {stats['p50']:10.1f} KB   max {stats['max']:10.1f} KB")
+    accuracy = report["accuracy"]
+    print(
+        f"techniques: precision {accuracy['precision']:.3f}  recall {accuracy['recall']:.3f}"
+        f"  f1 {accuracy['f1']:.3f}  exact {accuracy['exact_match']:.3f} ({accuracy['prompts']} prompts)"
+    )
+    for error in report.get("error_samples", []):
+        print(f"  error: {error}")
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    print("\nvs baseline:")
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(f"  {row['metric']:<28} {row['baseline']:>10} -> {row['current']:>10}  {row['change']:+.1%}{flag}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the analyze pipeline end to end")
+    parser.add_argument("--prompts", default=DEFAULT_PROMPTS, help="JSON list of {prompt, expectedTechniques}")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the prompt set")
+    parser.add_argument("--limit", type=int, default=None, help="only the first N prompts")
+    parser.add_argument("--backend", default=os.getenv("LLM_BACKEND", "fake"),
+                        choices=["fake", "replay", "record", "groq"], help="LLM_BACKEND for the run")
+    parser.add_argument("--latency", default=None, help="LLM_FAKE_LATENCY for the fake backend, e.g. lognormal:800,0.4")
+    parser.add_argument("--allocations", action="store_true", help="also trace allocations (sequential pass)")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="saved report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression (0.2 = 20%%)")
+    parser.add_argument("--verbose", action="store_true", help="keep the pipeline's own output")
+    args = parser.parse_args(argv)
+
+    # must be set before the backend modules build their clients
+    os.environ["LLM_BACKEND"] = args.backend
+    os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+    if args.latency:
+        os.environ["LLM_FAKE_LATENCY"] = args.latency
+    if args.backend != "groq":
+        os.environ.setdefault("GROQ_API_KEY", "offline")
+
+    with open(args.prompts, encoding="utf-8") as f:
+        prompts = json.load(f)[: args.limit]
+
+    async def run_all() -> Dict[str, Any]:
+        # warm-up: registry index, best practice parses, keyword automaton
+        await run_prompts(prompts[:1], 1, 1)
+        result = await run_prompts(prompts, args.concurrency, args.repeat)
+        result["allocations"] = await measure_allocations(prompts) if args.allocations else None
+        return result
+
+    # one event loop, so the pooled async HTTP client stays usable
+    with quiet(not args.verbose):
+        report = asyncio.run(run_all())
+
+    report["meta"] = {
+        "prompts": len(prompts),
+        "concurrency": args.concurrency,
+        "repeat": args.repeat,
+        "backend": args.backend,
+        "fake_latency": os.getenv("LLM_FAKE_LATENCY", "fixed:0") if args.backend == "fake" else None,
+        "python": platform.python_version(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold)
+        print_comparison(rows)
+        if any(row["regressed"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# benchmarks/bench_parse_best_practices.py
+"""
+Parse time of the best practices documentation.
+
+Times BestPracticeParser on every technique document on its own, on all of
+them merged into one text (the worst case for a request), and the cached
+per-technique merge the analyze pipeline uses.
+
+    python -m benchmarks.bench_parse_best_practices --repeat 50
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from backend.mytools.find_best_practice_tool import format_best_practices
+from backend.mytools.parse_best_practices import (
+    BestPracticeParser,
+    parse_best_practices_for_techniques,
+)
+from backend.mytypes.categorization import WorkflowTechnique
+
+
+def measure(fn: Callable[[], object], repeat: int) -> List[float]:
+    """Wall time of each call in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: List[float]) -> None:
+    print(
+        f"{label:<32} median {statistics.median(timings):8.3f} ms"
+        f"   min {min(timings):8.3f} ms   max {max(timings):8.3f} ms"
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark best practices parsing")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measurement")
+    args = parser.parse_args(argv)
+
+    techniques = list(WorkflowTechnique)
+    merged_text = format_best_practices(techniques)
+    parsed = BestPracticeParser(merged_text)
+
+    print(
+        f"{len(techniques)} techniques, {len(merged_text)} chars merged, "
+        f"{len(parsed.nodes)} nodes, {len(parsed.general_guidelines)} guidelines"
+    )
+
+    for technique in techniques:
+        text = format_best_practices([technique])
+        report(technique.value, measure(lambda: BestPracticeParser(text), args.repeat))
+
+    report("all techniques merged", measure(lambda: BestPracticeParser(merged_text), args.repeat))
+
+    # first call fills the per-technique cache
+    parse_best_practices_for_techniques(techniques)
+    report(
+        "all techniques, cached merge",
+        measure(lambda: parse_best_practices_for_techniques(techniques), args.repeat),
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,35 @@
+# test/conftest.py
+import os
+
+# backend.llm needs a key at import time; tests never reach the real API
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+import pytest
+
+from backend.mytools.generate_from_parsed_bp import (
+    GeneratedWorkflow,
+    WorkflowConnection,
+    WorkflowNode,
+    workflow_to_n8n_format,
+)
+
+
+@pytest.fixture
+def generated_chain():
+    """Schedule -> HTTP -> Slack as workflow_to_n8n_format writes it (keyed by node id)"""
+    return workflow_to_n8n_format(GeneratedWorkflow(
+        nodes=[
+            WorkflowNode(id="n1", name="Schedule", type="n8n-nodes-base.scheduleTrigger",
+                         position={"x": 0, "y": 0}, parameters={}),
+            WorkflowNode(id="n2", name="HTTP", type="n8n-nodes-base.httpRequest",
+                         position={"x": 300, "y": 0}, parameters={}),
+            WorkflowNode(id="n3", name="Slack", type="n8n-nodes-base.slack",
+                         position={"x": 600, "y": 0}, parameters={}),
+        ],
+        connections=[
+            WorkflowConnection(source="n1", target="n2"),
+            WorkflowConnection(source="n2", target="n3"),
+        ],
+        description="chain",
+    ))
@@ -0,0 +1,133 @@
+# test/test_analyze_pipeline.py
+import asyncio
+import threading
+
+import pytest
+
+from backend import main
+from backend.main import analyze_prompt, build_analyze_graph
+from backend.utills.stage_graph import StageGraph
+
+PROMPT = "Send a Slack message when a new row is added to Google Sheets"
+
+
+def categorize_tool(result):
+    def create(llm):
+        async def tool(args):
+            return await result() if callable(result) else result
+        return tool
+    return create
+
+
+CATEGORIZED = {"data": {"categorization": {"techniques": ["notification"], "confidence": 0.8}}}
+
+
+def test_analyze_with_the_fake_llm():
+    stages = []
+    result = asyncio.run(analyze_prompt(PROMPT, lambda stage, _: stages.append(stage)))
+
+    assert result["success"]
+    assert result["data"]["categorization"]["techniques"] == ["notification"]
+    nodes = result["data"]["parsedBestPractices"]["nodes"]
+    assert nodes
+    assert nodes[1]["input_connections"] == [nodes[0]["name"]]
+
+    assert sorted(stages) == ["adapt", "categorize", "merge", "parse_bp", "registry"]
+    assert stages.index("categorize") < stages.index("parse_bp") < stages.index("merge")
+    assert stages.index("registry") < stages.index("merge") < stages.index("adapt")
+
+
+def test_registry_runs_while_categorize_is_in_flight(monkeypatch):
+    registry_started = threading.Event()
+
+    async def categorize():
+        # deadlocks (and times out) if registry waited for categorize
+        assert await asyncio.to_thread(registry_started.wait, 5)
+        return CATEGORIZED
+
+    def registry(prompt, features):
+        registry_started.set()
+        return []
+
+    monkeypatch.setattr(main, "create_async_categorize_prompt_tool", categorize_tool(categorize))
+    monkeypatch.setattr(main, "generate_workflow_nodes_from_registry", registry)
+
+    run = asyncio.run(build_analyze_graph(PROMPT).run())
+
+    assert run.results["registry"] == []
+    assert run.results["categorize"]["confidence"] == 0.8
+
+
+def test_merge_keeps_registry_nodes_first(monkeypatch):
+    registry_node = {"name": "Slack", "node_id": "n8n-nodes-base.slack", "category": "action",
+                     "purpose": "Send", "input_connections": [], "output_connections": []}
+    monkeypatch.setattr(main, "create_async_categorize_prompt_tool", categorize_tool(CATEGORIZED))
+    monkeypatch.setattr(main, "format_workflow_nodes_for_api", lambda nodes: [dict(registry_node)])
+
+    run = asyncio.run(build_analyze_graph(PROMPT).run())
+
+    merged = run.results["merge"]
+    assert merged[0]["node_id"] == "n8n-nodes-base.slack"
+    assert [n["node_id"] for n in merged].count("n8n-nodes-base.slack") == 1
+    assert {n.node_id for n in run.results["parse_bp"]} <= {n["node_id"] for n in merged}
+
+
+@pytest.mark.parametrize("response", [None, "not a dict"])
+def test_invalid_categorization_fails_the_request(monkeypatch, response):
+    monkeypatch.setattr(main, "create_async_categorize_prompt_tool", categorize_tool(response))
+
+    result = asyncio.run(analyze_prompt(PROMPT))
+
+    assert result == {"success": False, "message": "Failed to analyze prompt: Invalid categorization response", "data": None}
+
+
+def test_stage_failure_fails_the_request(monkeypatch):
+    async def categorize():
+        raise RuntimeError("LLM unavailable")
+
+    monkeypatch.setattr(main, "create_async_categorize_prompt_tool", categorize_tool(categorize))
+
+    result = asyncio.run(analyze_prompt(PROMPT))
+
+    assert not result["success"]
+    assert "LLM unavailable" in result["message"]
+
+
+def test_adapt_failure_keeps_the_merged_nodes(monkeypatch):
+    async def adapt(**kwargs):
+        raise RuntimeError("bad JSON")
+
+    monkeypatch.setattr(main, "allm_select_and_adapt_nodes_for_intent", adapt)
+
+    run = asyncio.run(build_analyze_graph(PROMPT).run())
+
+    assert run.results["adapt"] == run.results["merge"]
+
+
+def test_stage_graph_rejects_unknown_dependencies():
+    graph = StageGraph().add("a", lambda: 1)
+    with pytest.raises(ValueError):
+        graph.add("b", lambda a: a, depends_on=["c"])
+    with pytest.raises(ValueError):
+        graph.add("a", lambda: 2)
+
+
+def test_stage_graph_cancels_running_stages_on_failure():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    async def failing():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    graph = StageGraph().add("slow", slow).add("failing", failing)
+    with pytest.raises(RuntimeError):
+        asyncio.run(asyncio.wait_for(graph.run(), 2))
+
+    assert cancelled == ["slow"]
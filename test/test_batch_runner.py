@@ -0,0 +1,116 @@
+# test/test_batch_runner.py
+import asyncio
+import json
+import os
+
+import pytest
+
+from backend.evalution_chain.batch_runner import RESULTS_FILE, Checkpoint, RunStats, TokenBudget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_token_budget_counts_the_window_when_nothing_runs():
+    async def scenario():
+        clock = FakeClock()
+        budget = TokenBudget(100, clock=clock)
+
+        await budget.acquire(60)
+        await budget.release(60, used=60)
+
+        waiting = asyncio.ensure_future(budget.acquire(60))
+        await settle()
+        assert not waiting.done()
+        waiting.cancel()
+
+        clock.now = 61
+        await asyncio.wait_for(budget.acquire(60), 0.5)
+        assert budget.used_last_minute() == 0
+
+    asyncio.run(scenario())
+
+
+def test_token_budget_release_wakes_waiting_cases():
+    async def scenario():
+        budget = TokenBudget(100, clock=FakeClock())
+        await budget.acquire(40)
+        await budget.acquire(40)
+
+        waiting = asyncio.ensure_future(budget.acquire(40))
+        await settle()
+        assert not waiting.done()
+
+        await budget.release(40, used=0)
+        await asyncio.wait_for(waiting, 0.5)
+
+    asyncio.run(scenario())
+
+
+def test_token_budget_runs_oversized_case_alone():
+    async def scenario():
+        clock = FakeClock()
+        budget = TokenBudget(100, clock=clock)
+
+        await asyncio.wait_for(budget.acquire(500), 0.5)
+        await budget.release(500, used=500)
+
+        waiting = asyncio.ensure_future(budget.acquire(500))
+        await settle()
+        assert not waiting.done()
+        waiting.cancel()
+
+        clock.now = 60
+        await asyncio.wait_for(budget.acquire(500), 0.5)
+
+    asyncio.run(scenario())
+
+
+def test_checkpoint_ignores_truncated_last_line(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path))
+    checkpoint.append({"id": "a", "overallScore": 0.5})
+    with open(os.path.join(tmp_path, RESULTS_FILE), "a", encoding="utf-8") as f:
+        f.write('{"id": "b", "overallSc')
+
+    assert list(checkpoint.load()) == ["a"]
+
+    checkpoint.append({"id": "b", "overallScore": 0.7})
+    assert checkpoint.load()["b"]["overallScore"] == 0.7
+
+
+def test_checkpoint_retries_failed_cases(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path))
+    checkpoint.append({"id": "a", "overallScore": 0.5})
+    checkpoint.append({"id": "b", "error": "timeout"})
+    checkpoint.append({"id": "c", "error": "timeout"})
+    checkpoint.append({"id": "c", "overallScore": 0.9})
+
+    assert sorted(checkpoint.finished()) == ["a", "c"]
+
+
+def test_run_stats_aggregates():
+    stats = RunStats(total=4)
+    stats.add({"id": "a", "overallScore": 0.4, "scores": {"functionality": 0.5}}, resumed=True)
+    stats.add({"id": "b", "overallScore": 0.8, "scores": {"functionality": 1.0, "unknown": 1.0}, "tokens": 300})
+    stats.add({"id": "c", "error": "boom", "tokens": 100})
+
+    assert stats.done == 3
+    assert stats.mean_tokens_per_case() == 200
+
+    summary = stats.summary()
+    assert (summary["succeeded"], summary["failed"], summary["resumed"]) == (2, 1, 1)
+    assert summary["overallScore"]["mean"] == pytest.approx(0.6)
+    assert summary["categories"]["functionality"]["n"] == 2
+    assert summary["categories"]["connections"] == {"n": 0}
+    assert summary["tokens"] == 400
+    json.dumps(summary)
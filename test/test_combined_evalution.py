@@ -0,0 +1,53 @@
+# test/test_combined_evalution.py
+import asyncio
+
+from backend.evalution_chain import combined_evalution
+from backend.evalution_chain.combined_evalution import aevaluate_combined, parse_combined_result
+from backend.evalution_chain.evalution import EvaluationInput, SimpleWorkflow
+from backend.evalution_chain.functionality_evalution import FunctionalityResult
+
+INPUT = EvaluationInput(
+    userPrompt="Send a Slack message every morning",
+    generatedWorkflow=SimpleWorkflow(name="test", nodes=[], connections={}),
+)
+
+VALID = {"score": 0.9, "violations": [], "analysis": "ok"}
+
+
+def test_parse_keeps_only_categories_that_validate():
+    raw = {
+        "functionality": VALID,
+        "connections": {**VALID, "score": 2},
+        "dataFlow": "not an object",
+        "unknown": VALID,
+    }
+
+    results = parse_combined_result(raw, ["functionality", "connections", "dataFlow", "expressions"], [])
+
+    assert list(results) == ["functionality"]
+    assert isinstance(results["functionality"], FunctionalityResult)
+    assert results["functionality"].score == 0.9
+
+
+def test_parse_rejects_a_response_that_is_not_an_object():
+    assert parse_combined_result(None, ["functionality"], []) == {}
+    assert parse_combined_result([VALID], ["functionality"], []) == {}
+
+
+def test_aevaluate_combined_returns_only_valid_categories(monkeypatch):
+    class Chain:
+        async def ainvoke(self, inputs):
+            return {"functionality": VALID, "connections": {"score": 0.5}}
+
+    requested = []
+
+    def create_chain(llm, categories):
+        requested.append(categories)
+        return Chain()
+
+    monkeypatch.setattr(combined_evalution, "create_combined_evaluator_chain", create_chain)
+
+    results = asyncio.run(aevaluate_combined(None, INPUT, ["functionality", "connections", "structuralSimilarity"]))
+
+    assert requested == [["functionality", "connections"]]
+    assert list(results) == ["functionality"]
@@ -0,0 +1,76 @@
+# test/test_eval_cache.py
+import copy
+
+import pytest
+
+from backend.evalution_chain.eval_cache import CATEGORY_INPUTS, EvaluationCache, category_cache_keys
+from backend.evalution_chain.evalution import EvaluationInput, SimpleWorkflow
+from backend.evalution_chain.workflow_evaluator import not_applicable_score
+from backend.llm_cache import ResponseCacheStore
+
+WORKFLOW = {
+    "name": "Morning report",
+    "nodes": [
+        {"id": "1", "name": "Schedule", "type": "n8n-nodes-base.scheduleTrigger", "typeVersion": 1,
+         "position": [0, 0], "parameters": {"rule": {"interval": [{"field": "days"}]}}},
+        {"id": "2", "name": "Slack", "type": "n8n-nodes-base.slack", "typeVersion": 2,
+         "position": [300, 0], "parameters": {"text": "Good morning"}, "notes": "Posts the report"},
+    ],
+    "connections": {"Schedule": {"main": [[{"node": "Slack", "type": "main", "index": 0}]]}},
+}
+
+
+def keys_for(workflow):
+    input = EvaluationInput(userPrompt="Send a Slack message every morning",
+                            generatedWorkflow=SimpleWorkflow(**workflow))
+    return category_cache_keys(None, input, CATEGORY_INPUTS)
+
+
+def changed_categories(edit):
+    workflow = copy.deepcopy(WORKFLOW)
+    edit(workflow)
+    before, after = keys_for(WORKFLOW), keys_for(workflow)
+    return sorted(name for name in before if before[name] != after[name])
+
+
+def readers(section):
+    return sorted(name for name, sections in CATEGORY_INPUTS.items() if section in sections)
+
+
+def test_keys_are_stable():
+    assert keys_for(WORKFLOW) == keys_for(copy.deepcopy(WORKFLOW))
+    assert sorted(keys_for(WORKFLOW)) == sorted(CATEGORY_INPUTS)
+
+
+def test_moving_nodes_or_new_ids_keep_every_key():
+    def edit(workflow):
+        for node in workflow["nodes"]:
+            node["position"] = [node["position"][0] + 100, 50]
+            node["id"] = node["id"] + "-copy"
+
+    assert changed_categories(edit) == []
+
+
+@pytest.mark.parametrize("section, edit", [
+    ("notes", lambda w: w["nodes"][1].update(notes="Posts the daily report")),
+    ("parameters", lambda w: w["nodes"][1]["parameters"].update(text="Hello")),
+    ("connections", lambda w: w.update(connections={})),
+    ("nodes", lambda w: w["nodes"][1].update(typeVersion=3)),
+])
+def test_edit_invalidates_only_the_categories_reading_it(section, edit):
+    assert changed_categories(edit) == readers(section)
+
+
+def test_notes_edit_invalidates_maintainability_only():
+    assert changed_categories(lambda w: w["nodes"][1].update(notes="")) == ["maintainability"]
+
+
+def test_put_skips_not_applicable_results():
+    cache = EvaluationCache(ResponseCacheStore(max_entries=10, ttl_seconds=0))
+    evaluated = {"violations": [], "score": 0.8, "analysis": "ok"}
+
+    cache.put("ok", evaluated)
+    cache.put("failed", not_applicable_score("efficiency"))
+
+    assert cache.get_many({"functionality": "ok", "efficiency": "failed"}) == {"functionality": evaluated}
+    assert cache.store.stats()["entries"] == 1
@@ -0,0 +1,42 @@
+# test/test_keyword_matcher.py
+import random
+
+import pytest
+
+from backend.utills.keyword_matcher import KeywordAutomaton, keyword_hits, register_keywords
+
+OVERLAPPING = ["ai", "email", "mail", "he", "she", "his", "hers", "send email", "a"]
+
+
+def substring_hits(keywords, text):
+    return {k for k in keywords if k in text}
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "email",
+    "send email to ushers",
+    "she sells his hers",
+    "ai agent with gmail",
+    "aaaa",
+    "shehershis",
+    "send  email",
+])
+def test_find_matches_substring_checks(text):
+    assert KeywordAutomaton(OVERLAPPING).find(text) == substring_hits(OVERLAPPING, text)
+
+
+def test_find_matches_substring_checks_on_random_text():
+    rng = random.Random(7)
+    keywords = {"".join(rng.choice("abc ") for _ in range(rng.randint(1, 4))) for _ in range(40)}
+    automaton = KeywordAutomaton(keywords)
+    for _ in range(300):
+        text = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 30)))
+        assert automaton.find(text) == substring_hits(keywords, text)
+
+
+def test_registered_keywords_are_found_case_insensitively():
+    register_keywords(["webhook", "google sheets"])
+    hits = keyword_hits("Add a Webhook and update Google Sheets")
+    assert "webhook" in hits and "google sheets" in hits
+    assert not hits.any(["telegram"])
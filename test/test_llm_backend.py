@@ -0,0 +1,118 @@
+# test/test_llm_backend.py
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+
+from backend.llm_backend import (
+    FakeLLM,
+    FakeLLMTransport,
+    RecordReplayTransport,
+    get_llm_transport,
+    request_key,
+)
+
+BASE_URL = "https://api.groq.com/openai/v1"
+BODY = {
+    "model": "llama-3.3-70b-versatile",
+    "temperature": 0,
+    "messages": [{"role": "user", "content": 'Categorize the following user request: "send slack alerts" Return JSON'}],
+}
+
+
+def post(transport, body=BODY):
+    with httpx.Client(transport=transport, base_url=BASE_URL) as client:
+        return client.post("/chat/completions", json=body)
+
+
+def test_fake_transport_answers_chat_completions():
+    fake = FakeLLM()
+    response = post(FakeLLMTransport(fake))
+
+    assert response.status_code == 200
+    content = json.loads(response.json()["choices"][0]["message"]["content"])
+    assert content["confidence"] == 0.8
+    assert fake.calls == 1
+
+
+def test_request_key_ignores_json_key_order():
+    first = httpx.Request("POST", f"{BASE_URL}/chat/completions", content=json.dumps(BODY))
+    reordered = httpx.Request("POST", f"{BASE_URL}/chat/completions",
+                              content=json.dumps(dict(reversed(list(BODY.items())))))
+    other = httpx.Request("POST", f"{BASE_URL}/chat/completions", content=json.dumps({**BODY, "temperature": 1}))
+
+    assert request_key(first) == request_key(reordered)
+    assert request_key(first) != request_key(other)
+
+
+def test_recorded_responses_replay_without_the_backend(tmp_path):
+    fake = FakeLLM()
+    recorder = RecordReplayTransport(str(tmp_path), record=True, transport=FakeLLMTransport(fake))
+    recorded = post(recorder)
+    assert (recorder.recorded, fake.calls) == (1, 1)
+    assert len(os.listdir(tmp_path)) == 1
+
+    # a second recorder hit is served from the recording
+    assert post(recorder).json() == recorded.json()
+    assert (recorder.recorded, recorder.replayed, fake.calls) == (1, 1, 1)
+
+    player = RecordReplayTransport(str(tmp_path), record=False)
+    replayed = post(player)
+    assert replayed.status_code == 200
+    assert replayed.json() == recorded.json()
+    assert player.replayed == 1
+
+
+def test_replay_miss_is_a_404(tmp_path):
+    player = RecordReplayTransport(str(tmp_path), record=False)
+    response = post(player, {**BODY, "temperature": 0.5})
+
+    assert response.status_code == 404
+    assert response.json()["error"]["type"] == "replay_miss"
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_responses_are_not_recorded(tmp_path):
+    recorder = RecordReplayTransport(str(tmp_path), record=True, transport=FakeLLMTransport(FakeLLM()))
+    with httpx.Client(transport=recorder, base_url=BASE_URL) as client:
+        assert client.post("/models", json={}).status_code == 404
+
+    assert recorder.recorded == 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_streamed_responses_round_trip_async(tmp_path):
+    body = {**BODY, "stream": True}
+
+    async def post_async(transport):
+        async with httpx.AsyncClient(transport=transport, base_url=BASE_URL) as client:
+            response = await client.post("/chat/completions", json=body)
+            return response.headers["content-type"], response.text
+
+    recorded = asyncio.run(post_async(RecordReplayTransport(str(tmp_path), record=True,
+                                                            transport=FakeLLMTransport(FakeLLM()))))
+    replayed = asyncio.run(post_async(RecordReplayTransport(str(tmp_path), record=False)))
+
+    assert replayed == recorded
+    assert recorded[0].startswith("text/event-stream")
+    assert recorded[1].endswith("data: [DONE]\n\n")
+
+
+@pytest.mark.parametrize("backend, expected", [
+    ("groq", type(None)),
+    ("fake", FakeLLMTransport),
+    ("replay", RecordReplayTransport),
+])
+def test_transport_follows_llm_backend(monkeypatch, tmp_path, backend, expected):
+    monkeypatch.setenv("LLM_BACKEND", backend)
+    monkeypatch.setenv("LLM_REPLAY_DIR", str(tmp_path))
+
+    assert isinstance(get_llm_transport(False, httpx.Limits()), expected)
+
+
+def test_unknown_backend_is_rejected(monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "openai")
+    with pytest.raises(ValueError):
+        get_llm_transport(False, httpx.Limits())
@@ -0,0 +1,106 @@
+# test/test_llm_cache.py
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from backend import llm_cache
+from backend.llm_cache import LLMResponseCache, ResponseCacheStore, make_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_key_is_stable_and_separates_parts():
+    key = make_cache_key("model", "prompt")
+    assert key == make_cache_key("model", "prompt")
+    assert len(key) == 64
+    assert key != make_cache_key("model", "prompt ")
+    # parts are delimited, so moving text across the boundary changes the key
+    assert make_cache_key("ab", "c") != make_cache_key("a", "bc")
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_cache.time, "time", clock)
+    store = ResponseCacheStore(ttl_seconds=60)
+
+    store.set("k", "v")
+    clock.now += 59
+    assert store.get("k") == "v"
+
+    clock.now += 2
+    assert store.get("k") is None
+    assert store.stats()["entries"] == 0
+
+
+def test_zero_ttl_never_expires(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_cache.time, "time", clock)
+    store = ResponseCacheStore(ttl_seconds=0)
+
+    store.set("k", "v")
+    clock.now += 10 ** 9
+    assert store.get("k") == "v"
+
+
+def test_memory_is_bounded_least_recently_used_first():
+    store = ResponseCacheStore(max_entries=2)
+    store.set("a", "1")
+    store.set("b", "2")
+    assert store.get("a") == "1"  # b is now the oldest
+
+    store.set("c", "3")
+
+    assert store.get("b") is None
+    assert (store.get("a"), store.get("c")) == ("1", "3")
+    stats = store.stats()
+    assert (stats["entries"], stats["evictions"]) == (2, 1)
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+
+def test_sqlite_tier_survives_a_new_store(tmp_path):
+    path = str(tmp_path / "cache" / "llm.sqlite")
+    ResponseCacheStore(sqlite_path=path).set("k", "v")
+
+    store = ResponseCacheStore(sqlite_path=path)
+    assert store.get("k") == "v"
+    assert store.stats()["disk_hits"] == 1
+
+    # the second read is served from memory
+    assert store.get("k") == "v"
+    assert store.stats()["disk_hits"] == 1
+
+
+def test_sqlite_entries_expire(tmp_path, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_cache.time, "time", clock)
+    path = str(tmp_path / "llm.sqlite")
+    ResponseCacheStore(sqlite_path=path, ttl_seconds=60).set("k", "v")
+
+    clock.now += 61
+    assert ResponseCacheStore(sqlite_path=path, ttl_seconds=60).get("k") is None
+
+
+def test_evicted_entries_are_reloaded_from_sqlite(tmp_path):
+    store = ResponseCacheStore(max_entries=1, sqlite_path=str(tmp_path / "llm.sqlite"))
+    store.set("a", "1")
+    store.set("b", "2")
+
+    assert store.get("a") == "1"
+    assert store.stats()["disk_hits"] == 1
+
+
+def test_langchain_generations_round_trip():
+    cache = LLMResponseCache(ResponseCacheStore())
+    generations = [ChatGeneration(message=AIMessage(content="hello"))]
+
+    assert cache.lookup("prompt", "llm") is None
+    cache.update("prompt", "llm", generations)
+
+    cached = cache.lookup("prompt", "llm")
+    assert [g.message.content for g in cached] == ["hello"]
+    assert cache.lookup("prompt", "other llm") is None
@@ -0,0 +1,20 @@
+# test/test_node_registry.py
+from backend.mytools.node_registry import get_ai_nodes, get_trigger_nodes, search_registry
+
+
+def test_category_lookups_include_catalog_nodes():
+    ai_ids = {node.node_id for node in get_ai_nodes()}
+    assert "@n8n/n8n-nodes-langchain.agent" in ai_ids
+    assert "@n8n/n8n-nodes-langchain.lmChatOpenAi" in ai_ids
+
+    trigger_ids = {node.node_id for node in get_trigger_nodes()}
+    assert "n8n-nodes-base.webhook" in trigger_ids
+    assert "@n8n/n8n-nodes-langchain.chatTrigger" in trigger_ids
+    assert not ai_ids & trigger_ids
+
+
+def test_search_registry_filters_category_before_limit():
+    nodes = search_registry("openai", limit=2, category="ai")
+    assert len(nodes) == 2
+    assert all(node.category == "ai" for node in nodes)
+    assert search_registry("webhook", limit=1, category="trigger")[0].category == "trigger"
@@ -0,0 +1,19 @@
+# test/test_node_search_engine.py
+from backend.mytools.engine import node_search_engine
+from backend.mytools.engine.node_search_engine import get_node_search_engine
+
+
+def catalog(*keys):
+    return [{"key": key, "properties": {"name": key, "displayName": key}} for key in keys]
+
+
+def test_engines_are_shared_per_version_and_old_versions_dropped():
+    first = catalog("n8n-nodes-base.slack")
+    engine = get_node_search_engine(first)
+    assert get_node_search_engine(catalog("n8n-nodes-base.slack")) is engine
+
+    for version in range(node_search_engine.MAX_CACHED_ENGINES):
+        get_node_search_engine(catalog(f"n8n-nodes-base.node{version}"))
+
+    assert len(node_search_engine._engines) == node_search_engine.MAX_CACHED_ENGINES
+    assert get_node_search_engine(first) is not engine
@@ -0,0 +1,102 @@
+# test/test_parse_best_practices.py
+import hashlib
+import json
+
+import pytest
+
+from backend.mytools.best_practices.index import documentation
+from backend.mytools.find_best_practice_tool import format_best_practices
+from backend.mytools.parse_best_practices import (
+    BestPracticeParser,
+    parse_best_practices,
+    parse_best_practices_for_techniques,
+)
+from backend.mytypes.categorization import WorkflowTechnique
+
+# sha256 of to_dict() per document, and for all documents merged, as produced
+# by the regex-scanning parser before SectionIndex; alternatives are sorted
+# because the parser dedupes them through a set
+REGEX_PARSER_DIGESTS = {
+    "scraping_and_research": "b8f2708e112eeccae1d8b9960c1a0efe2735b7ec75e53b2c6ec8e265a297092b",
+    "chatbot": "34d3aa36ccec984d04ca8485fc716da2a4adb0d7ee9f2dda662951bc708aecae",
+    "content_generation": "58ea5f874d63af8292acc4208889c9711a4d8eb372cb154e83f76bcf070386c6",
+    "data_analysis": "9f89d76fad127b3446eaa426a60e7f27e9a504b43c7856a1764638e34267e81d",
+    "data_extraction": "3166f8fe19dfb3e3ca39d59e297912768bd3c4df510687d8b540df6138ab985d",
+    "data_transformation": "8d2fbf744636f25912d32d4595514a5f793f6ebadb4cd7c6fe890fc8e6c412be",
+    "document_processing": "f6fb481b666ff9ed1d337e898c0b009a4ea9585a90ac35e952ea311bb1b72cd5",
+    "enrichment": "f4b9d753bcdbd9fe080ad32b7aa95d55930075a447f648c650567dfc467dd7d3",
+    "form_input": "1c566c2fa3c7de63b109483b917913a4ae2b512234864299d3f74eafabb75201",
+    "knowledge_base": "73099290509ec5274c596a49c3745690fb7deebc0761d5c5a9196c107a655f23",
+    "notification": "3788eccef621b62b4927abe9aa13fb6f8f48a2759548cebd3b1d1c069fd1fd21",
+    "triage": "385bf979a4637030151ff0b5b89f8611b0f799a6323b425ce86e1c21621635fe",
+    "human_in_the_loop": "b2835d4ee9225063519d0afd6860988bc88c9f78508a8be4e815f380a9a72f7b",
+    "monitoring": "1708a9350dbea7814cd5f6d35bbe2be69a9ea9960682c3a98284f08cc5336287",
+    "scheduling": "25a4ca397bf16fa88fca9d1b174bb50042d53bd4371f9a9ca04ccd97d3ee6ba3",
+    "all": "08814727ced3453f9f75de366bfe286f3a133a8a39a131d3b049a73bcbefb143",
+}
+
+
+def digest(parser):
+    data = parser.to_dict()
+    for node in data["nodes"]:
+        node["alternatives"] = sorted(node["alternatives"])
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+@pytest.mark.parametrize("technique", list(documentation), ids=lambda t: t.value)
+def test_parser_output_matches_regex_parser(technique):
+    text = documentation[technique].get_documentation()
+    assert digest(BestPracticeParser(text)) == REGEX_PARSER_DIGESTS[technique.value]
+
+
+def test_merged_parse_matches_regex_parser():
+    text = format_best_practices(list(documentation))
+    assert digest(BestPracticeParser(text)) == REGEX_PARSER_DIGESTS["all"]
+
+
+def without_connections(parser):
+    data = parser.to_dict()
+    for node in data["nodes"]:
+        node.pop("input_connections")
+        node.pop("output_connections")
+    return data
+
+
+@pytest.mark.parametrize("technique", list(documentation), ids=lambda t: t.value)
+def test_single_technique_matches_the_single_document_parse(technique):
+    expected = parse_best_practices(format_best_practices([technique])).to_dict()
+    # the cached parse never sees the </best_practices> wrapper
+    guidelines = expected["general_guidelines"]
+    guidelines[-1] = guidelines[-1].removesuffix("</best_practices>").strip()
+
+    assert parse_best_practices_for_techniques([technique]).to_dict() == expected
+
+
+def test_multiple_techniques_merge_documents_in_order():
+    techniques = [WorkflowTechnique.CHATBOT, WorkflowTechnique.CONTENT_GENERATION]
+    merged = parse_best_practices_for_techniques(techniques)
+    parts = [parse_best_practices_for_techniques([technique]) for technique in techniques]
+
+    merged_data = without_connections(merged)
+    part_data = [without_connections(part) for part in parts]
+    for key in ("nodes", "patterns", "critical_instructions", "general_guidelines"):
+        assert merged_data[key] == part_data[0][key] + part_data[1][key]
+
+    # one chain over all nodes, the first document's nodes before the second's
+    names = [node.name for node in merged.nodes]
+    assert names[:3] == ["Chat Trigger", "AI Agent", "Simple Memory"]
+    for previous, node in zip(merged.nodes, merged.nodes[1:]):
+        assert previous.name in node.input_connections
+        assert node.name in previous.output_connections
+    last_of_first = parts[0].nodes[-1].name
+    assert merged.nodes[len(parts[0].nodes)].input_connections == [last_of_first]
+
+
+def test_merged_nodes_are_copies():
+    merged = parse_best_practices_for_techniques([WorkflowTechnique.CHATBOT])
+    merged.nodes[0].pitfalls.append("changed")
+    merged.nodes[0].output_connections.clear()
+
+    again = parse_best_practices_for_techniques([WorkflowTechnique.CHATBOT])
+    assert "changed" not in again.nodes[0].pitfalls
+    assert again.nodes[0].output_connections
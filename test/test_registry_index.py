@@ -0,0 +1,16 @@
+# test/test_registry_index.py
+from backend.mytools.engine import registry_index
+from backend.mytools.engine.registry_index import RegistrySearchIndex
+
+
+def test_expansion_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(registry_index, "MAX_CACHED_EXPANSIONS", 2)
+    index = RegistrySearchIndex([{"name": "lmChatOpenAi"}, {"name": "slack"}])
+
+    assert index.expand("openai") == [("lmchatopenai", 0.5)]
+    index.expand("slack")
+    index.expand("openai")
+    index.expand("unknown")
+
+    assert list(index._expansions) == ["openai", "unknown"]
+    assert [doc for doc, _ in index.search("openai")] == [0]
@@ -0,0 +1,38 @@
+# test/test_registry_node_generator.py
+import json
+import os
+
+import pytest
+
+from backend.mytools.node_registry import get_node, is_integration_node
+from backend.mytools.registry_node_generator import generate_workflow_nodes_from_registry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLE_PROMPTS = [
+    case["prompt"]
+    for case in json.load(open(os.path.join(ROOT, "data", "example_prompts.json"), encoding="utf-8"))
+]
+# node ids selected per example prompt; regenerate deliberately when selection changes
+EXPECTED = json.load(open(os.path.join(os.path.dirname(__file__), "registry_selections.json"), encoding="utf-8"))
+
+
+def selected(prompt):
+    return [node["node_id"] for node in generate_workflow_nodes_from_registry(prompt)]
+
+
+@pytest.mark.parametrize("prompt", EXAMPLE_PROMPTS)
+def test_example_prompt_selections_are_stable(prompt, capsys):
+    assert selected(prompt) == EXPECTED[prompt]
+
+
+@pytest.mark.parametrize("prompt", [
+    "When a user submits a form, send me an email summary",
+    "Take user input and summarize it with openai",
+])
+def test_generic_prompts_do_not_pick_a_vendor_trigger(prompt, capsys):
+    triggers = [node_id for node_id in selected(prompt) if get_node(node_id).category == "trigger"]
+    assert not any(is_integration_node(get_node(node_id)) for node_id in triggers)
+
+
+def test_named_vendor_trigger_is_picked(capsys):
+    assert selected("When someone submits my Typeform, add a row to google sheets")[0] == "n8n-nodes-base.typeformTrigger"
@@ -0,0 +1,29 @@
+# test/test_session_store.py
+import pytest
+
+from backend.llm import process_user_prompt
+from backend.session_store import MemorySessionStore, SessionState, SessionStore
+
+
+def test_session_store_is_abstract():
+    with pytest.raises(TypeError, match="abstract"):
+        SessionStore(max_sessions=1, ttl_seconds=0, max_history=1)
+
+
+def test_memory_store_keeps_state_per_session():
+    store = MemorySessionStore(max_sessions=2, ttl_seconds=0, max_history=2)
+    state = store.get("a")
+    state.history.extend([{"role": "user", "content": str(i)} for i in range(3)])
+    store.save("a", state)
+
+    assert [m["content"] for m in store.get("a").history] == ["1", "2"]
+    assert store.get("b").history == []
+    assert len(store) == 2
+
+
+def test_calls_without_state_do_not_share_it():
+    state = SessionState(last_intent_message="build a slack bot", is_refining=True)
+    assert process_user_prompt("done", [], state)["clean_prompt"] == "build a slack bot"
+
+    result = process_user_prompt("done", [{"role": "user", "content": "send an email"}])
+    assert result["clean_prompt"] == "send an email"
@@ -0,0 +1,117 @@
+# test/test_sse.py
+import asyncio
+import json
+
+import pytest
+
+from backend.main import event_stream
+from backend.utills.sse import EventChannel, sse_event
+
+
+def parse(frame):
+    event, data = frame.strip().split("\n")
+    return event[len("event: "):], json.loads(data[len("data: "):])
+
+
+async def collect(stream):
+    return [parse(frame) async for frame in stream]
+
+
+def test_sse_event_format():
+    assert sse_event("token", {"text": "hi"}) == 'event: token\ndata: {"text": "hi"}\n\n'
+
+
+def test_relay_yields_events_in_publish_order():
+    async def scenario():
+        channel = EventChannel()
+
+        async def pipeline():
+            for i in range(3):
+                channel.publish("step", {"i": i})
+                await asyncio.sleep(0)
+            channel.publish("done", {})
+
+        return await collect(channel.relay(pipeline))
+
+    assert asyncio.run(scenario()) == [("step", {"i": 0}), ("step", {"i": 1}), ("step", {"i": 2}), ("done", {})]
+
+
+def test_relay_drains_events_published_just_before_completion():
+    async def scenario():
+        channel = EventChannel()
+
+        async def pipeline():
+            # nothing awaits between these, the task is done before relay reads any
+            for i in range(5):
+                channel.publish("step", {"i": i})
+
+        return await collect(channel.relay(pipeline))
+
+    assert [data["i"] for _, data in asyncio.run(scenario())] == [0, 1, 2, 3, 4]
+
+
+def test_disconnect_cancels_the_pipeline():
+    async def scenario():
+        channel = EventChannel()
+        cancelled = asyncio.Event()
+
+        async def pipeline():
+            channel.publish("started", {})
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        stream = channel.relay(pipeline)
+        assert parse(await stream.__anext__())[0] == "started"
+        await stream.aclose()  # what the server does when the client goes away
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+    asyncio.run(scenario())
+
+
+def test_relay_raises_pipeline_errors_after_draining():
+    async def scenario():
+        channel = EventChannel()
+        frames = []
+
+        async def pipeline():
+            channel.publish("step", {})
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            async for frame in channel.relay(pipeline):
+                frames.append(parse(frame))
+        return frames
+
+    assert asyncio.run(scenario()) == [("step", {})]
+
+
+def test_event_stream_reports_errors_as_an_event():
+    async def scenario():
+        channel = EventChannel()
+
+        async def pipeline():
+            channel.publish("categorization", {"techniques": []})
+            raise ValueError("Invalid categorization response")
+
+        return await collect(event_stream(channel, pipeline).body_iterator)
+
+    assert asyncio.run(scenario()) == [
+        ("categorization", {"techniques": []}),
+        ("error", {"message": "Invalid categorization response"}),
+        ("done", {}),
+    ]
+
+
+def test_event_stream_sends_the_result_then_done():
+    async def scenario():
+        channel = EventChannel()
+
+        async def pipeline():
+            return {"success": True}
+
+        return await collect(event_stream(channel, pipeline).body_iterator)
+
+    assert asyncio.run(scenario()) == [("result", {"success": True}), ("done", {})]
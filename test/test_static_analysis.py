@@ -0,0 +1,54 @@
+# test/test_static_analysis.py
+from backend.evalution_chain.static_analysis import analyze_connections, analyze_expressions, workflow_links
+
+
+def node(name, node_type, **extra):
+    return {"id": name.lower().replace(" ", "-"), "name": name, "type": node_type,
+            "typeVersion": 1, "position": [0, 0], "parameters": {}, **extra}
+
+
+def link(target, connection_type="main"):
+    return [[{"node": target, "type": connection_type, "index": 0}]]
+
+
+AGENT_WORKFLOW = {
+    "nodes": [
+        node("Chat Trigger", "@n8n/n8n-nodes-langchain.chatTrigger"),
+        node("AI Agent", "@n8n/n8n-nodes-langchain.agent"),
+        node("OpenAI Chat Model", "@n8n/n8n-nodes-langchain.lmChatOpenAi"),
+        node("Memory", "@n8n/n8n-nodes-langchain.memoryBufferWindow"),
+        node("Calculator", "@n8n/n8n-nodes-langchain.toolCalculator"),
+    ],
+    "connections": {
+        "Chat Trigger": {"main": link("AI Agent")},
+        "OpenAI Chat Model": {"ai_languageModel": link("AI Agent", "ai_languageModel")},
+        "Memory": {"ai_memory": link("AI Agent", "ai_memory")},
+        "Calculator": {"ai_tool": link("AI Agent", "ai_tool")},
+    },
+}
+
+
+def test_canonical_agent_workflow_has_no_connection_violations():
+    analysis = analyze_connections(AGENT_WORKFLOW)
+    assert analysis.result.violations == []
+    assert analysis.result.score == 1.0
+
+
+def test_generator_format_connections_are_resolved_to_names(generated_chain):
+    workflow = generated_chain
+    edges = [(l.source, l.target, l.output_index) for l in workflow_links(workflow)]
+    assert edges == [("Schedule", "HTTP", 0), ("HTTP", "Slack", 0)]
+
+    analysis = analyze_connections(workflow)
+    assert analysis.result.violations == []
+
+
+def test_sticky_note_markdown_is_not_an_expression():
+    workflow = {
+        "nodes": [
+            node("Trigger", "n8n-nodes-base.manualTrigger"),
+            node("Note", "n8n-nodes-base.stickyNote", parameters={"content": "hello {{ x }}"}),
+        ],
+        "connections": {},
+    }
+    assert analyze_expressions(workflow).result.violations == []
@@ -0,0 +1,31 @@
+# test/test_structural_similarity.py
+from backend.evalution_chain.structural_similarity import score_structural_similarity
+
+
+def n8n_reference():
+    return {
+        "nodes": [
+            {"id": "a", "name": "Every Morning", "type": "n8n-nodes-base.scheduleTrigger", "position": [0, 0], "parameters": {}},
+            {"id": "b", "name": "Fetch", "type": "n8n-nodes-base.httpRequest", "position": [200, 0], "parameters": {}},
+            {"id": "c", "name": "Notify", "type": "n8n-nodes-base.slack", "position": [400, 0], "parameters": {}},
+        ],
+        "connections": {
+            "Every Morning": {"main": [[{"node": "Fetch", "type": "main", "index": 0}]]},
+            "Fetch": {"main": [[{"node": "Notify", "type": "main", "index": 0}]]},
+        },
+    }
+
+
+def test_generator_format_matches_equivalent_n8n_reference(generated_chain):
+    result = score_structural_similarity(generated_chain, [n8n_reference()])
+    assert result.applicable
+    assert result.score == 1.0
+    assert result.violations == []
+
+
+def test_best_reference_is_scored(generated_chain):
+    partial = n8n_reference()
+    partial["connections"].pop("Fetch")
+    result = score_structural_similarity(generated_chain, [partial, n8n_reference()])
+    assert result.score == 1.0
+    assert score_structural_similarity(generated_chain, [partial]).score < 1.0
@@ -0,0 +1,65 @@
+# test/test_sublime_search.py
+from difflib import SequenceMatcher
+
+import pytest
+
+from backend.n8n_worflow.sublime_search import get_matcher, sublimeSearch
+
+ITEMS = [
+    {"name": "slack", "displayName": "Slack", "tags": ["chat", "messaging"]},
+    {"name": "gmail", "displayName": "Gmail", "tags": ["email"]},
+    {"name": "googleSheets", "displayName": "Google Sheets", "tags": ["spreadsheet"]},
+    {"name": "httpRequest", "displayName": "HTTP Request", "tags": []},
+    {"name": "telegram", "displayName": "Telegram", "tags": ["chat", "bot"]},
+    {"name": "emailSend", "displayName": "Send Email", "tags": ["email", "smtp"]},
+]
+KEYS = ["displayName", "name", "tags"]
+
+
+def full_scan(query, items, keys):
+    """The original sublimeSearch: score every string, keep the best per item"""
+    results = []
+    for item in items:
+        best = 0.0
+        for key in keys:
+            value = item.get(key)
+            if not value:
+                continue
+            for v in value if isinstance(value, list) else [value]:
+                if isinstance(v, str):
+                    best = max(best, SequenceMatcher(None, query.lower(), v.lower()).ratio() * 100)
+        if best > 0:
+            results.append((item, best))
+    results.sort(key=lambda x: x[1], reverse=True)
+    return results
+
+
+@pytest.mark.parametrize("query", ["slack", "Email", "gogle shets", "chat", "s", "http req", "xyz"])
+def test_default_search_matches_the_full_scan(query):
+    assert sublimeSearch(query, ITEMS, KEYS) == full_scan(query, ITEMS, KEYS)
+
+
+def test_prefiltered_search_finds_the_top_match():
+    assert sublimeSearch("telegram bot", ITEMS, KEYS, limit=2, exact=False)[0][0]["name"] == "telegram"
+
+
+def test_matcher_is_shared_by_equal_content():
+    matcher = get_matcher(ITEMS, KEYS)
+    assert get_matcher([dict(item) for item in ITEMS], KEYS) is matcher
+    assert get_matcher(ITEMS, ["name"]) is not matcher
+
+
+def test_search_sees_items_edited_in_place():
+    items = [{"name": "slack"}, {"name": "gmail"}]
+    assert sublimeSearch("slack", items, ["name"])[0] == ({"name": "slack"}, 100.0)
+
+    items[0]["name"] = "telegram"
+    assert sublimeSearch("slack", items, ["name"]) == full_scan("slack", items, ["name"])
+
+    items[0] = {"name": "discord"}
+    results = sublimeSearch("slack", items, ["name"])
+    assert results == full_scan("slack", items, ["name"])
+    assert results[0][0] is items[0]
+
+    items.append({"name": "slack"})
+    assert sublimeSearch("slack", items, ["name"])[0][0] is items[-1]
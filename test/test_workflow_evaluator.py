@@ -0,0 +1,120 @@
+# test/test_workflow_evaluator.py
+import asyncio
+
+import pytest
+
+from backend.evalution_chain import workflow_evaluator
+from backend.evalution_chain.evalution import EvaluationInput, SimpleWorkflow
+from backend.evalution_chain.workflow_evaluator import (
+    ASYNC_CATEGORY_EVALUATORS,
+    CATEGORY_WEIGHTS,
+    aevaluate_workflow,
+    build_evaluation_result,
+    not_applicable_score,
+)
+
+INPUT = EvaluationInput(
+    userPrompt="Send a Slack message every morning",
+    generatedWorkflow=SimpleWorkflow(name="test", nodes=[], connections={}),
+)
+
+
+def category_score(name, score, violations=()):
+    result = not_applicable_score(name)
+    result.update(applicable=True, score=score, violations=list(violations))
+    return result
+
+
+def stub(name, score=1.0, calls=None):
+    async def evaluate(llm, input):
+        if calls is not None:
+            calls.append(name)
+        return category_score(name, score)
+    return evaluate
+
+
+async def failing(llm, input):
+    raise RuntimeError("boom")
+
+
+async def hanging(llm, input):
+    await asyncio.sleep(5)
+
+
+@pytest.fixture
+def stub_evaluators(monkeypatch):
+    """Every LLM category stubbed to a perfect score, nothing settled statically"""
+    monkeypatch.setenv("EVAL_CACHE_ENABLED", "false")
+    monkeypatch.setattr(workflow_evaluator, "static_scores", lambda input: {})
+    calls = []
+    for name in list(ASYNC_CATEGORY_EVALUATORS):
+        monkeypatch.setitem(ASYNC_CATEGORY_EVALUATORS, name, stub(name, calls=calls))
+    return calls
+
+
+def test_failed_and_timed_out_categories_are_not_applicable(monkeypatch, stub_evaluators):
+    monkeypatch.setitem(ASYNC_CATEGORY_EVALUATORS, "functionality", failing)
+    monkeypatch.setitem(ASYNC_CATEGORY_EVALUATORS, "connections", hanging)
+
+    result = asyncio.run(aevaluate_workflow(None, INPUT, max_concurrency=8, timeout=0.1, mode="parallel"))
+
+    assert not result.functionality.applicable
+    assert not result.connections.applicable
+    assert result.expressions.applicable and result.expressions.score == 1.0
+    # the two failures don't drag the score down
+    assert result.overallScore == pytest.approx(1.0)
+    assert result.summary.endswith("Not evaluated: functionality, connections.")
+
+
+def test_not_applicable_categories_are_left_out_of_the_result():
+    critical = {"type": "critical", "description": "Trigger missing", "pointsDeducted": 50}
+    scores = {name: category_score(name, 1.0) for name in ASYNC_CATEGORY_EVALUATORS}
+    scores["functionality"] = {**not_applicable_score("functionality"), "violations": [critical]}
+    scores["connections"] = category_score("connections", 0.2, [critical])
+
+    result = build_evaluation_result(scores)
+
+    weights = {name: w for name, w in CATEGORY_WEIGHTS.items()
+               if name not in ("functionality", "structuralSimilarity")}
+    expected = sum(w * (0.2 if name == "connections" else 1.0) for name, w in weights.items()) / sum(weights.values())
+    assert result.overallScore == pytest.approx(expected)
+    assert result.criticalIssues == ["[connections] Trigger missing"]
+    assert "functional" not in result.summary.split("Not evaluated")[0]
+    assert result.summary.endswith("Not evaluated: functionality.")
+
+
+def test_all_categories_run_once(stub_evaluators):
+    result = asyncio.run(aevaluate_workflow(None, INPUT, max_concurrency=2, timeout=1, mode="parallel"))
+
+    assert sorted(stub_evaluators) == sorted(ASYNC_CATEGORY_EVALUATORS)
+    assert result.overallScore == pytest.approx(1.0)
+    assert result.criticalIssues is None
+
+
+def test_combined_mode_falls_back_for_invalid_categories(monkeypatch, stub_evaluators):
+    requested = []
+
+    async def combined(llm, input, names):
+        requested.extend(names)
+        # only functionality validated
+        return {"functionality": category_score("functionality", 0.5)}
+
+    monkeypatch.setattr(workflow_evaluator, "aevaluate_combined", combined)
+
+    result = asyncio.run(aevaluate_workflow(None, INPUT, max_concurrency=8, timeout=1, mode="combined"))
+
+    assert requested == list(ASYNC_CATEGORY_EVALUATORS)
+    assert sorted(stub_evaluators) == sorted(set(ASYNC_CATEGORY_EVALUATORS) - {"functionality"})
+    assert result.functionality.score == 0.5
+
+
+def test_combined_mode_falls_back_when_the_call_fails(monkeypatch, stub_evaluators):
+    async def combined(llm, input, names):
+        raise ValueError("bad response")
+
+    monkeypatch.setattr(workflow_evaluator, "aevaluate_combined", combined)
+
+    result = asyncio.run(aevaluate_workflow(None, INPUT, max_concurrency=8, timeout=1, mode="combined"))
+
+    assert sorted(stub_evaluators) == sorted(ASYNC_CATEGORY_EVALUATORS)
+    assert result.overallScore == 1.0
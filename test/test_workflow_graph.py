@@ -0,0 +1,34 @@
+# test/test_workflow_graph.py
+from backend.mytools.helpers.state import get_workflow_graph
+from backend.n8n_worflow.workflow_graph import WorkflowGraph
+
+
+def http_node(name):
+    return {"id": name, "name": name, "type": "n8n-nodes-base.httpRequest",
+            "typeVersion": 4, "position": [0, 0], "parameters": {}}
+
+
+def test_unique_name_continues_from_the_last_suffix():
+    graph = WorkflowGraph()
+    names = []
+    for _ in range(4):
+        name = graph.unique_name("HTTP")
+        graph.add_node(http_node(name))
+        names.append(name)
+    assert names == ["HTTP", "HTTP1", "HTTP2", "HTTP3"]
+
+    graph.add_node(http_node("HTTP4"))
+    assert graph.unique_name("HTTP") == "HTTP5"
+    assert graph.unique_name("HTTP") == "HTTP5"
+
+    graph.remove_node("HTTP")
+    assert graph.unique_name("HTTP") == "HTTP"
+
+
+def test_workflow_graph_is_kept_in_state():
+    state = {"workflowJSON": {"name": "w", "nodes": [http_node("HTTP")], "connections": {}}}
+    graph = get_workflow_graph(state)
+    assert get_workflow_graph(state) is graph
+
+    graph.add_node(http_node(graph.unique_name("HTTP")))
+    assert get_workflow_graph(state).get_by_name("HTTP1") is not None